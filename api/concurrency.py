@@ -0,0 +1,68 @@
+import os
+import threading
+from concurrent.futures import Future
+from typing import Callable, Hashable
+
+from search.limits import BackendOverloaded
+
+# Requests allowed through the full pipeline at once. Identical requests
+# that coalesce onto an in-flight computation do not take a slot.
+MAX_INFLIGHT_REQUESTS = int(os.getenv("API_MAX_INFLIGHT", "16"))
+OVERLOAD_RETRY_AFTER_S = int(os.getenv("API_RETRY_AFTER", "2"))
+
+
+class SingleFlight:
+    """
+    Concurrent calls with the same key share one execution:
+    the first caller runs fn, later callers wait for its result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: dict[Hashable, Future] = {}
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable):
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.shared += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(fn())
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+        return future.result()
+
+
+class RequestAdmission:
+    """
+    Bounded admission for whole requests: no queueing, shed immediately.
+    """
+
+    def __init__(self, limit: int = MAX_INFLIGHT_REQUESTS):
+        self.limit = limit
+        self._slots = threading.BoundedSemaphore(limit)
+
+    def run(self, fn: Callable):
+        if not self._slots.acquire(blocking=False):
+            raise BackendOverloaded("api", OVERLOAD_RETRY_AFTER_S)
+        try:
+            return fn()
+        finally:
+            self._slots.release()
+
+
+single_flight = SingleFlight()
+admission = RequestAdmission()
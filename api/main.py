@@ -1,10 +1,35 @@
-from fastapi import FastAPI
-from pydantic import BaseModel
-from typing import Optional
+import hmac
+import threading
+
+from fastapi import FastAPI, Request, Header, HTTPException, Depends
+from fastapi.responses import JSONResponse, FileResponse
+from pydantic import BaseModel, Field
+from typing import Optional, List, Union
 
 from fastapi.middleware.cors import CORSMiddleware
 
-from search.service import answer_regulatory_question
+from search.service import (
+    answer_regulatory_question,
+    answer_regulatory_question_budgeted,
+    answer_comparison_question,
+)
+from search.limits import BackendOverloaded, LIMITERS
+from search.microbatch import batch_stats
+from search.deadline import DeadlineExceeded, latency
+from search.cascade import cascade_stats
+from search.generation import tier_stats
+from search.cache import cache_stats, normalize_query
+from search.query_log import query_log
+from search.prewarm import PREWARM_ON_START, PREWARM_ANSWERS, prewarm_in_background
+from search.index_swap import index_watcher
+from search.version_pairs import PairIndexUnavailable
+from search.runtime import get_model_server, preload_serving_clients
+from search.filters import as_values
+from search.sections import resolve_section_prefix, normalize_prefix, UnknownSection
+from ingest.registry import load_registry, known_versions, known_document_ids
+
+from api.concurrency import single_flight, admission
+from api.profiling import profiler, ADMIN_TOKEN
 
 app = FastAPI(
     title="ReguLens API",
@@ -23,22 +48,201 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+def warm_up():
+    # SDK imports are deferred out of `import api.main`; load them now,
+    # without holding up readiness
+    threading.Thread(target=preload_serving_clients, name="preload", daemon=True).start()
+
+    # replay the hottest logged questions into this worker's caches
+    # (embeddings + retrieval; answers only with PREWARM_ANSWERS)
+    if PREWARM_ON_START:
+        prewarm_in_background(answers=PREWARM_ANSWERS)
+
+    # follow blue/green index swaps (ingest/reindex.py) without a restart
+    index_watcher.start()
+
+
+@app.exception_handler(BackendOverloaded)
+def overloaded_handler(request: Request, exc: BackendOverloaded):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"Service busy ({exc.backend}), please retry."},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+@app.exception_handler(PairIndexUnavailable)
+def pair_index_handler(request: Request, exc: PairIndexUnavailable):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"Comparison unavailable: {exc}"},
+    )
+
+
+@app.exception_handler(DeadlineExceeded)
+def deadline_handler(request: Request, exc: DeadlineExceeded):
+    return JSONResponse(
+        status_code=504,
+        content={"detail": f"Latency budget exhausted ({exc.stage})."},
+    )
+
+
 class DisclosureRequest(BaseModel):
     query: str
-    version: Optional[str] = None  # "2024_final" | "2022_proposed"
-    
+    version: Optional[Union[str, List[str]]] = None  # one or more versions from GET /documents
+    document_ids: Optional[List[str]] = None
+    section: Optional[str] = None  # section prefix, e.g. "II.C" (covers II.C.1, II.C.1.a, ...)
+    budget_ms: Optional[int] = Field(None, gt=0)  # route by latency budget instead of the fixed fast path
+
+
+def check_filters(versions, document_ids, section=None):
+    unknown = [v for v in as_values(versions) if v not in known_versions()]
+    unknown += [d for d in as_values(document_ids) if d not in known_document_ids()]
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown version or document id: {', '.join(unknown)}")
+
+    if section:
+        try:
+            resolve_section_prefix(section, versions)
+        except UnknownSection as exc:
+            raise HTTPException(status_code=422, detail=str(exc))
+
+
+@app.get("/documents")
+def list_documents():
+    """
+    Registered releases (data/documents.json) usable as version / document filters.
+    """
+    return [
+        {k: doc.get(k) for k in ("document_id", "version", "title", "stage", "released", "supersedes")}
+        for doc in load_registry()
+    ]
+
 
 @app.post("/disclosure-analysis")
 def disclosure_analysis(req: DisclosureRequest):
     """
     Analyze a regulatory disclosure question using SEC climate rules.
+
+    Identical concurrent questions share one computation; under overload
+    the request is shed with 503 + Retry-After. With budget_ms set, the
+    router picks pipeline stages to fit the budget (504 if it runs out).
     """
-    return answer_regulatory_question(
-        query = req.query,
-        version = req.version,
+    check_filters(req.version, req.document_ids, req.section)
+
+    key = (
+        "disclosure",
+        normalize_query(req.query),
+        as_values(req.version),
+        as_values(req.document_ids),
+        normalize_prefix(req.section) if req.section else None,
+        req.budget_ms,
     )
+
+    if req.budget_ms is not None:
+        run = lambda: answer_regulatory_question_budgeted(
+            query = req.query,
+            version = req.version,
+            budget_ms = req.budget_ms,
+            document_ids = req.document_ids,
+            section = req.section,
+        )
+    else:
+        run = lambda: answer_regulatory_question(
+            query = req.query,
+            version = req.version,
+            document_ids = req.document_ids,
+            section = req.section,
+        )
+
+    return single_flight.do(key, lambda: admission.run(lambda: profiler.run(run)))
+
+
+class ComparisonRequest(BaseModel):
+    query: str
+
+
+@app.post("/comparison-analysis")
+def comparison_analysis(req: ComparisonRequest):
+    """
+    Compare the 2022 Proposed Rule and the 2024 Final Rule using
+    precomputed cross-version chunk alignment.
+    """
+    key = ("comparison", normalize_query(req.query))
+
+    return single_flight.do(
+        key,
+        lambda: admission.run(
+            lambda: profiler.run(lambda: answer_comparison_question(query=req.query))
+        ),
+    )
+
     
 @app.get("/health")
 def health():
     return {"status": "ok"}
 
+
+def microbatch_stats():
+    # a down or misconfigured sidecar should show up in the report, not fail it
+    try:
+        server = get_model_server()
+        return server.stats() if server else batch_stats()
+    except Exception as exc:
+        return {"error": f"model server unavailable: {exc!r}"}
+
+
+@app.get("/health/load")
+def load_stats():
+    return {
+        "coalesced_requests": single_flight.shared,
+        "backends": {name: limiter.stats() for name, limiter in LIMITERS.items()},
+        "microbatch": microbatch_stats(),
+        "stage_latency": latency.snapshot(),
+        "rerank_cascade": cascade_stats.snapshot(),
+        "llm_tiers": tier_stats.snapshot(),
+        "index": index_watcher.stats(),
+        "caches": cache_stats(),
+        "query_log": query_log.stats(),
+    }
+
+
+# =========================
+# admin: on-demand profiling
+# =========================
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    # without ADMIN_TOKEN the admin routes do not exist
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404)
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+class ProfileRequest(BaseModel):
+    mode: str = "cprofile"  # "cprofile" | "sample" | "tracemalloc"
+    requests: int = 20      # cprofile: requests to capture
+    seconds: float = 30.0   # upper bound for every mode
+
+
+@app.post("/admin/profile", dependencies=[Depends(require_admin)])
+def start_profile(req: ProfileRequest):
+    try:
+        return profiler.start(req.mode, requests=req.requests, seconds=req.seconds)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except RuntimeError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+
+
+@app.get("/admin/profile", dependencies=[Depends(require_admin)])
+def profile_status():
+    return profiler.status()
+
+
+@app.get("/admin/profile/files/{name}", dependencies=[Depends(require_admin)])
+def profile_file(name: str):
+    if name not in profiler.files():
+        raise HTTPException(status_code=404)
+    return FileResponse(profiler.output_dir / name, filename=name)
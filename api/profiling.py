@@ -0,0 +1,229 @@
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+# On-demand profiling for the admin endpoints in api/main.py.
+#
+#   cprofile:    deterministic profile of the next N requests (or T seconds),
+#                merged into one .pstats file (snakeviz / pstats / gprof2dot)
+#   sample:      all-thread stack sampling for T seconds, written as collapsed
+#                stacks (.folded) for flamegraph.pl / speedscope
+#   tracemalloc: top allocators by line after T seconds (.txt)
+#
+# Nothing is hooked while idle: the request wrapper is one attribute check.
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", BASE_DIR / "data" / "profiles"))
+
+MAX_SECONDS = 300
+SAMPLE_INTERVAL_S = 0.005
+TRACEMALLOC_FRAMES = 10
+TOP_ALLOCATORS = 50
+
+
+class ProfileSession:
+    def __init__(self, mode: str, requests: int, seconds: float):
+        self.mode = mode
+        self.requests_left = requests
+        self.seconds = seconds
+        self.started = time.time()
+        self.ends_at = time.monotonic() + seconds
+        self.profiled = 0
+        self.output: str | None = None
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.ends_at or self.requests_left <= 0
+
+    def describe(self) -> Dict:
+        return {
+            "mode": self.mode,
+            "started": self.started,
+            "seconds": self.seconds,
+            "requests_profiled": self.profiled,
+            "output": self.output,
+        }
+
+
+class Profiler:
+    def __init__(self, output_dir: Path = PROFILE_DIR):
+        self.output_dir = output_dir
+        self.session: ProfileSession | None = None
+        self.last: ProfileSession | None = None
+
+        self._lock = threading.Lock()
+        # cProfile is process-wide per thread stack; one request at a time
+        self._profile_lock = threading.Lock()
+        self._stats: pstats.Stats | None = None
+
+    # ---------- control ----------
+
+    def start(self, mode: str, requests: int = 20, seconds: float = 30.0) -> Dict:
+        if mode not in ("cprofile", "sample", "tracemalloc"):
+            raise ValueError(f"Unknown profile mode: {mode}")
+
+        seconds = min(max(seconds, 0.1), MAX_SECONDS)
+
+        with self._lock:
+            if self.session is not None:
+                raise RuntimeError(f"a {self.session.mode} profile is already running")
+            self.session = ProfileSession(mode, requests, seconds)
+            self._stats = None
+
+        if mode == "sample":
+            threading.Thread(target=self._sample, args=(self.session,), daemon=True).start()
+        elif mode == "tracemalloc":
+            threading.Thread(target=self._tracemalloc, args=(self.session,), daemon=True).start()
+        else:
+            # cprofile also closes on time, even if traffic stops
+            threading.Thread(target=self._expire, args=(self.session,), daemon=True).start()
+
+        return self.session.describe()
+
+    def status(self) -> Dict:
+        session = self.session or self.last
+        return {
+            "active": self.session is not None,
+            "session": session.describe() if session else None,
+            "files": self.files(),
+        }
+
+    def files(self) -> List[str]:
+        if not self.output_dir.exists():
+            return []
+        return sorted(p.name for p in self.output_dir.iterdir() if p.is_file())
+
+    def _finish(self, session: ProfileSession, filename: str, write: Callable):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        write(self.output_dir / filename)
+
+        with self._lock:
+            session.output = filename
+            if self.session is session:
+                self.session = None
+            self.last = session
+
+    def _stamp(self, session: ProfileSession) -> str:
+        return time.strftime("%Y%m%d-%H%M%S", time.localtime(session.started))
+
+    # ---------- cprofile ----------
+
+    def run(self, fn: Callable):
+        """
+        Request wrapper: profiles fn if a cprofile session wants more requests.
+        """
+        session = self.session
+        if session is None or session.mode != "cprofile":
+            return fn()
+
+        if session.expired() or not self._profile_lock.acquire(blocking=False):
+            return fn()
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+            try:
+                return fn()
+            finally:
+                profile.disable()
+                self._collect(session, profile)
+        finally:
+            self._profile_lock.release()
+
+    def _collect(self, session: ProfileSession, profile: cProfile.Profile):
+        if self._stats is None:
+            self._stats = pstats.Stats(profile)
+        else:
+            self._stats.add(profile)
+
+        session.profiled += 1
+        session.requests_left -= 1
+
+        if session.requests_left <= 0:
+            self._dump_cprofile(session)
+
+    def _expire(self, session: ProfileSession):
+        time.sleep(session.seconds)
+        with self._profile_lock:
+            if self.session is session:
+                self._dump_cprofile(session)
+
+    def _dump_cprofile(self, session: ProfileSession):
+        stats = self._stats
+
+        def write(path: Path):
+            if stats is None:
+                path.write_text("no requests were profiled\n")
+            else:
+                stats.dump_stats(path)
+
+        suffix = "pstats" if stats is not None else "empty.txt"
+        self._finish(session, f"cprofile-{self._stamp(session)}.{suffix}", write)
+
+    # ---------- stack sampling ----------
+
+    def _sample(self, session: ProfileSession):
+        me = threading.get_ident()
+        stacks = Counter()
+
+        while time.monotonic() < session.ends_at:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stacks[";".join(reversed(stack))] += 1
+            time.sleep(SAMPLE_INTERVAL_S)
+
+        def write(path: Path):
+            with open(path, "w", encoding="utf-8") as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+
+        self._finish(session, f"sample-{self._stamp(session)}.folded", write)
+
+    # ---------- tracemalloc ----------
+
+    def _tracemalloc(self, session: ProfileSession):
+        already_tracing = tracemalloc.is_tracing()
+        if not already_tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+
+        baseline = tracemalloc.take_snapshot()
+        time.sleep(session.seconds)
+        snapshot = tracemalloc.take_snapshot()
+
+        if not already_tracing:
+            tracemalloc.stop()
+
+        def write(path: Path):
+            out = io.StringIO()
+            current = snapshot.statistics("lineno")
+            growth = snapshot.compare_to(baseline, "lineno")
+
+            out.write(f"# top {TOP_ALLOCATORS} allocators (live size)\n")
+            for stat in current[:TOP_ALLOCATORS]:
+                out.write(f"{stat}\n")
+
+            out.write(f"\n# top {TOP_ALLOCATORS} by growth over {session.seconds:.0f}s\n")
+            for stat in growth[:TOP_ALLOCATORS]:
+                out.write(f"{stat}\n")
+
+            path.write_text(out.getvalue(), encoding="utf-8")
+
+        self._finish(session, f"tracemalloc-{self._stamp(session)}.txt", write)
+
+
+profiler = Profiler()
@@ -0,0 +1,174 @@
+import argparse
+import statistics
+import time
+from typing import Dict, List
+
+from ingest.collection_profiles import (
+    PROFILES,
+    collection_config,
+    search_params,
+    estimated_ram_bytes,
+)
+from search.runtime import get_qdrant, USE_LOCAL_MODELS
+
+SOURCE_COLLECTION = "regulens"
+BENCH_PREFIX = "regulens_bench"
+
+TOP_K = 5
+REPEATS = 5
+UPSERT_BATCH_SIZE = 256
+SCROLL_BATCH_SIZE = 256
+
+BENCH_QUERIES = [
+    "Why does the SEC believe additional climate-related disclosure requirements are necessary for investors?",
+    "How does the final rule treat Scope 3 emissions?",
+    "What are the specific changes in the 2024 version from the previous one?",
+    "What attestation is required for GHG emissions disclosures?",
+    "What safe harbor applies to transition plan disclosures?",
+    "When do the phase-in periods begin for large accelerated filers?",
+    "How must registrants disclose material climate-related risks?",
+    "What financial statement disclosures are required for severe weather events?",
+    "What did commenters say about the cost of compliance?",
+    "How are climate-related targets and goals disclosed?",
+]
+
+
+def embed_queries(queries: List[str]) -> List[List[float]]:
+    if USE_LOCAL_MODELS:
+        from search.runtime import get_dense_model
+
+        return get_dense_model().encode(queries, normalize_embeddings=True).tolist()
+
+    from search.remote_embeddings import embed_query
+
+    return [list(embed_query(q)) for q in queries]
+
+
+def load_source_points(client) -> List:
+    points = []
+    offset = None
+
+    while True:
+        batch, offset = client.scroll(
+            collection_name=SOURCE_COLLECTION,
+            limit=SCROLL_BATCH_SIZE,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True,
+        )
+        points.extend(batch)
+        if offset is None:
+            return points
+
+
+def build_profile_collection(client, name: str, profile: str, points: List):
+    from qdrant_client.models import PointStruct
+
+    if client.collection_exists(name):
+        client.delete_collection(name)
+
+    client.create_collection(collection_name=name, **collection_config(profile))
+
+    for i in range(0, len(points), UPSERT_BATCH_SIZE):
+        client.upsert(
+            collection_name=name,
+            points=[
+                PointStruct(id=p.id, vector=p.vector, payload=p.payload)
+                for p in points[i : i + UPSERT_BATCH_SIZE]
+            ],
+            wait=True,
+        )
+
+    # wait for optimizers (quantization, indexing) to settle
+    while client.get_collection(name).status != "green":
+        time.sleep(0.5)
+
+
+def run_queries(client, name: str, vectors: List, params, top_k: int) -> Dict:
+    latencies = []
+    results = []
+
+    for _ in range(REPEATS):
+        results = []
+        for vec in vectors:
+            start = time.perf_counter()
+            response = client.query_points(
+                collection_name=name,
+                query=vec,
+                using="dense",
+                limit=top_k,
+                with_payload=False,
+                search_params=params,
+            )
+            latencies.append((time.perf_counter() - start) * 1000)
+            results.append([str(p.id) for p in response.points])
+
+    latencies.sort()
+    return {
+        "ids": results,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))],
+    }
+
+
+def recall_at_k(results: List[List[str]], truth: List[List[str]]) -> float:
+    hits = sum(len(set(r) & set(t)) for r, t in zip(results, truth))
+    total = sum(len(t) for t in truth)
+    return hits / total if total else 0.0
+
+
+def main(profiles: List[str], top_k: int, keep: bool):
+    client = get_qdrant()
+
+    print(f"[INFO] Loading points from '{SOURCE_COLLECTION}'...")
+    points = load_source_points(client)
+    print(f"[INFO] {len(points)} points")
+
+    print("[INFO] Embedding benchmark queries...")
+    vectors = embed_queries(BENCH_QUERIES)
+
+    # exact float32 search over the source collection is the ground truth
+    truth = run_queries(
+        client,
+        SOURCE_COLLECTION,
+        vectors,
+        search_params("float32", exact=True),
+        top_k,
+    )["ids"]
+
+    rows = []
+    for profile in profiles:
+        name = f"{BENCH_PREFIX}_{profile}"
+        print(f"\n=== Profile: {profile} ===")
+
+        build_profile_collection(client, name, profile, points)
+        measured = run_queries(client, name, vectors, search_params(profile), top_k)
+
+        rows.append({
+            "profile": profile,
+            "recall": recall_at_k(measured["ids"], truth),
+            "p50_ms": measured["p50_ms"],
+            "p95_ms": measured["p95_ms"],
+            "ram_mb": estimated_ram_bytes(profile, len(points)) / 1e6,
+        })
+
+        if not keep:
+            client.delete_collection(name)
+
+    print(f"\n[RESULTS] recall@{top_k} vs exact float32, {REPEATS}x{len(vectors)} queries")
+    print(f"{'profile':10s} {'recall':>8s} {'p50 ms':>8s} {'p95 ms':>8s} {'est. RAM MB':>12s}")
+    for r in rows:
+        print(
+            f"{r['profile']:10s} {r['recall']:8.3f} {r['p50_ms']:8.2f} "
+            f"{r['p95_ms']:8.2f} {r['ram_mb']:12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Qdrant collection profile benchmark")
+    parser.add_argument("--profiles", nargs="+", choices=list(PROFILES), default=list(PROFILES))
+    parser.add_argument("--top-k", type=int, default=TOP_K)
+    parser.add_argument("--keep", action="store_true", help="keep benchmark collections")
+    args = parser.parse_args()
+
+    main(args.profiles, args.top_k, args.keep)
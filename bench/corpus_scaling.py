@@ -0,0 +1,144 @@
+import argparse
+import statistics
+import time
+import uuid
+from typing import Dict, List
+
+from bench.collection_profiles import BENCH_QUERIES, load_source_points, embed_queries
+from ingest.collection_profiles import collection_config, search_params
+from search.filters import build_filter
+from search.runtime import get_qdrant
+
+# Retrieval latency as the corpus grows to many releases.
+#
+# Builds a bench collection holding N synthetic releases (copies of the
+# indexed points relabelled "release_00", "release_01", ...), with the same
+# keyword payload indexes as production, then times dense search with:
+#   none   no filter
+#   one    a single version (MatchValue)
+#   any3   three versions at once (MatchAny)
+#   doc    a single document id
+#
+#   python -m bench.corpus_scaling --releases 2 5 10 20 40
+
+BENCH_COLLECTION = "regulens_bench_scaling"
+PROFILE = "float32"
+TOP_K = 5
+REPEATS = 3
+UPSERT_BATCH_SIZE = 256
+
+DEFAULT_RELEASES = [2, 5, 10, 20, 40]
+INDEXED_FIELDS = ["version", "document_id", "section_id"]
+
+
+def release_name(i: int) -> str:
+    return f"release_{i:02d}"
+
+
+def build_collection(client, points: List, releases: int):
+    from qdrant_client.models import PointStruct, PayloadSchemaType
+
+    if client.collection_exists(BENCH_COLLECTION):
+        client.delete_collection(BENCH_COLLECTION)
+
+    client.create_collection(collection_name=BENCH_COLLECTION, **collection_config(PROFILE))
+
+    for field_name in INDEXED_FIELDS:
+        client.create_payload_index(
+            collection_name=BENCH_COLLECTION,
+            field_name=field_name,
+            field_schema=PayloadSchemaType.KEYWORD,
+        )
+
+    batch = []
+    for i in range(releases):
+        version = release_name(i)
+        for p in points:
+            batch.append(PointStruct(
+                id=str(uuid.uuid5(uuid.NAMESPACE_URL, f"{version}:{p.id}")),
+                vector=p.vector,
+                payload={
+                    "version": version,
+                    "document_id": f"DOC_{version}",
+                    "section_id": p.payload.get("section_id"),
+                },
+            ))
+            if len(batch) >= UPSERT_BATCH_SIZE:
+                client.upsert(collection_name=BENCH_COLLECTION, points=batch, wait=True)
+                batch = []
+
+    if batch:
+        client.upsert(collection_name=BENCH_COLLECTION, points=batch, wait=True)
+
+    while client.get_collection(BENCH_COLLECTION).status != "green":
+        time.sleep(0.5)
+
+
+def filter_cases(releases: int) -> Dict:
+    return {
+        "none": None,
+        "one": build_filter(release_name(releases - 1)),
+        "any3": build_filter([release_name(i) for i in range(max(0, releases - 3), releases)]),
+        "doc": build_filter(document_ids=f"DOC_{release_name(0)}"),
+    }
+
+
+def time_queries(client, vectors: List, query_filter) -> Dict:
+    latencies = []
+    for _ in range(REPEATS):
+        for vec in vectors:
+            start = time.perf_counter()
+            client.query_points(
+                collection_name=BENCH_COLLECTION,
+                query=vec,
+                using="dense",
+                limit=TOP_K,
+                with_payload=False,
+                query_filter=query_filter,
+                search_params=search_params(PROFILE),
+            )
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))],
+    }
+
+
+def main(release_counts: List[int], keep: bool):
+    client = get_qdrant()
+
+    points = load_source_points(client)
+    vectors = embed_queries(BENCH_QUERIES)
+    print(f"[INFO] {len(points)} points per release, {len(vectors)} queries")
+
+    rows = []
+    for releases in release_counts:
+        print(f"\n=== {releases} releases ({releases * len(points)} points) ===")
+        build_collection(client, points, releases)
+
+        for case, query_filter in filter_cases(releases).items():
+            rows.append({
+                "releases": releases,
+                "points": releases * len(points),
+                "filter": case,
+                **time_queries(client, vectors, query_filter),
+            })
+
+    if not keep:
+        client.delete_collection(BENCH_COLLECTION)
+
+    print(f"\n[RESULTS] dense top-{TOP_K}, {REPEATS}x{len(vectors)} queries per cell")
+    print(f"{'releases':>8s} {'points':>8s} {'filter':>6s} {'p50 ms':>8s} {'p95 ms':>8s}")
+    for r in rows:
+        print(f"{r['releases']:8d} {r['points']:8d} {r['filter']:>6s} {r['p50_ms']:8.2f} {r['p95_ms']:8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Retrieval latency vs number of indexed releases")
+    parser.add_argument("--releases", type=int, nargs="+", default=DEFAULT_RELEASES)
+    parser.add_argument("--keep", action="store_true", help="keep the benchmark collection")
+    args = parser.parse_args()
+
+    main(args.releases, args.keep)
@@ -0,0 +1,118 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+# Cold-start import budget for the API process.
+#
+# Runs `python -X importtime -c "import api.main"` in fresh interpreters,
+# reports the slowest modules, and exits non-zero when the median exceeds
+# the budget or a module that must stay lazy shows up on the import path.
+#
+#   python -m bench.import_time
+#   python -m bench.import_time --budget-ms 600 --runs 7
+
+ROOT = Path(__file__).resolve().parents[1]
+
+TARGET = "api.main"
+BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "800"))
+RUNS = 5
+TOP_N = 15
+
+# must only load on first use (request path, startup preload, or eval mode)
+LAZY_MODULES = [
+    "groq",
+    "dotenv",
+    "huggingface_hub",
+    "qdrant_client",
+    "numpy",
+    "torch",
+    "transformers",
+    "sentence_transformers",
+    "search.hybrid_search",
+    "search.rag_answer",
+    "search.query_decomposition",
+    "ingest.reranker",
+]
+
+
+def parse_importtime(stderr: str) -> Dict[str, Dict[str, int]]:
+    """
+    module -> {"self_us", "cumulative_us"} from -X importtime output.
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, self_us, cumulative_us, name = [part.strip() for part in line.replace("import time:", "|").split("|")]
+        modules[name] = {"self_us": int(self_us), "cumulative_us": int(cumulative_us)}
+    return modules
+
+
+def measure(target: str) -> Dict[str, Dict[str, int]]:
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        # outside the repo root, so a developer .env does not pull in dotenv
+        cwd=ROOT / "bench",
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {target} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def lazy_violations(modules: Dict) -> List[str]:
+    return [
+        lazy for lazy in LAZY_MODULES
+        if any(name == lazy or name.startswith(lazy + ".") for name in modules)
+    ]
+
+
+def main(target: str, budget_ms: float, runs: int) -> int:
+    totals = []
+    modules = {}
+
+    for _ in range(runs):
+        modules = measure(target)
+        totals.append(modules[target]["cumulative_us"] / 1000)
+
+    median_ms = statistics.median(totals)
+
+    print(f"[RESULTS] import {target}: median {median_ms:.1f} ms over {runs} runs "
+          f"(min {min(totals):.1f}, max {max(totals):.1f}), budget {budget_ms:.0f} ms")
+
+    print(f"\n{'self ms':>8s} {'cum ms':>8s}  module (last run, slowest {TOP_N} by self time)")
+    for name, t in sorted(modules.items(), key=lambda kv: kv[1]["self_us"], reverse=True)[:TOP_N]:
+        print(f"{t['self_us'] / 1000:8.1f} {t['cumulative_us'] / 1000:8.1f}  {name}")
+
+    failed = False
+
+    violations = lazy_violations(modules)
+    if violations:
+        print(f"\n[FAIL] lazy modules imported eagerly: {', '.join(violations)}")
+        failed = True
+
+    if median_ms > budget_ms:
+        print(f"\n[FAIL] import time {median_ms:.1f} ms exceeds budget {budget_ms:.0f} ms")
+        failed = True
+
+    if not failed:
+        print("\n[SUCCESS] within budget, no eager heavy imports")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API import-time budget")
+    parser.add_argument("--target", default=TARGET)
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=RUNS)
+    args = parser.parse_args()
+
+    sys.exit(main(args.target, args.budget_ms, args.runs))
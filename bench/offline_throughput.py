@@ -0,0 +1,119 @@
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+# Answer-path throughput without the network.
+#
+# Runs answer_query_fast over the bench questions at several concurrency
+# levels against recorded or in-process backends (search/backends.py), so
+# pipeline / concurrency changes can be compared run to run.
+#
+#   # once, with credentials: capture real responses
+#   python -m bench.offline_throughput --backends groq=record,hf=record,qdrant=record --concurrency 1
+#
+#   # offline, reproducible
+#   REPLAY_LATENCY="groq=lognormal:900:0.35" python -m bench.offline_throughput
+#   REPLAY_LATENCY="groq=lognormal:900:0.35,hf=fixed:40,qdrant=normal:25:5" \
+#       python -m bench.offline_throughput --backends groq=fake,hf=fake,qdrant=fake
+#
+# One untimed pass loads indexes / tapes first, so every level measures the
+# steady state. Fakes without a REPLAY_LATENCY entry have no delay: their
+# numbers are local CPU work only, and the report says so.
+
+DEFAULT_BACKENDS = "groq=replay,hf=replay,qdrant=replay"
+DEFAULT_CONCURRENCY = [1, 4, 16]
+ROUNDS = 3
+
+
+def clear_caches():
+    from search.cache import embedding_cache, retrieval_cache, answer_cache
+
+    for cache in (embedding_cache, retrieval_cache, answer_cache):
+        cache.clear()
+
+
+def run_level(queries: List[str], concurrency: int, rounds: int, warm_cache: bool) -> Dict:
+    from search.rag_answer_fast import answer_query_fast
+
+    def timed_answer(query: str) -> float:
+        start = time.perf_counter()
+        answer_query_fast(query)
+        return (time.perf_counter() - start) * 1000
+
+    latencies = []
+    elapsed = 0.0
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(rounds):
+            # a repeated question would otherwise be an answer-cache hit
+            if not warm_cache:
+                clear_caches()
+
+            start = time.perf_counter()
+            latencies.extend(pool.map(timed_answer, queries))
+            elapsed += time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "qps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+    }
+
+
+def warm_up(queries: List[str]):
+    """
+    Untimed pass: one-off loads (fake collection, tapes, clients, local
+    indexes) would otherwise land on the first measured level.
+    """
+    from search.rag_answer_fast import answer_query_fast
+
+    start = time.perf_counter()
+    for query in queries:
+        answer_query_fast(query)
+    clear_caches()
+    print(f"[INFO] Warm-up pass: {len(queries)} questions in {time.perf_counter() - start:.1f}s (not measured)")
+
+
+def main(backends: str, concurrency: List[int], rounds: int, warm_cache: bool):
+    # read by search/backends.py on first import
+    os.environ["BACKENDS"] = backends
+
+    from bench.collection_profiles import BENCH_QUERIES
+    from search.backends import BACKEND_MODES, LATENCY_SPECS
+
+    print(f"[INFO] Backends: {BACKEND_MODES} | latency: {os.getenv('REPLAY_LATENCY') or 'recorded'}")
+
+    undelayed = [name for name, mode in BACKEND_MODES.items() if mode == "fake" and name not in LATENCY_SPECS]
+    if undelayed:
+        print(
+            f"[WARN] Fake backends without a REPLAY_LATENCY entry have zero delay ({', '.join(undelayed)}): "
+            f"qps below measures local CPU work, not a networked deployment"
+        )
+
+    warm_up(BENCH_QUERIES)
+
+    rows = [run_level(BENCH_QUERIES, c, rounds, warm_cache) for c in concurrency]
+
+    print(f"\n{'concurrency':>11} {'requests':>9} {'qps':>8} {'p50 ms':>9} {'p95 ms':>9}")
+    for row in rows:
+        print(
+            f"{row['concurrency']:>11d} {row['requests']:>9d} {row['qps']:>8.2f} "
+            f"{row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline answer-path throughput over recorded / fake backends")
+    parser.add_argument("--backends", default=os.getenv("BACKENDS", DEFAULT_BACKENDS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--rounds", type=int, default=ROUNDS)
+    parser.add_argument("--warm-cache", action="store_true", help="keep answer / retrieval caches between rounds")
+    args = parser.parse_args()
+
+    main(args.backends, args.concurrency, args.rounds, args.warm_cache)
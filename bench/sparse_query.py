@@ -0,0 +1,81 @@
+import argparse
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from bench.collection_profiles import BENCH_QUERIES, recall_at_k
+from search.runtime import get_qdrant, USE_LOCAL_MODELS, COLLECTION_NAME
+from search.sparse_query import encode_sparse_query
+
+# SPLADE vs inference-free (IDF) sparse query encoding:
+# per-query encode latency and sparse-only recall@k, with SPLADE's own
+# results as the reference.
+#
+#   USE_LOCAL_MODELS=true python -m bench.sparse_query
+
+TOP_K = 10
+REPEATS = 5
+
+
+def time_encoder(encode: Callable, queries: List[str]) -> Dict:
+    vectors = [encode(q) for q in queries]  # warm-up (model / table load)
+
+    latencies = []
+    for _ in range(REPEATS):
+        for q in queries:
+            start = time.perf_counter()
+            encode(q)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    return {
+        "vectors": vectors,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))],
+        "mean_terms": statistics.mean(len(v["indices"]) for v in vectors),
+    }
+
+
+def sparse_search(client, vectors: List[Dict], top_k: int) -> List[List[str]]:
+    results = []
+    for vec in vectors:
+        response = client.query_points(
+            collection_name=COLLECTION_NAME,
+            query=vec,
+            using="sparse",
+            limit=top_k,
+            with_payload=False,
+        )
+        results.append([str(p.id) for p in response.points])
+    return results
+
+
+def main(top_k: int):
+    client = get_qdrant()
+    encoders = ["splade", "idf"] if USE_LOCAL_MODELS else ["idf"]
+
+    if not USE_LOCAL_MODELS:
+        print("[WARN] USE_LOCAL_MODELS is off: no SPLADE reference, latency only")
+
+    rows = {}
+    for name in encoders:
+        print(f"[INFO] Encoding with {name}...")
+        measured = time_encoder(lambda q: encode_sparse_query(q, encoder=name), BENCH_QUERIES)
+        measured["ids"] = sparse_search(client, measured["vectors"], top_k)
+        rows[name] = measured
+
+    truth = rows["splade"]["ids"] if "splade" in rows else None
+
+    print(f"\n[RESULTS] {REPEATS}x{len(BENCH_QUERIES)} queries, sparse-only recall@{top_k} vs SPLADE")
+    print(f"{'encoder':8s} {'p50 ms':>8s} {'p95 ms':>8s} {'terms':>7s} {'recall':>8s}")
+    for name, r in rows.items():
+        recall = f"{recall_at_k(r['ids'], truth):8.3f}" if truth else f"{'n/a':>8s}"
+        print(f"{name:8s} {r['p50_ms']:8.2f} {r['p95_ms']:8.2f} {r['mean_terms']:7.1f} {recall}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sparse query encoder benchmark")
+    parser.add_argument("--top-k", type=int, default=TOP_K)
+    args = parser.parse_args()
+
+    main(args.top_k)
@@ -0,0 +1,69 @@
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from ingest.chunk_ids import chunk_point_id
+from ingest.jsonl import load_records
+
+# Chunk adjacency for neighbour expansion at retrieval time.
+#
+# Chunks are numbered per section (chunk_index 0, 1, ...), so the chunks
+# before and after a hit are found by (document_id, section_id, chunk_index ± 1).
+# One run per section, point ids and token counts in chunk_index order:
+#
+#   {"runs": [{"document_id": ..., "section_id": ..., "ids": [...], "tokens": [...]}]}
+#
+# Texts are not duplicated here; they come from the local text store
+# (search/text_store.py), which reads the same chunk files.
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+CHUNKS_DIR = BASE_DIR / "data" / "chunks"
+OUTPUT_FILE = BASE_DIR / "data" / "adjacency" / "adjacency.json"
+
+# rough token estimate for chunks packed by characters (semantic_chunk.CHUNK_BY="chars")
+CHARS_PER_TOKEN = 4
+
+
+def chunk_tokens(chunk: Dict) -> int:
+    # token-packed chunks carry an exact count
+    if "token_count" in chunk:
+        return chunk["token_count"]
+    return max(1, len(chunk["text"]) // CHARS_PER_TOKEN)
+
+
+def section_runs(chunks: Iterable[Dict]) -> List[Dict]:
+    sections = {}
+    for chunk in chunks:
+        key = (chunk["document_id"], chunk["section_id"])
+        sections.setdefault(key, []).append(chunk)
+
+    runs = []
+    for (document_id, section_id), members in sections.items():
+        members.sort(key=lambda c: c["chunk_index"])
+        runs.append({
+            "document_id": document_id,
+            "section_id": section_id,
+            "ids": [chunk_point_id(c) for c in members],
+            "tokens": [chunk_tokens(c) for c in members],
+        })
+
+    return runs
+
+
+def build_adjacency_index(chunk_files: List[Path], output_file: Path = OUTPUT_FILE):
+    runs = []
+    for path in chunk_files:
+        runs.extend(section_runs(load_records(path)))
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump({"runs": runs}, f)
+
+    total = sum(len(r["ids"]) for r in runs)
+    print(f"[DONE] Saved adjacency for {total} chunks in {len(runs)} sections → {output_file}")
+
+
+if __name__ == "__main__":
+    from ingest.registry import load_registry, chunks_file
+
+    build_adjacency_index([CHUNKS_DIR / chunks_file(doc["version"]) for doc in load_registry()])
@@ -1,6 +1,8 @@
 import json
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator
+
+from ingest.jsonl import read_jsonl, write_jsonl
 
 # paths
 BASE_DIR = Path(__file__).resolve().parents[1]
@@ -8,6 +10,8 @@ BASE_DIR = Path(__file__).resolve().parents[1]
 DATA_DIR = BASE_DIR / "data"
 STRUCTURE_DIR = DATA_DIR / "structure"
 EXTRACTED_DIR = DATA_DIR / "extracted"
+# pages after TOC / header / footer removal (ingest/clean_pages.py)
+CLEANED_DIR = DATA_DIR / "cleaned"
 ALIGNED_DIR = DATA_DIR / "aligned"
 
 ALIGNED_DIR.mkdir(exist_ok=True)
@@ -85,7 +89,7 @@ def process_document(structure_file: str, pages_file: str, version: str):
     print(f"\n=== Processing {version} ===")
 
     structure = load_json(STRUCTURE_DIR / structure_file)
-    raw_pages = load_json(EXTRACTED_DIR / pages_file)
+    raw_pages = load_json(CLEANED_DIR / pages_file)
     pages_data = raw_pages["pages"]
 
     # pages_data: [{page_number, text}]
@@ -139,17 +143,94 @@ def process_document(structure_file: str, pages_file: str, version: str):
     print(f"[DONE] Saved {len(aligned_sections)} sections → {output_path}")
 
 
+# streaming pipeline
+
+def iter_aligned_sections(structure: Dict, pages: Iterable[Dict]) -> Iterator[Dict]:
+    """
+    Streaming counterpart of process_document.
+
+    Pages must arrive in page order. Only the text of the section currently
+    being filled is held in memory; each section is yielded as soon as the
+    first page of the next section is seen.
+    """
+    flat_sections = flatten_sections(structure["sections"])
+    flat_sections.sort(key=lambda x: x["page_start"])
+
+    def make_section(sec: Dict, page_end: int, texts: List[str]) -> Dict:
+        return {
+            "document_id": structure["document_id"],
+            "version": structure["version"],
+            "section_id": sec["section_id"],
+            "section_path": sec["section_path"],
+            "title": sec["title"],
+            "page_start": sec["page_start"],
+            "page_end": page_end,
+            "text": "\n\n".join(texts),
+        }
+
+    if not flat_sections:
+        return
+
+    i = 0
+    buffer = []
+    last_page = None
+
+    for page in pages:
+        page_number = page["page_number"]
+
+        # close every section that ends before this page
+        while (
+            i + 1 < len(flat_sections)
+            and flat_sections[i + 1]["page_start"] <= page_number
+        ):
+            yield make_section(
+                flat_sections[i],
+                flat_sections[i + 1]["page_start"] - 1,
+                buffer,
+            )
+            buffer = []
+            i += 1
+
+        if page_number >= flat_sections[i]["page_start"]:
+            buffer.append(page["text"])
+
+        last_page = page_number
+
+    # flush the remaining sections; the last one runs to the final page
+    while i < len(flat_sections):
+        if i + 1 < len(flat_sections):
+            page_end = flat_sections[i + 1]["page_start"] - 1
+        else:
+            page_end = last_page
+
+        yield make_section(flat_sections[i], page_end, buffer)
+        buffer = []
+        i += 1
+
+
+def process_document_stream(structure_file: str, pages_file: str, version: str):
+    """
+    JSON Lines in (one page per line), JSON Lines out (one section per line).
+    """
+    print(f"\n=== Streaming {version} ===")
+
+    structure = load_json(STRUCTURE_DIR / structure_file)
+    pages = read_jsonl(CLEANED_DIR / pages_file)
+
+    output_path = ALIGNED_DIR / f"{version}_sections.jsonl"
+    count = write_jsonl(output_path, iter_aligned_sections(structure, pages))
+
+    print(f"[DONE] Saved {count} sections → {output_path}")
+
+
 # entry point
 
 if __name__ == "__main__":
-    process_document(
-        structure_file="sec_2022.json",
-        pages_file="sec_2022_pages.json",
-        version="2022_proposed"
-    )
-
-    process_document(
-        structure_file="sec_2024.json",
-        pages_file="sec_2024_pages.json",
-        version="2024_final"
-    )
+    from ingest.registry import load_registry
+
+    for doc in load_registry():
+        process_document(
+            structure_file=doc["structure_file"],
+            pages_file=doc["pages_file"],
+            version=doc["version"]
+        )
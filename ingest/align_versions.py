@@ -0,0 +1,172 @@
+import json
+import re
+from pathlib import Path
+from typing import List, Dict
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+from ingest.chunk_ids import chunk_point_id
+from ingest.jsonl import load_records
+
+# paths
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+DATA_DIR = BASE_DIR / "data"
+CHUNKS_DIR = DATA_DIR / "chunks"
+ALIGNMENT_DIR = DATA_DIR / "alignment"
+
+ALIGNMENT_DIR.mkdir(exist_ok=True)
+
+# config
+
+DENSE_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+BATCH_SIZE = 32
+
+# rows of the similarity matrix computed per block
+SIMILARITY_BLOCK = 256
+
+# counterparts kept per final-rule chunk
+TOP_N = 3
+
+# Section titles are short and often reworded between proposal and final rule,
+# so title overlap only nudges the embedding score instead of dominating it.
+TITLE_WEIGHT = 0.15
+
+TITLE_STOPWORDS = {
+    "the", "of", "and", "for", "to", "a", "an", "in", "on", "or",
+    "proposed", "final", "rule", "rules", "amendments",
+}
+
+TOKEN_REGEX = re.compile(r"[a-z0-9]+")
+
+
+# helper functions
+
+def title_tokens(title: str) -> set:
+    return {
+        t for t in TOKEN_REGEX.findall(title.lower())
+        if t not in TITLE_STOPWORDS
+    }
+
+
+def title_similarity_matrix(source: List[Dict], target: List[Dict]) -> np.ndarray:
+    """
+    Jaccard overlap between section titles, computed once per distinct title pair.
+    """
+    source_titles = sorted({c["title"] for c in source})
+    target_titles = sorted({c["title"] for c in target})
+
+    source_tokens = [title_tokens(t) for t in source_titles]
+    target_tokens = [title_tokens(t) for t in target_titles]
+
+    title_sim = np.zeros((len(source_titles), len(target_titles)), dtype=np.float32)
+    for i, a in enumerate(source_tokens):
+        for j, b in enumerate(target_tokens):
+            if a and b:
+                title_sim[i, j] = len(a & b) / len(a | b)
+
+    source_pos = {t: i for i, t in enumerate(source_titles)}
+    target_pos = {t: j for j, t in enumerate(target_titles)}
+
+    rows = np.array([source_pos[c["title"]] for c in source])
+    cols = np.array([target_pos[c["title"]] for c in target])
+
+    return title_sim[np.ix_(rows, cols)]
+
+
+def embed_chunks(model: SentenceTransformer, chunks: List[Dict]) -> np.ndarray:
+    return model.encode(
+        [c["text"] for c in chunks],
+        batch_size=BATCH_SIZE,
+        show_progress_bar=True,
+        normalize_embeddings=True,
+        convert_to_numpy=True,
+    ).astype(np.float32)
+
+
+# main pipeline
+
+def build_pair_index(
+    source_file: str,
+    target_file: str,
+    output_file: str,
+    top_n: int = TOP_N,
+):
+    """
+    For every chunk in the source (final) rule, precompute the nearest
+    counterpart chunks in the target (proposed) rule.
+    """
+    source = load_records(CHUNKS_DIR / source_file)
+    target = load_records(CHUNKS_DIR / target_file)
+
+    print(f"\n=== Aligning {source_file} → {target_file} ===")
+    print(f"[INFO] {len(source)} source chunks, {len(target)} target chunks")
+
+    model = SentenceTransformer(DENSE_MODEL_NAME)
+
+    print("[INFO] Embedding source chunks...")
+    source_vecs = embed_chunks(model, source)
+
+    print("[INFO] Embedding target chunks...")
+    target_vecs = embed_chunks(model, target)
+
+    print("[INFO] Matching section titles...")
+    title_sim = title_similarity_matrix(source, target)
+
+    top_n = min(top_n, len(target))
+    pairs = {}
+
+    for start in range(0, len(source), SIMILARITY_BLOCK):
+        end = start + SIMILARITY_BLOCK
+
+        # embeddings are normalized, so the dot product is cosine similarity
+        cosine = source_vecs[start:end] @ target_vecs.T
+        combined = cosine + TITLE_WEIGHT * title_sim[start:end]
+
+        best = np.argpartition(-combined, top_n - 1, axis=1)[:, :top_n]
+
+        for row, candidates in enumerate(best):
+            order = candidates[np.argsort(-combined[row, candidates])]
+            chunk = source[start + row]
+
+            pairs[chunk_point_id(chunk)] = [
+                {
+                    "point_id": chunk_point_id(target[j]),
+                    "section_id": target[j]["section_id"],
+                    "chunk_index": target[j]["chunk_index"],
+                    "score": round(float(combined[row, j]), 4),
+                    "cosine": round(float(cosine[row, j]), 4),
+                    "title_score": round(float(title_sim[start + row, j]), 4),
+                }
+                for j in order
+            ]
+
+    output = {
+        "source_version": source[0]["version"] if source else None,
+        "target_version": target[0]["version"] if target else None,
+        "model": DENSE_MODEL_NAME,
+        "title_weight": TITLE_WEIGHT,
+        "top_n": top_n,
+        "pairs": pairs,
+    }
+
+    output_path = ALIGNMENT_DIR / output_file
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(output, f, indent=2)
+
+    print(f"[DONE] Saved {len(pairs)} aligned chunks → {output_path}")
+
+
+# entry point
+
+if __name__ == "__main__":
+    from ingest.registry import alignment_pairs, chunks_file, alignment_file
+
+    for source, target in alignment_pairs():
+        build_pair_index(
+            source_file=chunks_file(source),
+            target_file=chunks_file(target),
+            output_file=alignment_file(source, target),
+        )
@@ -0,0 +1,20 @@
+import uuid
+
+# Fixed namespace so the same chunk always maps to the same point id,
+# across re-ingestion runs and across every artifact that refers to it.
+CHUNK_NAMESPACE = uuid.UUID("6f1c9a52-3d0e-4b7a-9c61-2f8e5d4a7b30")
+
+
+def chunk_key(chunk: dict) -> str:
+    """
+    Human-readable chunk identity: document, section and position.
+    """
+    return f"{chunk['document_id']}:{chunk['section_id']}:{chunk['chunk_index']}"
+
+
+def chunk_point_id(chunk: dict) -> str:
+    """
+    Deterministic Qdrant point id for a chunk.
+    Uses the hyphenated UUID form, which is what Qdrant returns on search.
+    """
+    return str(uuid.uuid5(CHUNK_NAMESPACE, chunk_key(chunk)))
@@ -0,0 +1,143 @@
+import json
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+
+from ingest.jsonl import read_jsonl, write_jsonl
+
+# paths
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+DATA_DIR = BASE_DIR / "data"
+EXTRACTED_DIR = DATA_DIR / "extracted"
+CLEANED_DIR = DATA_DIR / "cleaned"
+
+CLEANED_DIR.mkdir(exist_ok=True)
+
+
+# Cleaning between extraction and alignment:
+# - pages flagged is_toc_candidate at extraction are dropped
+# - dotted-leader TOC lines ("A. Scope ........ 812") are dropped anywhere
+# - running headers / footers: lines in the first or last EDGE_LINES lines
+#   of a page whose digit-normalised form ("Page #") recurs on at least
+#   MIN_REPEAT_SHARE of the pages. Footnotes near the page bottom repeat far
+#   less often, so they stay.
+EDGE_LINES = 2
+MIN_REPEAT_SHARE = 0.5
+MIN_REPEAT_PAGES = 3
+
+TOC_LINE_REGEX = re.compile(r"\.{4,}\s*\d+\s*$")
+DIGITS_REGEX = re.compile(r"\d+")
+SPACE_REGEX = re.compile(r"\s+")
+
+
+def line_key(line: str) -> str:
+    # "Page 41" and "Page 42" are the same footer
+    return SPACE_REGEX.sub(" ", DIGITS_REGEX.sub("#", line.strip().lower()))
+
+
+def edge_positions(lines: List[str]) -> set:
+    """
+    Indices of the first / last EDGE_LINES non-blank lines.
+    """
+    filled = [i for i, line in enumerate(lines) if line.strip()]
+    return set(filled[:EDGE_LINES] + filled[-EDGE_LINES:])
+
+
+def repeated_edge_lines(pages: Iterable[Dict]) -> set:
+    counts = Counter()
+    total = 0
+
+    for page in pages:
+        total += 1
+        lines = page["text"].splitlines()
+        counts.update({line_key(lines[i]) for i in edge_positions(lines)})
+
+    threshold = max(MIN_REPEAT_PAGES, MIN_REPEAT_SHARE * total)
+    return {key for key, n in counts.items() if n >= threshold}
+
+
+class CleaningReport:
+    def __init__(self):
+        self.pages_in = 0
+        self.toc_pages = 0
+        self.lines_removed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def summary(self) -> str:
+        removed = self.bytes_in - self.bytes_out
+        share = removed / self.bytes_in if self.bytes_in else 0.0
+        return (
+            f"{self.toc_pages} TOC pages of {self.pages_in} dropped, "
+            f"{self.lines_removed} header/footer/TOC lines stripped, "
+            f"{removed} of {self.bytes_in} bytes removed ({share:.1%})"
+        )
+
+
+def clean_text(text: str, repeated: set, report: CleaningReport) -> str:
+    lines = text.splitlines()
+    edges = edge_positions(lines)
+
+    kept = []
+    for i, line in enumerate(lines):
+        if TOC_LINE_REGEX.search(line) or (i in edges and line_key(line) in repeated):
+            report.lines_removed += 1
+            continue
+        kept.append(line)
+
+    return "\n".join(kept).strip()
+
+
+def iter_clean_pages(pages: Iterable[Dict], repeated: set, report: CleaningReport) -> Iterator[Dict]:
+    for page in pages:
+        report.pages_in += 1
+        report.bytes_in += len(page["text"].encode("utf-8"))
+
+        if page.get("is_toc_candidate"):
+            report.toc_pages += 1
+            continue
+
+        text = clean_text(page["text"], repeated, report)
+        report.bytes_out += len(text.encode("utf-8"))
+        yield {**page, "text": text}
+
+
+def clean_pages(pages_file: str) -> CleaningReport:
+    with open(EXTRACTED_DIR / pages_file, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+
+    report = CleaningReport()
+    repeated = repeated_edge_lines(raw["pages"])
+    pages = list(iter_clean_pages(raw["pages"], repeated, report))
+
+    output_path = CLEANED_DIR / pages_file
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump({**raw, "pages": pages}, f, indent=2, ensure_ascii=False)
+
+    print(f"[DONE] Cleaned {pages_file}: {report.summary()} → {output_path}")
+    return report
+
+
+def clean_pages_stream(pages_file: str) -> CleaningReport:
+    """
+    Two passes over the JSON Lines pages: count edge lines, then clean.
+    """
+    source = EXTRACTED_DIR / pages_file
+
+    report = CleaningReport()
+    repeated = repeated_edge_lines(read_jsonl(source))
+
+    output_path = CLEANED_DIR / pages_file
+    write_jsonl(output_path, iter_clean_pages(read_jsonl(source), repeated, report))
+
+    print(f"[DONE] Cleaned {pages_file}: {report.summary()} → {output_path}")
+    return report
+
+
+if __name__ == "__main__":
+    from ingest.registry import load_registry
+
+    for doc in load_registry():
+        clean_pages(doc["pages_file"])
@@ -0,0 +1,164 @@
+from typing import Dict
+
+from qdrant_client.models import (
+    VectorParams,
+    Distance,
+    SparseVectorParams,
+    SparseIndexParams,
+    HnswConfigDiff,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    SearchParams,
+    QuantizationSearchParams,
+)
+
+DENSE_SIZE = 384
+
+# Collection storage profiles.
+#
+# float32: original layout, everything in RAM.
+# int8:    scalar-quantized vectors in RAM, float32 originals on disk,
+#          rescored with a small oversampling factor.
+# binary:  1-bit quantized vectors in RAM, originals on disk; needs heavier
+#          oversampling because 384-d MiniLM codes are coarse.
+#
+# Quantized profiles also keep payloads and the sparse index on disk:
+# search reads payload text from the local store (search/text_store.py),
+# so Qdrant only serves filter fields.
+PROFILES = {
+    "float32": {
+        "quantization": None,
+        "dense_on_disk": False,
+        "sparse_on_disk": False,
+        "on_disk_payload": False,
+        "oversampling": None,
+        "hnsw_ef": None,
+    },
+    "int8": {
+        "quantization": "int8",
+        "dense_on_disk": True,
+        "sparse_on_disk": True,
+        "on_disk_payload": True,
+        "oversampling": 1.5,
+        "hnsw_ef": 64,
+    },
+    "binary": {
+        "quantization": "binary",
+        "dense_on_disk": True,
+        "sparse_on_disk": True,
+        "on_disk_payload": True,
+        "oversampling": 3.0,
+        "hnsw_ef": 128,
+    },
+}
+
+DEFAULT_PROFILE = "float32"
+
+
+def get_profile(name: str) -> Dict:
+    if name not in PROFILES:
+        raise ValueError(
+            f"Unknown collection profile '{name}'. "
+            f"Expected one of: {', '.join(PROFILES)}"
+        )
+    return PROFILES[name]
+
+
+def quantization_config(profile: Dict):
+    if profile["quantization"] == "int8":
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(
+                type=ScalarType.INT8,
+                quantile=0.99,
+                always_ram=True,
+            )
+        )
+
+    if profile["quantization"] == "binary":
+        return BinaryQuantization(
+            binary=BinaryQuantizationConfig(always_ram=True)
+        )
+
+    return None
+
+
+def collection_config(name: str = DEFAULT_PROFILE) -> Dict:
+    """
+    Keyword arguments for QdrantClient.create_collection.
+    """
+    profile = get_profile(name)
+
+    return {
+        "vectors_config": {
+            "dense": VectorParams(
+                size=DENSE_SIZE,
+                distance=Distance.COSINE,
+                on_disk=profile["dense_on_disk"],
+                hnsw_config=HnswConfigDiff(
+                    m=16,
+                    ef_construct=128,
+                ),
+                quantization_config=quantization_config(profile),
+            )
+        },
+        "sparse_vectors_config": {
+            "sparse": SparseVectorParams(
+                index=SparseIndexParams(on_disk=profile["sparse_on_disk"])
+            )
+        },
+        "on_disk_payload": profile["on_disk_payload"],
+    }
+
+
+def search_params(
+    name: str = DEFAULT_PROFILE,
+    hnsw_ef: int | None = None,
+    exact: bool = False,
+) -> SearchParams | None:
+    """
+    Query-time parameters matching a collection profile.
+    Explicit hnsw_ef / exact override the profile defaults.
+    """
+    profile = get_profile(name)
+    hnsw_ef = hnsw_ef if hnsw_ef is not None else profile["hnsw_ef"]
+
+    quantization = None
+    if profile["quantization"]:
+        quantization = QuantizationSearchParams(
+            rescore=True,
+            oversampling=profile["oversampling"],
+        )
+
+    if hnsw_ef is None and not exact and quantization is None:
+        return None
+
+    return SearchParams(
+        hnsw_ef=hnsw_ef,
+        exact=exact,
+        quantization=quantization,
+    )
+
+
+def estimated_ram_bytes(name: str, points: int, m: int = 16) -> int:
+    """
+    Rough resident-memory estimate for the dense vectors of a profile:
+    in-RAM vector storage plus HNSW links (2*m neighbours on layer 0).
+    """
+    profile = get_profile(name)
+
+    if profile["quantization"] == "int8":
+        vectors = points * DENSE_SIZE
+    elif profile["quantization"] == "binary":
+        vectors = points * DENSE_SIZE // 8
+    else:
+        vectors = 0
+
+    if not profile["dense_on_disk"]:
+        vectors += points * DENSE_SIZE * 4
+
+    graph = points * 2 * m * 4
+
+    return vectors + graph
@@ -1,62 +1,51 @@
 import os
+import argparse
 from qdrant_client import QdrantClient
-from qdrant_client.models import (
-    VectorParams,
-    Distance,
-    SparseVectorParams,
-    HnswConfigDiff,
-    PayloadSchemaType
-)
+from qdrant_client.models import PayloadSchemaType
 from dotenv import load_dotenv
 
+from ingest.collection_profiles import PROFILES, collection_config
+
 load_dotenv()
 
 COLLECTION_NAME = "regulens"
+COLLECTION_PROFILE = os.getenv("COLLECTION_PROFILE", "float32")
 
 client = QdrantClient(url=os.getenv("QDRANT_URL"), api_key=os.getenv("QDRANT_API_KEY"))
 
-def create_collection():
+def create_collection(
+    collection_name: str = COLLECTION_NAME,
+    profile: str = COLLECTION_PROFILE,
+):
     # Delete if exists (safe for local dev)
-    if COLLECTION_NAME in [c.name for c in client.get_collections().collections]:
-        print(f"[INFO] Collection '{COLLECTION_NAME}' already exists. Deleting...")
-        client.delete_collection(COLLECTION_NAME)
+    if collection_name in [c.name for c in client.get_collections().collections]:
+        print(f"[INFO] Collection '{collection_name}' already exists. Deleting...")
+        client.delete_collection(collection_name)
 
-    print("[INFO] Creating collection...")
+    print(f"[INFO] Creating collection (profile={profile})...")
 
     client.create_collection(
-        collection_name = COLLECTION_NAME,
-        vectors_config = {
-            "dense": VectorParams(
-                size = 384,
-                distance = Distance.COSINE,
-                hnsw_config = HnswConfigDiff(
-                    m = 16,
-                    ef_construct = 128
-                )
-            )
-        },
-        sparse_vectors_config={
-            "sparse": SparseVectorParams()
-        }
+        collection_name = collection_name,
+        **collection_config(profile)
     )
 
     print("[INFO] Creating payload indexes...")
 
     # Metadata filters for pre-filtering -> faster retrieval
     client.create_payload_index(
-        collection_name=COLLECTION_NAME,
+        collection_name=collection_name,
         field_name="version",
         field_schema=PayloadSchemaType.KEYWORD
     )
 
     client.create_payload_index(
-        collection_name=COLLECTION_NAME,
+        collection_name=collection_name,
         field_name="section_id",
         field_schema=PayloadSchemaType.KEYWORD
     )
 
     client.create_payload_index(
-        collection_name=COLLECTION_NAME,
+        collection_name=collection_name,
         field_name="document_id",
         field_schema=PayloadSchemaType.KEYWORD
     )
@@ -64,4 +53,13 @@ def create_collection():
     print("[DONE] Collection created successfully.")
 
 if __name__ == "__main__":
-    create_collection()
+    parser = argparse.ArgumentParser(description="Create the ReguLens Qdrant collection")
+    parser.add_argument("--profile", choices=list(PROFILES), default=COLLECTION_PROFILE)
+    parser.add_argument(
+        "--name",
+        default=COLLECTION_NAME,
+        help="collection to (re)create; for zero-downtime rebuilds use ingest/reindex.py",
+    )
+    args = parser.parse_args()
+
+    create_collection(collection_name=args.name, profile=args.profile)
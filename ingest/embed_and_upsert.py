@@ -1,17 +1,30 @@
 import os
 import json
-import uuid
+from functools import lru_cache
 from pathlib import Path
 from tqdm import tqdm
 from dotenv import load_dotenv
 
 from qdrant_client import QdrantClient
-from qdrant_client.models import PointStruct
+from qdrant_client.models import (
+    PointStruct,
+    Filter,
+    FieldCondition,
+    MatchValue,
+    HasIdCondition,
+    FilterSelector,
+)
+from qdrant_client.http.exceptions import UnexpectedResponse
 
 import torch
 from sentence_transformers import SentenceTransformer
 from transformers import AutoTokenizer, AutoModelForMaskedLM
 
+from ingest.chunk_ids import chunk_point_id
+from ingest.jsonl import read_jsonl, batched
+from ingest.near_duplicates import load_canonical_map
+from ingest.vector_store import DenseVectorWriter, collection_vectors_dir, save_chunk_file
+
 load_dotenv()
 
 # config
@@ -26,15 +39,19 @@ BATCH_SIZE = 32
 UPSERT_BATCH_SIZE = 64
 
 
-# load models
+# load models (once, on first use, so importing this module stays cheap)
+
+@lru_cache
+def load_models():
+    print("[INFO] Loading dense embedding model...")
+    dense_model = SentenceTransformer(DENSE_MODEL_NAME)
 
-print("[INFO] Loading dense embedding model...")
-dense_model = SentenceTransformer(DENSE_MODEL_NAME)
+    print("[INFO] Loading SPLADE model...")
+    splade_tokenizer = AutoTokenizer.from_pretrained(SPLADE_MODEL_ID)
+    splade_model = AutoModelForMaskedLM.from_pretrained(SPLADE_MODEL_ID)
+    splade_model.eval()
 
-print("[INFO] Loading SPLADE model...")
-splade_tokenizer = AutoTokenizer.from_pretrained(SPLADE_MODEL_ID)
-splade_model = AutoModelForMaskedLM.from_pretrained(SPLADE_MODEL_ID)
-splade_model.eval()
+    return dense_model, splade_tokenizer, splade_model
 
 # SPLADE model
 
@@ -44,6 +61,8 @@ def compute_splade_sparse_vector(text: str):
     Returns sparse vector in Qdrant format:
     { "indices": [...], "values": [...] }
     """
+    _, splade_tokenizer, splade_model = load_models()
+
     tokens = splade_tokenizer(
         text,
         return_tensors="pt",
@@ -73,7 +92,135 @@ def compute_splade_sparse_vector(text: str):
 
 # ingestion
 
-def ingest_chunks(json_file: Path):
+@lru_cache
+def canonical_ids() -> dict:
+    return load_canonical_map()
+
+
+def build_point(chunk: dict, dense_vec, sparse_vec: dict) -> PointStruct:
+    point_id = chunk_point_id(chunk)
+    canonical_id = canonical_ids().get(point_id, point_id)
+
+    return PointStruct(
+        id = point_id,
+        vector = {
+            "dense": dense_vec.tolist(),
+            "sparse": sparse_vec
+        },
+        payload = {
+            "document_id": chunk["document_id"],
+            "version": chunk["version"],
+            "section_id": chunk["section_id"],
+            "section_path": chunk["section_path"],
+            "title": chunk["title"],
+            "chunk_index": chunk["chunk_index"],
+            # near-duplicate cluster (ingest/near_duplicates.py)
+            "canonical_id": canonical_id,
+            "is_duplicate": canonical_id != point_id,
+            "text": chunk["text"]
+        }
+    )
+
+
+def delete_stale_points(client, collection_name: str, document_ids: set, kept_ids: list):
+    """
+    Re-chunking can drop chunks; their points (deterministic ids) would
+    otherwise stay searchable. Runs after the upsert, so the document is
+    never missing from the collection in between.
+    """
+    for document_id in sorted(document_ids):
+        client.delete(
+            collection_name = collection_name,
+            points_selector = FilterSelector(
+                filter = Filter(
+                    must = [FieldCondition(key="document_id", match=MatchValue(value=document_id))],
+                    must_not = [HasIdCondition(has_id=kept_ids)],
+                )
+            ),
+        )
+
+
+def collection_state(document_id: str | None = None, collection_name: str = COLLECTION_NAME) -> dict:
+    """
+    What the pipeline records for stages whose output is in Qdrant: the
+    collection and its point count (for one document when given).
+    A wiped or recreated collection no longer matches.
+    """
+    client = QdrantClient(
+        url = os.getenv("QDRANT_URL"),
+        api_key = os.getenv("QDRANT_API_KEY")
+    )
+
+    count_filter = None
+    if document_id is not None:
+        count_filter = Filter(must=[FieldCondition(key="document_id", match=MatchValue(value=document_id))])
+
+    try:
+        points = client.count(collection_name=collection_name, count_filter=count_filter, exact=True).count
+    except (UnexpectedResponse, ValueError):
+        # collection (or alias) does not exist
+        points = 0
+
+    return {"collection": collection_name, "points": points}
+
+
+def update_duplicate_flags(collection_name: str = COLLECTION_NAME):
+    """
+    Rewrites canonical_id / is_duplicate from the current duplicate map
+    (ingest/near_duplicates.py) with payload updates only, no re-embedding.
+    """
+    canonical_ids.cache_clear()
+    canonical = canonical_ids()
+
+    client = QdrantClient(
+        url = os.getenv("QDRANT_URL"),
+        api_key = os.getenv("QDRANT_API_KEY")
+    )
+
+    # chunks that left their cluster become their own canonical again
+    released = []
+    offset = None
+    while True:
+        records, offset = client.scroll(
+            collection_name = collection_name,
+            scroll_filter = Filter(must=[FieldCondition(key="is_duplicate", match=MatchValue(value=True))]),
+            limit = UPSERT_BATCH_SIZE,
+            offset = offset,
+            with_payload = False,
+        )
+        released.extend(str(r.id) for r in records if canonical.get(str(r.id), str(r.id)) == str(r.id))
+        if offset is None:
+            break
+
+    for point_id in released:
+        client.set_payload(
+            collection_name = collection_name,
+            payload = {"canonical_id": point_id, "is_duplicate": False},
+            points = [point_id],
+        )
+
+    clusters = {}
+    for point_id, head_id in canonical.items():
+        clusters.setdefault(head_id, []).append(point_id)
+
+    for head_id, members in clusters.items():
+        client.set_payload(
+            collection_name = collection_name,
+            payload = {"canonical_id": head_id, "is_duplicate": False},
+            points = [head_id],
+        )
+        duplicates = [m for m in members if m != head_id]
+        if duplicates:
+            client.set_payload(
+                collection_name = collection_name,
+                payload = {"canonical_id": head_id, "is_duplicate": True},
+                points = duplicates,
+            )
+
+    print(f"[DONE] Duplicate flags: {len(clusters)} clusters set, {len(released)} chunks released")
+
+
+def ingest_chunks(json_file: Path, collection_name: str = COLLECTION_NAME):
     print(f"\n=== Ingesting {json_file.name} ===")
 
     with open(json_file, "r", encoding="utf-8") as f:
@@ -86,6 +233,8 @@ def ingest_chunks(json_file: Path):
         api_key = os.getenv("QDRANT_API_KEY")
     )
 
+    dense_model, _, _ = load_models()
+
     texts = [c["text"] for c in chunks]
 
     print("[INFO] Generating dense embeddings...")
@@ -96,44 +245,95 @@ def ingest_chunks(json_file: Path):
         normalize_embeddings = True
     )
 
+    # local float16 copy for the in-process binary index (search/binary_index.py)
+    # per collection, so building a new one leaves the live local index alone
+    vectors_dir = collection_vectors_dir(collection_name)
+    with DenseVectorWriter(json_file.stem, vectors_dir) as writer:
+        writer.write(chunks, dense_vectors)
+    save_chunk_file(json_file, vectors_dir)
+    print(f"[INFO] Saved {writer.count} dense vectors → {writer.vectors_path}")
+
     points = []
 
     print("[INFO] Generating SPLADE sparse vectors + preparing points...")
     for chunk, dense_vec in tqdm(zip(chunks, dense_vectors), total=len(chunks)):
         sparse_vec = compute_splade_sparse_vector(chunk["text"])
-
-        point = PointStruct(
-            id = uuid.uuid4().hex,
-            vector = {
-                "dense": dense_vec.tolist(),
-                "sparse": sparse_vec
-            },
-            payload = {
-                "document_id": chunk["document_id"],
-                "version": chunk["version"],
-                "section_id": chunk["section_id"],
-                "section_path": chunk["section_path"],
-                "title": chunk["title"],
-                "text": chunk["text"]
-            }
-        )
-        points.append(point)
+        points.append(build_point(chunk, dense_vec, sparse_vec))
 
     print(f"[INFO] Upserting {len(points)} points...")
     for i in range(0, len(points), UPSERT_BATCH_SIZE):
         batch = points[i : i + UPSERT_BATCH_SIZE]
 
         client.upsert(
-            collection_name = COLLECTION_NAME,
+            collection_name = collection_name,
             points = batch,
         )
 
         print(f"  → Upserted {i + len(batch)} / {len(points)} points")
 
-    count = client.count(collection_name=COLLECTION_NAME).count
+    delete_stale_points(
+        client,
+        collection_name,
+        {c["document_id"] for c in chunks},
+        [p.id for p in points],
+    )
+
+    count = client.count(collection_name=collection_name).count
+    print(f"[DONE] Collection now contains {count} points")
+
+
+def ingest_chunks_stream(jsonl_file: Path, collection_name: str = COLLECTION_NAME):
+    """
+    Streaming ingestion: reads one upsert batch of chunks at a time,
+    embeds it and upserts it before reading the next.
+    Peak memory is bounded by UPSERT_BATCH_SIZE, not corpus size.
+    """
+    print(f"\n=== Streaming {jsonl_file.name} ===")
+
+    client = QdrantClient(
+        url = os.getenv("QDRANT_URL"),
+        api_key = os.getenv("QDRANT_API_KEY")
+    )
+
+    dense_model, _, _ = load_models()
+
+    total = 0
+    document_ids = set()
+    kept_ids = []
+    vectors_dir = collection_vectors_dir(collection_name)
+    with DenseVectorWriter(jsonl_file.stem, vectors_dir) as writer:
+        for batch in batched(read_jsonl(jsonl_file), UPSERT_BATCH_SIZE):
+            dense_vectors = dense_model.encode(
+                [c["text"] for c in batch],
+                batch_size = BATCH_SIZE,
+                normalize_embeddings = True
+            )
+            writer.write(batch, dense_vectors)
+
+            points = [
+                build_point(chunk, dense_vec, compute_splade_sparse_vector(chunk["text"]))
+                for chunk, dense_vec in zip(batch, dense_vectors)
+            ]
+
+            client.upsert(
+                collection_name = collection_name,
+                points = points,
+            )
+
+            document_ids.update(c["document_id"] for c in batch)
+            kept_ids.extend(p.id for p in points)
+            total += len(points)
+            print(f"  → Upserted {total} points")
+
+    save_chunk_file(jsonl_file, vectors_dir)
+    delete_stale_points(client, collection_name, document_ids, kept_ids)
+
+    count = client.count(collection_name=collection_name).count
     print(f"[DONE] Collection now contains {count} points")
 
 
 if __name__ == "__main__":
-    ingest_chunks(CHUNKS_DIR / "2022_proposed_chunks.json")
-    ingest_chunks(CHUNKS_DIR / "2024_final_chunks.json")
+    from ingest.registry import load_registry, chunks_file
+
+    for doc in load_registry():
+        ingest_chunks(CHUNKS_DIR / chunks_file(doc["version"]))
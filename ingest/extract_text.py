@@ -3,24 +3,23 @@ import json
 import re
 from pathlib import Path
 
+from ingest.jsonl import write_jsonl
+from ingest.registry import load_registry
+
 # configuration
 DATA_DIR = Path("data")
 OUTPUT_DIR = DATA_DIR / "extracted"
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+# one entry per release in data/documents.json
 PDFS = [
     {
-        "document_id": "SEC_Climate_Proposed_2022",
-        "version": "2022_proposed",
-        "pdf_path": DATA_DIR / "sec_2022" / "sec_2022_proposed.pdf",
-        "output_file": OUTPUT_DIR / "sec_2022_pages.json",
-    },
-    {
-        "document_id": "SEC_Climate_Final_2024",
-        "version": "2024_final",
-        "pdf_path": DATA_DIR / "sec_2024" / "sec_2024_final.pdf",
-        "output_file": OUTPUT_DIR / "sec_2024_pages.json",
-    },
+        "document_id": doc["document_id"],
+        "version": doc["version"],
+        "pdf_path": Path(doc["pdf_path"]),
+        "output_file": OUTPUT_DIR / doc["pages_file"],
+    }
+    for doc in load_registry()
 ]
 
 # table of contents 
@@ -80,6 +79,35 @@ def extract_pdf(pdf_config):
 
     print(f"Saved → {pdf_config['output_file']}")
 
+
+# streaming extract
+def iter_pdf_pages(pdf_config):
+    """
+    Yields one page record at a time and releases each page's
+    parsed objects once its text is extracted.
+    """
+    with pdfplumber.open(pdf_config["pdf_path"]) as pdf:
+        for idx, page in enumerate(pdf.pages):
+            page_number = idx + 1
+            text = page.extract_text() or ""
+            page.close()
+
+            yield {
+                "document_id": pdf_config["document_id"],
+                "version": pdf_config["version"],
+                "page_number": page_number,
+                "text": text.strip(),
+                "is_toc_candidate": is_toc_candidate(text, page_number),
+            }
+
+
+def extract_pdf_stream(pdf_config, output_file: Path):
+    print(f"\n Streaming: {pdf_config['pdf_path'].name}")
+
+    count = write_jsonl(output_file, iter_pdf_pages(pdf_config))
+
+    print(f"Saved {count} pages → {output_file}")
+
 # main
 if __name__ == "__main__":
     print("🚀 Starting PDF text extraction")
@@ -0,0 +1,46 @@
+import json
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+
+
+# JSON Lines helpers for the streaming ingest mode:
+# one record per line, so readers and writers never hold a whole file.
+
+def read_jsonl(path: Path) -> Iterator[Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def write_jsonl(path: Path, records: Iterable[Dict]) -> int:
+    """
+    Consumes an iterable of records and writes them one per line.
+    Returns the number of records written.
+    """
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def batched(records: Iterable, size: int) -> Iterator[List]:
+    it = iter(records)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def load_records(path: Path) -> List[Dict]:
+    """
+    Loads a whole artifact in either format (.json array or .jsonl).
+    """
+    path = Path(path)
+    if path.suffix == ".jsonl":
+        return list(read_jsonl(path))
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
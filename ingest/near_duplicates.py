@@ -0,0 +1,214 @@
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, List
+
+from ingest.chunk_ids import chunk_point_id
+from ingest.jsonl import load_records
+from ingest.registry import preference_key
+
+# Near-duplicate chunks (summaries restating requirements, the final rule
+# quoting the proposal) grouped with MinHash + LSH over word shingles.
+#
+# A pair is a duplicate when the smaller chunk is (almost) contained in the
+# larger one. LSH proposes candidates, the MinHash estimate
+# |A ∩ B| = J (|A| + |B|) / (1 + J) prunes them, and exact shingle
+# containment decides. Consecutive chunks of a section overlap by design;
+# those pairs are listed under "adjacent_overlap" but never collapsed.
+#
+# Output maps every chunk that has near-duplicates to its cluster's
+# canonical chunk (the copy in the preferred release, then the largest):
+#
+#   {"containment": 0.9, "canonical": {point_id: canonical_point_id, ...},
+#    "adjacent_overlap": [{"a": point_id, "b": point_id, "containment": 0.93}, ...]}
+#
+# Chunks without duplicates are left out, so they are their own canonical.
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+CHUNKS_DIR = BASE_DIR / "data" / "chunks"
+OUTPUT_FILE = BASE_DIR / "data" / "duplicates" / "near_duplicates.json"
+
+SHINGLE_WORDS = 5
+NUM_PERM = 128
+# 32 bands of 4 rows: candidate threshold around 0.4 Jaccard, low enough for
+# a chunk contained in one twice its size (Jaccard 0.5)
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+# share of the smaller chunk's shingles found in the larger one
+CONTAINMENT = 0.9
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+SEED = 1
+
+
+def shingles(text: str, k: int = SHINGLE_WORDS) -> set:
+    words = re.findall(r"\w+", text.lower())
+    if len(words) <= k:
+        return {" ".join(words)}
+    return {" ".join(words[i : i + k]) for i in range(len(words) - k + 1)}
+
+
+# numpy is imported inside the functions that hash: the serving path imports
+# this module for load_canonical_map only (search/near_duplicates.py)
+
+class MinHasher:
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = SEED):
+        import numpy as np
+
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, features: set):
+        import numpy as np
+
+        hashes = np.array(
+            [int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=4).digest(), "little") for f in features],
+            dtype=np.uint64,
+        )
+        # (a*h + b) mod p, truncated to 32 bits; uint64 wrap-around is fine for hashing
+        permuted = (np.outer(hashes, self.a) + self.b) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=0)
+
+
+class UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int):
+        self.parent[self.find(i)] = self.find(j)
+
+
+def containment(jaccard: float, size_a: int, size_b: int) -> float:
+    overlap = jaccard * (size_a + size_b) / (1 + jaccard)
+    return overlap / min(size_a, size_b)
+
+
+def exact_containment(a: set, b: set) -> float:
+    return len(a & b) / min(len(a), len(b))
+
+
+def candidate_pairs(features: List[set], threshold: float = CONTAINMENT) -> Dict:
+    """
+    (i, j) -> exact shingle containment, for the LSH candidate pairs that reach
+    `threshold`. MinHash only proposes pairs; the exact check decides, so an
+    estimate that is off never links two chunks.
+    """
+    import numpy as np
+
+    hasher = MinHasher()
+    sizes = [len(f) for f in features]
+    signatures = np.stack([hasher.signature(f) for f in features])
+
+    # LSH: candidate pairs share all rows of at least one band
+    candidates = set()
+    for band in range(BANDS):
+        buckets = {}
+        rows = signatures[:, band * ROWS : (band + 1) * ROWS]
+        for i, row in enumerate(rows):
+            buckets.setdefault(row.tobytes(), []).append(i)
+        for members in buckets.values():
+            for x in range(len(members)):
+                for y in range(x + 1, len(members)):
+                    candidates.add((members[x], members[y]))
+
+    pairs = {}
+    for i, j in sorted(candidates):
+        jaccard = float(np.mean(signatures[i] == signatures[j]))
+        # cheap estimate first, with slack for its error
+        if containment(jaccard, sizes[i], sizes[j]) < threshold - 0.2:
+            continue
+        exact = exact_containment(features[i], features[j])
+        if exact >= threshold:
+            pairs[(i, j)] = exact
+    return pairs
+
+
+def is_adjacent(a: Dict, b: Dict) -> bool:
+    # consecutive chunks of one section share OVERLAP_PARAGRAPHS by construction
+    return (
+        a["document_id"] == b["document_id"]
+        and a["section_id"] == b["section_id"]
+        and abs(a["chunk_index"] - b["chunk_index"]) == 1
+    )
+
+
+def build_near_duplicates(chunk_files: List[Path], output_file: Path = OUTPUT_FILE):
+    chunks = []
+    for path in chunk_files:
+        chunks.extend(load_records(path))
+
+    features = [shingles(c["text"]) for c in chunks]
+    pairs = candidate_pairs(features)
+
+    # chunk-overlap artifacts are reported, not collapsed: the neighbour
+    # expansion (search/neighbours.py) already stitches them
+    adjacent = {pair: c for pair, c in pairs.items() if is_adjacent(chunks[pair[0]], chunks[pair[1]])}
+
+    uf = UnionFind(len(chunks))
+    for i, j in pairs:
+        if (i, j) not in adjacent:
+            uf.union(i, j)
+
+    groups = {}
+    for i in range(len(chunks)):
+        groups.setdefault(uf.find(i), []).append(i)
+
+    canonical = {}
+    clusters = 0
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+
+        # newest / final release first, then the chunk carrying the most text
+        head = max(members, key=lambda i: (preference_key(chunks[i]["version"]), len(chunks[i]["text"]), -i))
+        # links can chain (A ⊂ B ⊂ C); only members contained in the head itself collapse
+        kept = [i for i in members if i == head or exact_containment(features[i], features[head]) >= CONTAINMENT]
+        if len(kept) < 2:
+            continue
+
+        clusters += 1
+        head_id = chunk_point_id(chunks[head])
+        for i in kept:
+            canonical[chunk_point_id(chunks[i])] = head_id
+
+    adjacent_overlap = [
+        {"a": chunk_point_id(chunks[i]), "b": chunk_point_id(chunks[j]), "containment": round(c, 3)}
+        for (i, j), c in sorted(adjacent.items())
+    ]
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(
+            {"containment": CONTAINMENT, "canonical": canonical, "adjacent_overlap": adjacent_overlap},
+            f,
+            indent=2,
+        )
+
+    duplicates = len(canonical) - clusters
+    print(
+        f"[DONE] {clusters} near-duplicate clusters, "
+        f"{duplicates} of {len(chunks)} chunks are duplicates; "
+        f"{len(adjacent_overlap)} adjacent-chunk overlaps reported, not collapsed → {output_file}"
+    )
+
+
+def load_canonical_map(path: Path = OUTPUT_FILE) -> Dict[str, str]:
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["canonical"]
+
+
+if __name__ == "__main__":
+    from ingest.registry import load_registry, chunks_file
+
+    build_near_duplicates([CHUNKS_DIR / chunks_file(doc["version"]) for doc in load_registry()])
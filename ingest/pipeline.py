@@ -0,0 +1,436 @@
+import argparse
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from ingest import extract_text, clean_pages, align_sections, semantic_chunk, token_chunk
+from ingest.registry import (
+    load_registry,
+    alignment_pairs,
+    sections_file,
+    chunks_file,
+    alignment_file,
+)
+
+# paths
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+DATA_DIR = BASE_DIR / "data"
+MANIFEST_PATH = DATA_DIR / "pipeline_manifest.json"
+
+# One entry per source document (data/documents.json). Each document
+# runs extract → clean → align → chunk independently of the others.
+DOCUMENTS = list(load_registry())
+
+# per-document chains in parallel, but not one process per release
+MAX_JOBS = 4
+
+HASH_BLOCK_SIZE = 1 << 20
+
+
+@dataclass
+class Stage:
+    name: str
+    inputs: List[Path]
+    outputs: List[Path]
+    run: Callable[[], None]
+    params: Dict = field(default_factory=dict)
+    # for outputs that are not files (points in Qdrant): returns a snapshot
+    # of them, recorded after the run and compared before skipping
+    state: Callable[[], Dict] | None = None
+
+
+# hashing
+
+def file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def relative(path: Path) -> str:
+    path = Path(path).resolve()
+    try:
+        return str(path.relative_to(BASE_DIR))
+    except ValueError:
+        return str(path)
+
+
+def stage_fingerprint(stage: Stage) -> str:
+    """
+    Content hash of everything that determines a stage's output:
+    input file contents plus stage parameters (model names, chunking constants).
+    """
+    spec = {
+        "stage": stage.name,
+        "inputs": {relative(p): file_digest(p) for p in stage.inputs},
+        "params": stage.params,
+    }
+    return hashlib.sha256(
+        json.dumps(spec, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+def load_manifest() -> Dict:
+    if not MANIFEST_PATH.exists():
+        return {}
+    with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest: Dict):
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+# execution
+
+def outputs_intact(entry: Dict) -> bool:
+    for rel_path, digest in entry.get("outputs", {}).items():
+        path = BASE_DIR / rel_path
+        if not path.exists() or file_digest(path) != digest:
+            return False
+    return True
+
+
+def state_intact(stage: Stage, entry: Dict) -> bool:
+    return stage.state is None or entry.get("state") == stage.state()
+
+
+def run_stage(stage: Stage, manifest: Dict, force: bool = False) -> Dict | None:
+    """
+    Runs a stage unless its fingerprint and outputs match the manifest.
+    Returns the new manifest entry, or None if the stage was skipped.
+    """
+    missing = [p for p in stage.inputs if not Path(p).exists()]
+    if missing:
+        if all(Path(p).exists() for p in stage.outputs):
+            print(f"[WARN] {stage.name}: inputs missing, keeping existing outputs")
+            return None
+        raise FileNotFoundError(f"{stage.name}: missing inputs {missing}")
+
+    fingerprint = stage_fingerprint(stage)
+    entry = manifest.get(stage.name)
+
+    if (
+        not force
+        and entry
+        and entry["fingerprint"] == fingerprint
+        and outputs_intact(entry)
+        and state_intact(stage, entry)
+    ):
+        print(f"[SKIP] {stage.name} (unchanged)")
+        return None
+
+    print(f"[RUN] {stage.name}")
+    stage.run()
+
+    entry = {
+        "fingerprint": fingerprint,
+        "params": stage.params,
+        "outputs": {relative(p): file_digest(p) for p in stage.outputs},
+    }
+    if stage.state is not None:
+        entry["state"] = stage.state()
+    return entry
+
+
+def run_chain(stages: List[Stage], manifest: Dict, force: bool = False) -> Dict:
+    """
+    Runs dependent stages in order. Once a stage re-runs, later stages
+    see new input hashes and re-run as well.
+    """
+    updates = {}
+    for stage in stages:
+        entry = run_stage(stage, {**manifest, **updates}, force=force)
+        if entry is not None:
+            updates[stage.name] = entry
+    return updates
+
+
+# stage definitions
+
+def artifact_name(name: str, stream: bool) -> str:
+    # streaming mode writes JSON Lines next to the regular JSON artifacts
+    return str(Path(name).with_suffix(".jsonl")) if stream else name
+
+
+def stage_name(name: str, stream: bool) -> str:
+    return f"{name}:stream" if stream else name
+
+
+def document_stages(doc: Dict, stream: bool = False, by: str = semantic_chunk.CHUNK_BY) -> List[Stage]:
+    version = doc["version"]
+    pdf_config = next(p for p in extract_text.PDFS if p["version"] == version)
+
+    pages_file = artifact_name(doc["pages_file"], stream)
+    pages_path = align_sections.EXTRACTED_DIR / pages_file
+    cleaned_path = clean_pages.CLEANED_DIR / pages_file
+    structure_path = align_sections.STRUCTURE_DIR / doc["structure_file"]
+    aligned_file = artifact_name(sections_file(version), stream)
+    chunk_file = artifact_name(chunks_file(version), stream)
+
+    if stream:
+        extract = partial(extract_text.extract_pdf_stream, pdf_config, pages_path)
+        clean = clean_pages.clean_pages_stream
+        align = align_sections.process_document_stream
+        chunk = semantic_chunk.chunk_document_stream
+    else:
+        extract = partial(extract_text.extract_pdf, pdf_config)
+        clean = clean_pages.clean_pages
+        align = align_sections.process_document
+        chunk = semantic_chunk.chunk_document
+
+    return [
+        Stage(
+            name=stage_name(f"extract:{version}", stream),
+            inputs=[BASE_DIR / pdf_config["pdf_path"]],
+            outputs=[pages_path],
+            run=extract,
+        ),
+        Stage(
+            name=stage_name(f"clean:{version}", stream),
+            inputs=[pages_path],
+            outputs=[cleaned_path],
+            run=partial(clean, pages_file),
+            params={
+                "EDGE_LINES": clean_pages.EDGE_LINES,
+                "MIN_REPEAT_SHARE": clean_pages.MIN_REPEAT_SHARE,
+                "MIN_REPEAT_PAGES": clean_pages.MIN_REPEAT_PAGES,
+            },
+        ),
+        Stage(
+            name=stage_name(f"align:{version}", stream),
+            inputs=[structure_path, cleaned_path],
+            outputs=[align_sections.ALIGNED_DIR / aligned_file],
+            run=partial(
+                align,
+                structure_file=doc["structure_file"],
+                pages_file=pages_file,
+                version=version,
+            ),
+        ),
+        Stage(
+            name=stage_name(f"chunk:{version}", stream),
+            inputs=[align_sections.ALIGNED_DIR / aligned_file],
+            outputs=[semantic_chunk.CHUNKS_DIR / chunk_file],
+            run=partial(
+                chunk,
+                aligned_file=aligned_file,
+                output_file=chunk_file,
+                by=by,
+            ),
+            params={
+                "MAX_CHARS": semantic_chunk.MAX_CHARS,
+                "SOFT_OVERFLOW": semantic_chunk.SOFT_OVERFLOW,
+                "OVERLAP_PARAGRAPHS": semantic_chunk.OVERLAP_PARAGRAPHS,
+                "CHUNK_BY": by,
+                "ENCODER_WINDOWS": token_chunk.ENCODER_WINDOWS,
+            },
+        ),
+    ]
+
+
+def embed_stage(doc: Dict, stream: bool = False) -> Stage:
+    from ingest import embed_and_upsert
+
+    chunks_path = semantic_chunk.CHUNKS_DIR / artifact_name(chunks_file(doc["version"]), stream)
+
+    if stream:
+        ingest = embed_and_upsert.ingest_chunks_stream
+    else:
+        ingest = embed_and_upsert.ingest_chunks
+
+    # Output lives in Qdrant: the document's point count stands in for output
+    # files, so a wiped or recreated collection re-runs the stage.
+    # The duplicate map is not an input: points are written with the current
+    # flags, and later map changes go through duplicate_flags_stage.
+    return Stage(
+        name=stage_name(f"embed:{doc['version']}", stream),
+        inputs=[chunks_path],
+        outputs=[],
+        run=partial(ingest, chunks_path),
+        params={
+            "collection": embed_and_upsert.COLLECTION_NAME,
+            "dense_model": embed_and_upsert.DENSE_MODEL_NAME,
+            "splade_model": embed_and_upsert.SPLADE_MODEL_ID,
+        },
+        state=partial(embed_and_upsert.collection_state, doc["document_id"]),
+    )
+
+
+def duplicate_flags_stage() -> Stage:
+    from ingest import embed_and_upsert, near_duplicates
+
+    # payload-only update: a new duplicate map does not re-embed anything
+    return Stage(
+        name="duplicate_flags",
+        inputs=[near_duplicates.OUTPUT_FILE],
+        outputs=[],
+        run=embed_and_upsert.update_duplicate_flags,
+        params={"collection": embed_and_upsert.COLLECTION_NAME},
+        state=embed_and_upsert.collection_state,
+    )
+
+
+def pair_index_stage(source: str, target: str, stream: bool = False) -> Stage:
+    from ingest import align_versions
+
+    source_file = artifact_name(chunks_file(source), stream)
+    target_file = artifact_name(chunks_file(target), stream)
+    output_file = alignment_file(source, target)
+
+    return Stage(
+        name=stage_name(f"pair_index:{source}→{target}", stream),
+        inputs=[
+            semantic_chunk.CHUNKS_DIR / source_file,
+            semantic_chunk.CHUNKS_DIR / target_file,
+        ],
+        outputs=[align_versions.ALIGNMENT_DIR / output_file],
+        run=partial(
+            align_versions.build_pair_index,
+            source_file=source_file,
+            target_file=target_file,
+            output_file=output_file,
+        ),
+        params={
+            "model": align_versions.DENSE_MODEL_NAME,
+            "title_weight": align_versions.TITLE_WEIGHT,
+            "top_n": align_versions.TOP_N,
+        },
+    )
+
+
+def section_index_stage() -> Stage:
+    from ingest import section_index
+
+    return Stage(
+        name="section_index",
+        inputs=[section_index.STRUCTURE_DIR / doc["structure_file"] for doc in DOCUMENTS],
+        outputs=[section_index.OUTPUT_FILE],
+        run=section_index.build_section_index,
+    )
+
+
+def adjacency_index_stage(stream: bool = False) -> Stage:
+    from ingest import adjacency_index
+
+    chunk_paths = [
+        semantic_chunk.CHUNKS_DIR / artifact_name(chunks_file(doc["version"]), stream)
+        for doc in DOCUMENTS
+    ]
+
+    return Stage(
+        name=stage_name("adjacency_index", stream),
+        inputs=chunk_paths,
+        outputs=[adjacency_index.OUTPUT_FILE],
+        run=partial(adjacency_index.build_adjacency_index, chunk_paths),
+    )
+
+
+def near_duplicates_stage(stream: bool = False) -> Stage:
+    from ingest import near_duplicates
+
+    chunk_paths = [
+        semantic_chunk.CHUNKS_DIR / artifact_name(chunks_file(doc["version"]), stream)
+        for doc in DOCUMENTS
+    ]
+
+    return Stage(
+        name=stage_name("near_duplicates", stream),
+        inputs=chunk_paths,
+        outputs=[near_duplicates.OUTPUT_FILE],
+        run=partial(near_duplicates.build_near_duplicates, chunk_paths),
+        params={
+            "shingle_words": near_duplicates.SHINGLE_WORDS,
+            "num_perm": near_duplicates.NUM_PERM,
+            "bands": near_duplicates.BANDS,
+            "containment": near_duplicates.CONTAINMENT,
+            # exact containment check, adjacent chunks reported separately
+            "method": "lsh+exact",
+        },
+    )
+
+
+def run_document_chain(doc: Dict, manifest: Dict, force: bool, stream: bool, by: str) -> Dict:
+    # module-level so it can be shipped to worker processes
+    return run_chain(document_stages(doc, stream, by), manifest, force=force)
+
+
+# entry point
+
+def run_pipeline(
+    jobs: int = min(len(DOCUMENTS), MAX_JOBS),
+    embed: bool = True,
+    pair_index: bool = True,
+    force: bool = False,
+    stream: bool = False,
+    by: str = semantic_chunk.CHUNK_BY,
+):
+    manifest = load_manifest()
+
+    mode = "streaming" if stream else "batch"
+    print(f"=== Pipeline ({mode}): {len(DOCUMENTS)} documents, {jobs} workers ===")
+
+    # CPU-bound, per-document stages run in parallel processes
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [
+            pool.submit(run_document_chain, doc, manifest, force, stream, by)
+            for doc in DOCUMENTS
+        ]
+        for future in futures:
+            manifest.update(future.result())
+
+    save_manifest(manifest)
+
+    # Model-bound stages share one set of loaded models in this process
+    # near-duplicate clusters go into the payload, so they run before embedding
+    late_stages = [section_index_stage(), adjacency_index_stage(stream), near_duplicates_stage(stream)]
+    if embed:
+        late_stages.extend(embed_stage(doc, stream) for doc in DOCUMENTS)
+        late_stages.append(duplicate_flags_stage())
+    if pair_index:
+        late_stages.extend(pair_index_stage(source, target, stream) for source, target in alignment_pairs())
+
+    for stage in late_stages:
+        entry = run_stage(stage, manifest, force=force)
+        if entry is not None:
+            manifest[stage.name] = entry
+            save_manifest(manifest)
+
+    print("[DONE] Pipeline complete")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cached ReguLens ingestion pipeline")
+    parser.add_argument("--jobs", type=int, default=min(len(DOCUMENTS), MAX_JOBS))
+    parser.add_argument("--no-embed", action="store_true")
+    parser.add_argument("--no-pair-index", action="store_true")
+    parser.add_argument("--force", action="store_true")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="constant-memory mode: JSON Lines artifacts, generator stages",
+    )
+    parser.add_argument(
+        "--by",
+        choices=["chars", "tokens"],
+        default=semantic_chunk.CHUNK_BY,
+        help="chunk size unit; tokens packs chunks to the encoder windows",
+    )
+    args = parser.parse_args()
+
+    run_pipeline(
+        jobs=args.jobs,
+        embed=not args.no_embed,
+        pair_index=not args.no_pair_index,
+        force=args.force,
+        stream=args.stream,
+        by=args.by,
+    )
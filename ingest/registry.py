@@ -0,0 +1,85 @@
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Document registry: one entry per SEC release, driving both ingestion
+# (which files to extract / align / chunk / embed) and retrieval (valid
+# version and document filters, version preference).
+#
+# data/documents.json fields:
+#   document_id, version           payload keys stored on every chunk
+#   title, stage, released         "proposed" | "final", ISO date
+#   pdf_path, structure_file, pages_file
+#   supersedes (optional)          version this release replaces; drives the
+#                                  cross-version alignment index
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+REGISTRY_PATH = BASE_DIR / "data" / "documents.json"
+
+# final rules outrank proposals released on the same day or earlier
+STAGE_RANK = {"final": 1, "proposed": 0}
+
+
+@lru_cache
+def load_registry(path: Path = REGISTRY_PATH) -> Tuple[Dict, ...]:
+    with open(path, "r", encoding="utf-8") as f:
+        documents = json.load(f)["documents"]
+
+    versions = [d["version"] for d in documents]
+    if len(set(versions)) != len(versions):
+        raise ValueError(f"Duplicate versions in {path}")
+
+    return tuple(documents)
+
+
+def get_document(version: str) -> Dict:
+    for doc in load_registry():
+        if doc["version"] == version:
+            return doc
+    raise KeyError(f"Unknown document version: {version}")
+
+
+def known_versions() -> List[str]:
+    return [d["version"] for d in load_registry()]
+
+
+def known_document_ids() -> List[str]:
+    return sorted({d["document_id"] for d in load_registry()})
+
+
+# artifact names (shared by the ingest scripts and the pipeline)
+
+def sections_file(version: str) -> str:
+    return f"{version}_sections.json"
+
+
+def chunks_file(version: str) -> str:
+    return f"{version}_chunks.json"
+
+
+def alignment_file(source_version: str, target_version: str) -> str:
+    return f"{source_version}_to_{target_version}.json"
+
+
+def alignment_pairs() -> List[Tuple[str, str]]:
+    """
+    (newer, superseded) version pairs that get a cross-version alignment index.
+    """
+    return [
+        (d["version"], d["supersedes"])
+        for d in load_registry()
+        if d.get("supersedes")
+    ]
+
+
+def preference_key(version: str | None) -> Tuple:
+    """
+    Sort key for prompt context: newest release first, finals before proposals.
+    Unknown versions sort last.
+    """
+    try:
+        doc = get_document(version)
+    except KeyError:
+        return ("", -1)
+    return (doc.get("released", ""), STAGE_RANK.get(doc.get("stage"), 0))
@@ -0,0 +1,234 @@
+import argparse
+import os
+import re
+import shutil
+import statistics
+import time
+from datetime import datetime, timezone
+from typing import List
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Blue/green reindexing behind the `regulens` alias.
+#
+#   build    create regulens_<UTC timestamp> and embed every chunk file into it
+#   warm     replay the hottest logged questions against it (HNSW / page cache)
+#   switch   move the alias onto it in one atomic alias update
+#   rollback move the alias back to the previous versioned collection
+#   prune    drop old versioned collections, keeping the newest few
+#   run      build → warm → switch → prune
+#
+# Search modules only ever query the alias (search.runtime.COLLECTION_NAME).
+# Each build writes its local vectors and chunk copies to
+# data/vectors/<collection>/, so the live ones are never rewritten; API
+# workers notice a switch or rollback and load the set for the new target
+# (search/index_swap.py).
+#
+#   python -m ingest.reindex run --profile int8
+#   python -m ingest.reindex rollback
+
+ALIAS = os.getenv("QDRANT_COLLECTION", "regulens")
+VERSIONED_PATTERN = re.compile(rf"^{re.escape(ALIAS)}_\d{{8}}T\d{{6}}Z$")
+
+WARM_TOP_N = 200
+KEEP_COLLECTIONS = 2
+
+
+class ReindexError(RuntimeError):
+    pass
+
+
+def get_client():
+    from qdrant_client import QdrantClient
+
+    return QdrantClient(url=os.getenv("QDRANT_URL"), api_key=os.getenv("QDRANT_API_KEY"))
+
+
+def versioned_collections(client) -> List[str]:
+    # timestamped names sort chronologically
+    return sorted(c.name for c in client.get_collections().collections if VERSIONED_PATTERN.match(c.name))
+
+
+def alias_target(client, alias: str = ALIAS) -> str | None:
+    for a in client.get_aliases().aliases:
+        if a.alias_name == alias:
+            return a.collection_name
+    return None
+
+
+# =========================
+# steps
+# =========================
+
+def build(profile: str) -> str:
+    from ingest.create_collection import create_collection
+    from ingest.embed_and_upsert import ingest_chunks, CHUNKS_DIR
+    from ingest.registry import load_registry, chunks_file
+
+    name = f"{ALIAS}_{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}"
+    create_collection(collection_name=name, profile=profile)
+
+    for doc in load_registry():
+        ingest_chunks(CHUNKS_DIR / chunks_file(doc["version"]), collection_name=name)
+
+    print(f"[DONE] Built {name}")
+    return name
+
+
+def warm(client, name: str, profile: str, top_n: int = WARM_TOP_N) -> dict:
+    """
+    Replays logged questions twice; the second pass shows the warmed latency.
+    """
+    from ingest.collection_profiles import search_params
+    from search.filters import build_filter
+    from search.prewarm import hottest_questions, load_entries
+    from search.remote_embeddings import embed_query
+
+    hot = [key for key, _ in hottest_questions(load_entries(), top_n)]
+    if not hot:
+        print("[WARN] Query log is empty; nothing to warm with")
+        return {}
+
+    requests = [(embed_query(query), build_filter(versions, document_ids)) for query, versions, document_ids, _ in hot]
+
+    passes = []
+    for _ in range(2):
+        latencies = []
+        for vector, query_filter in requests:
+            start = time.perf_counter()
+            client.query_points(
+                collection_name=name,
+                query=vector,
+                using="dense",
+                limit=5,
+                with_payload=False,
+                query_filter=query_filter,
+                search_params=search_params(profile),
+            )
+            latencies.append((time.perf_counter() - start) * 1000)
+        passes.append(statistics.median(latencies))
+
+    print(f"[INFO] Warmed {name} with {len(requests)} questions: p50 {passes[0]:.1f} ms → {passes[1]:.1f} ms")
+    return {"questions": len(requests), "cold_p50_ms": passes[0], "warm_p50_ms": passes[1]}
+
+
+def switch(client, name: str, replace_collection: bool = False) -> str | None:
+    from qdrant_client.models import (
+        CreateAlias,
+        CreateAliasOperation,
+        DeleteAlias,
+        DeleteAliasOperation,
+    )
+
+    if not client.collection_exists(name):
+        raise ReindexError(f"Collection '{name}' does not exist")
+
+    previous = alias_target(client)
+
+    # First switch on an old deployment: `regulens` is still a real collection,
+    # and an alias cannot share its name. This one step is not zero-downtime.
+    if previous is None and ALIAS in [c.name for c in client.get_collections().collections]:
+        if not replace_collection:
+            raise ReindexError(
+                f"'{ALIAS}' is a collection, not an alias; rerun with --replace-collection "
+                f"to delete it and create the alias (brief outage, once)"
+            )
+        client.delete_collection(ALIAS)
+
+    operations = []
+    if previous is not None:
+        operations.append(DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=ALIAS)))
+    operations.append(CreateAliasOperation(create_alias=CreateAlias(collection_name=name, alias_name=ALIAS)))
+
+    # one request: readers see the old collection or the new one, never neither
+    client.update_collection_aliases(change_aliases_operations=operations)
+
+    print(f"[DONE] {ALIAS} → {name} (was {previous})")
+    return previous
+
+
+def rollback(client) -> str:
+    current = alias_target(client)
+    older = [c for c in versioned_collections(client) if current is None or c < current]
+    if not older:
+        raise ReindexError("No earlier versioned collection to roll back to")
+
+    switch(client, older[-1])
+    return older[-1]
+
+
+def prune(client, keep: int = KEEP_COLLECTIONS) -> List[str]:
+    """
+    Deletes versioned collections beyond the newest `keep`; never the live one.
+    """
+    current = alias_target(client)
+    stale = [c for c in versioned_collections(client)[:-keep] if c != current] if keep > 0 else []
+
+    from ingest.vector_store import collection_vectors_dir
+
+    for name in stale:
+        client.delete_collection(name)
+        # and its local vectors / chunk copies (data/vectors/<name>/)
+        shutil.rmtree(collection_vectors_dir(name), ignore_errors=True)
+        print(f"[INFO] Deleted {name}")
+    return stale
+
+
+if __name__ == "__main__":
+    from ingest.create_collection import COLLECTION_PROFILE
+    from ingest.collection_profiles import PROFILES
+
+    parser = argparse.ArgumentParser(description="Zero-downtime reindexing behind the collection alias")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for command in ("build", "run"):
+        p = commands.add_parser(command)
+        p.add_argument("--profile", choices=list(PROFILES), default=COLLECTION_PROFILE)
+        if command == "run":
+            p.add_argument("--top", type=int, default=WARM_TOP_N)
+            p.add_argument("--keep", type=int, default=KEEP_COLLECTIONS)
+            p.add_argument("--replace-collection", action="store_true")
+
+    p = commands.add_parser("warm")
+    p.add_argument("name")
+    p.add_argument("--profile", choices=list(PROFILES), default=COLLECTION_PROFILE)
+    p.add_argument("--top", type=int, default=WARM_TOP_N)
+
+    p = commands.add_parser("switch")
+    p.add_argument("name")
+    p.add_argument("--replace-collection", action="store_true")
+
+    commands.add_parser("rollback")
+
+    p = commands.add_parser("prune")
+    p.add_argument("--keep", type=int, default=KEEP_COLLECTIONS)
+
+    commands.add_parser("status")
+
+    args = parser.parse_args()
+    client = get_client()
+
+    try:
+        if args.command == "build":
+            build(args.profile)
+        elif args.command == "warm":
+            warm(client, args.name, args.profile, args.top)
+        elif args.command == "switch":
+            switch(client, args.name, args.replace_collection)
+        elif args.command == "rollback":
+            rollback(client)
+        elif args.command == "prune":
+            prune(client, args.keep)
+        elif args.command == "run":
+            name = build(args.profile)
+            warm(client, name, args.profile, args.top)
+            switch(client, name, args.replace_collection)
+            prune(client, args.keep)
+        else:
+            print(f"{ALIAS} → {alias_target(client)}")
+            for name in versioned_collections(client):
+                print(f"  {name}")
+    except ReindexError as exc:
+        raise SystemExit(f"[ERROR] {exc}")
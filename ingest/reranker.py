@@ -1,5 +1,5 @@
 import os
-from typing import List
+from typing import List, Tuple
 
 USE_LOCAL_MODELS = os.getenv("USE_LOCAL_MODELS", "false").lower() == "true"
 
@@ -30,10 +30,16 @@ class CrossEncoderReranker:
         """
         Returns relevance scores aligned with passages order.
         """
+        pairs = [(query, passage) for passage in passages]
+        return self.score_pairs(pairs)
+
+    def score_pairs(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """
+        Scores arbitrary (query, passage) pairs in one forward pass.
+        """
         if not self.model:
             # prod-safe fallback: neutral scores
-            return [0.0] * len(passages)
+            return [0.0] * len(pairs)
 
-        pairs = [(query, passage) for passage in passages]
         scores = self.model.predict(pairs)
         return scores.tolist()
@@ -0,0 +1,52 @@
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from ingest.registry import load_registry
+
+# Section prefix table for section-scoped retrieval.
+#
+# Section ids are hierarchical ("II", "II.C", "II.C.1.a"), so a prefix
+# covers itself and every id below it. For each version the table maps
+# each section id used as a prefix to all section ids in its subtree:
+#
+#   {"versions": {"2024_final": {"II.C": ["II.C", "II.C.1", ...], ...}}}
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+STRUCTURE_DIR = BASE_DIR / "data" / "structure"
+OUTPUT_FILE = BASE_DIR / "data" / "sections" / "section_prefixes.json"
+
+
+def iter_section_ids(sections: List[Dict]) -> Iterator[str]:
+    for section in sections:
+        yield section["id"]
+        yield from iter_section_ids(section.get("children", []))
+
+
+def prefix_table(section_ids: List[str]) -> Dict[str, List[str]]:
+    table = {}
+    for section_id in section_ids:
+        parts = section_id.split(".")
+        for depth in range(1, len(parts) + 1):
+            table.setdefault(".".join(parts[:depth]), []).append(section_id)
+    return {prefix: sorted(set(ids)) for prefix, ids in sorted(table.items())}
+
+
+def build_section_index(output_file: Path = OUTPUT_FILE):
+    versions = {}
+
+    for doc in load_registry():
+        with open(STRUCTURE_DIR / doc["structure_file"], "r", encoding="utf-8") as f:
+            structure = json.load(f)
+        versions[doc["version"]] = prefix_table(list(iter_section_ids(structure["sections"])))
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump({"versions": versions}, f, indent=2)
+
+    total = sum(len(t) for t in versions.values())
+    print(f"[DONE] Saved {total} section prefixes for {len(versions)} versions → {output_file}")
+
+
+if __name__ == "__main__":
+    build_section_index()
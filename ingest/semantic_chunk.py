@@ -1,6 +1,10 @@
+import argparse
 import json
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator
+
+from ingest.jsonl import read_jsonl, write_jsonl, batched
+from ingest import token_chunk
 
 # paths
 BASE_DIR = Path(__file__).resolve().parents[1]
@@ -21,6 +25,13 @@ SOFT_OVERFLOW = 200
 HARD_LIMIT = MAX_CHARS + SOFT_OVERFLOW
 OVERLAP_PARAGRAPHS = 1
 
+# "chars" packs by MAX_CHARS; "tokens" packs to the tightest encoder window
+# (see ingest/token_chunk.py) so no chunk text is silently truncated.
+CHUNK_BY = "chars"
+
+# sections whose paragraphs are tokenized together in one batched call
+TOKEN_SECTION_BATCH = 64
+
 # helper funcitons
 
 def load_json(path: Path):
@@ -56,13 +67,31 @@ def chunk_paragraphs(paragraphs: List[str]) -> List[str]:
     return chunks
 
 
-# chunk the document
-def chunk_document(aligned_file: str, output_file: str):
-    aligned_sections = load_json(ALIGNED_DIR / aligned_file)
-
-    all_chunks = []
-
-    for sec in aligned_sections:
+def make_chunk(sec: Dict, idx: int, chunk_text: str) -> Dict:
+    return {
+        "document_id": sec["document_id"],
+        "version": sec["version"],
+        "section_id": sec["section_id"],
+        "section_path": sec["section_path"],
+        "title": sec["title"],
+        "chunk_index": idx,
+        "text": chunk_text
+    }
+
+
+def iter_chunks(
+    sections: Iterable[Dict],
+    by: str = CHUNK_BY,
+    section_batch: int = TOKEN_SECTION_BATCH,
+) -> Iterator[Dict]:
+    """
+    Yields chunk records section by section.
+    """
+    if by == "tokens":
+        yield from iter_token_chunks(sections, section_batch)
+        return
+
+    for sec in sections:
         paragraphs = split_into_paragraphs(sec["text"])
         chunks = chunk_paragraphs(paragraphs)
 
@@ -72,15 +101,60 @@ def chunk_document(aligned_file: str, output_file: str):
         )
 
         for idx, chunk_text in enumerate(chunks):
-            all_chunks.append({
-                "document_id": sec["document_id"],
-                "version": sec["version"],
-                "section_id": sec["section_id"],
-                "section_path": sec["section_path"],
-                "title": sec["title"],
-                "chunk_index": idx,
-                "text": chunk_text
-            })
+            yield make_chunk(sec, idx, chunk_text)
+
+
+def iter_token_chunks(
+    sections: Iterable[Dict],
+    section_batch: int = TOKEN_SECTION_BATCH,
+) -> Iterator[Dict]:
+    """
+    Tokenizer-aware chunking: paragraph lengths are measured with the
+    encoders' fast tokenizers, one batched call per group of sections,
+    and chunks are packed to fit the tightest encoder window.
+    """
+    window = token_chunk.chunk_window()
+
+    for group in batched(sections, section_batch):
+        paragraphs = [split_into_paragraphs(sec["text"]) for sec in group]
+        lengths = token_chunk.count_tokens([p for paras in paragraphs for p in paras])
+
+        offset = 0
+        for sec, paras in zip(group, paragraphs):
+            para_lengths = lengths[offset : offset + len(paras)]
+            offset += len(paras)
+
+            chunks = token_chunk.pack_paragraphs(
+                paras,
+                para_lengths,
+                window,
+                overlap=OVERLAP_PARAGRAPHS,
+            )
+
+            print(
+                f"[SECTION] {sec['section_id']} → "
+                f"{len(chunks)} chunks (≤{window} tokens)"
+            )
+
+            for idx, (chunk_text, token_count) in enumerate(chunks):
+                chunk = make_chunk(sec, idx, chunk_text)
+                chunk["token_count"] = token_count
+                yield chunk
+
+
+# chunk the document
+def chunk_document(
+    aligned_file: str,
+    output_file: str,
+    by: str = CHUNK_BY,
+    report: bool = False,
+):
+    aligned_sections = load_json(ALIGNED_DIR / aligned_file)
+
+    # the whole document is in memory here, so tokenize it in one batch
+    all_chunks = list(
+        iter_chunks(aligned_sections, by=by, section_batch=len(aligned_sections) or 1)
+    )
 
     output_path = CHUNKS_DIR / output_file
     with open(output_path, "w", encoding="utf-8") as f:
@@ -88,14 +162,37 @@ def chunk_document(aligned_file: str, output_file: str):
 
     print(f"[DONE] Saved {len(all_chunks)} chunks → {output_path}")
 
+    if report or by == "tokens":
+        token_chunk.print_truncation_report(
+            token_chunk.truncation_report([c["text"] for c in all_chunks])
+        )
+
+# streaming: one section in, its chunks out, nothing else held in memory
+def chunk_document_stream(aligned_file: str, output_file: str, by: str = CHUNK_BY):
+    sections = read_jsonl(ALIGNED_DIR / aligned_file)
+
+    output_path = CHUNKS_DIR / output_file
+    count = write_jsonl(output_path, iter_chunks(sections, by=by))
+
+    print(f"[DONE] Saved {count} chunks → {output_path}")
+
 # entry
 if __name__ == "__main__":
-    chunk_document(
-        aligned_file="2022_proposed_sections.json",
-        output_file="2022_proposed_chunks.json"
+    parser = argparse.ArgumentParser(description="Section-aware semantic chunking")
+    parser.add_argument("--by", choices=["chars", "tokens"], default=CHUNK_BY)
+    parser.add_argument(
+        "--report",
+        action="store_true",
+        help="print how much of each chunk the encoders truncate",
     )
+    args = parser.parse_args()
 
-    chunk_document(
-        aligned_file="2024_final_sections.json",
-        output_file="2024_final_chunks.json"
-    )
+    from ingest.registry import load_registry, sections_file, chunks_file
+
+    for doc in load_registry():
+        chunk_document(
+            aligned_file=sections_file(doc["version"]),
+            output_file=chunks_file(doc["version"]),
+            by=args.by,
+            report=args.report,
+        )
@@ -0,0 +1,377 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+from dotenv import load_dotenv
+
+from search.runtime import COLLECTION_NAME
+
+load_dotenv()
+
+# Versioned, checksummed index snapshots: the Qdrant collection snapshot
+# plus the local artifacts serving reads alongside it (chunk text store,
+# float16 vectors for the binary index, sparse query weights, pair /
+# adjacency / section / duplicate indexes). Restoring one brings up an
+# environment without re-running any model inference.
+#
+#   data/snapshots/<snapshot_id>/
+#       manifest.json                  ids, counts, sha256 of every file
+#       qdrant/<collection>.snapshot
+#       artifacts/<path under data/>
+#
+#   python -m ingest.snapshots build
+#   python -m ingest.snapshots verify data/snapshots/<snapshot_id>
+#   python -m ingest.snapshots restore data/snapshots/<snapshot_id> [--qdrant-url http://localhost:6333]
+#
+# Restore recreates the versioned collection, writes the local artifacts
+# (vectors under the restored collection's name) and then points the
+# serving alias (search.runtime.COLLECTION_NAME) at it, as a reindex switch
+# would. Local files that differ from the snapshot are only replaced with
+# --force.
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+DATA_DIR = BASE_DIR / "data"
+SNAPSHOTS_DIR = DATA_DIR / "snapshots"
+
+FORMAT_VERSION = 1
+
+# local artifacts, relative to data/
+ARTIFACT_GLOBS = [
+    "documents.json",
+    "pipeline_manifest.json",
+    "chunks/*",
+    "vectors/**/*",
+    "sparse/*",
+    "alignment/*",
+    "adjacency/*",
+    "duplicates/*",
+    "sections/*",
+]
+
+HASH_BLOCK_SIZE = 1 << 20
+TRANSFER_TIMEOUT_S = 600
+
+
+class SnapshotError(RuntimeError):
+    pass
+
+
+def file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def qdrant_target(url: str | None = None, api_key: str | None = None):
+    from qdrant_client import QdrantClient
+
+    url = url or os.getenv("QDRANT_URL")
+    api_key = api_key or os.getenv("QDRANT_API_KEY")
+    if not url:
+        raise SnapshotError("No Qdrant URL: set QDRANT_URL or pass --qdrant-url")
+    return QdrantClient(url=url, api_key=api_key), url.rstrip("/"), api_key
+
+
+def auth_headers(api_key: str | None) -> Dict:
+    return {"api-key": api_key} if api_key else {}
+
+
+def local_artifacts() -> List[Path]:
+    paths = set()
+    for pattern in ARTIFACT_GLOBS:
+        paths.update(p for p in DATA_DIR.glob(pattern) if p.is_file())
+    return sorted(paths)
+
+
+# =========================
+# build
+# =========================
+
+def download_collection_snapshot(client, url: str, api_key: str | None, collection: str, dest: Path) -> Dict:
+    import httpx
+
+    description = client.create_snapshot(collection_name=collection, wait=True)
+    print(f"[INFO] Qdrant snapshot {description.name} ({description.size} bytes)")
+
+    try:
+        with httpx.stream(
+            "GET",
+            f"{url}/collections/{collection}/snapshots/{description.name}",
+            headers=auth_headers(api_key),
+            timeout=TRANSFER_TIMEOUT_S,
+        ) as response:
+            response.raise_for_status()
+            with open(dest, "wb") as f:
+                for block in response.iter_bytes(HASH_BLOCK_SIZE):
+                    f.write(block)
+    finally:
+        # the copy lives with the artifacts now; don't leave it on the server's disk
+        client.delete_snapshot(collection_name=collection, snapshot_name=description.name)
+
+    return {"server_snapshot": description.name, "checksum": description.checksum}
+
+
+def build_snapshot(
+    collection: str = COLLECTION_NAME,
+    snapshots_dir: Path = SNAPSHOTS_DIR,
+    qdrant_url: str | None = None,
+    qdrant_api_key: str | None = None,
+) -> Path:
+    client, url, api_key = qdrant_target(qdrant_url, qdrant_api_key)
+
+    # snapshot the collection behind the alias (ingest/reindex.py), if it is one
+    from ingest.reindex import alias_target
+    collection = alias_target(client, collection) or collection
+
+    created = datetime.now(timezone.utc)
+    snapshot_id = f"{collection}-{created:%Y%m%dT%H%M%SZ}"
+    root = snapshots_dir / snapshot_id
+    (root / "qdrant").mkdir(parents=True)
+
+    start = time.perf_counter()
+    qdrant_file = root / "qdrant" / f"{collection}.snapshot"
+    qdrant_meta = download_collection_snapshot(client, url, api_key, collection, qdrant_file)
+
+    for path in local_artifacts():
+        dest = root / "artifacts" / path.relative_to(DATA_DIR)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(path, dest)
+
+    files = {
+        str(p.relative_to(root)): {"sha256": file_digest(p), "bytes": p.stat().st_size}
+        for p in sorted(root.rglob("*"))
+        if p.is_file()
+    }
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "snapshot_id": snapshot_id,
+        "created": created.isoformat(),
+        "collection": collection,
+        "points": client.count(collection_name=collection, exact=True).count,
+        "qdrant_server_version": client.info().version,
+        "qdrant": qdrant_meta,
+        "files": files,
+    }
+    with open(root / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    size = sum(f["bytes"] for f in files.values())
+    print(
+        f"[DONE] Snapshot {snapshot_id}: {manifest['points']} points, "
+        f"{len(files)} files, {size / 1e6:.1f} MB in {time.perf_counter() - start:.1f}s → {root}"
+    )
+    return root
+
+
+# =========================
+# verify / restore
+# =========================
+
+def load_manifest(root: Path) -> Dict:
+    with open(root / "manifest.json", "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot format {manifest.get('format_version')!r}")
+    return manifest
+
+
+def verify_snapshot(root: Path) -> Dict:
+    """
+    Checks every file against the manifest; raises SnapshotError on any mismatch.
+    """
+    manifest = load_manifest(root)
+
+    bad = []
+    for name, meta in manifest["files"].items():
+        path = root / name
+        if not path.exists():
+            bad.append(f"{name}: missing")
+        elif path.stat().st_size != meta["bytes"] or file_digest(path) != meta["sha256"]:
+            bad.append(f"{name}: checksum mismatch")
+
+    if bad:
+        raise SnapshotError(f"Snapshot {manifest['snapshot_id']} is corrupt: " + "; ".join(bad))
+
+    print(f"[OK] {manifest['snapshot_id']}: {len(manifest['files'])} files verified")
+    return manifest
+
+
+def upload_collection_snapshot(client, url: str, api_key: str | None, collection: str, snapshot_file: Path, force: bool):
+    import httpx
+
+    if client.collection_exists(collection):
+        points = client.count(collection_name=collection, exact=True).count
+        if points and not force:
+            raise SnapshotError(
+                f"Collection '{collection}' already holds {points} points; use --force to replace it"
+            )
+
+    with open(snapshot_file, "rb") as f:
+        response = httpx.post(
+            f"{url}/collections/{collection}/snapshots/upload",
+            params={"priority": "snapshot", "wait": "true"},
+            headers=auth_headers(api_key),
+            files={"snapshot": (snapshot_file.name, f, "application/octet-stream")},
+            timeout=TRANSFER_TIMEOUT_S,
+        )
+    response.raise_for_status()
+
+
+def point_alias(client, collection: str):
+    """
+    Serve the restored collection: move (or create) the alias onto it.
+    """
+    from ingest.reindex import switch, ReindexError
+
+    try:
+        switch(client, collection)
+    except ReindexError as exc:
+        raise SnapshotError(f"Restored '{collection}' but could not point the alias at it: {exc}")
+
+
+def artifact_targets(manifest: Dict, collection: str) -> Dict[str, Path]:
+    """
+    Snapshot file → destination under data/. Per-collection vectors
+    (ingest/vector_store.py) move with the collection when it is restored
+    under another name.
+    """
+    targets = {}
+    for name in manifest["files"]:
+        if not name.startswith("artifacts/"):
+            continue
+        parts = list(Path(name).relative_to("artifacts").parts)
+        if parts[0] == "vectors" and len(parts) > 2 and parts[1] == manifest["collection"]:
+            parts[1] = collection
+        targets[name] = DATA_DIR.joinpath(*parts)
+    return targets
+
+
+def check_artifacts(manifest: Dict, targets: Dict[str, Path], force: bool):
+    """
+    Refuses to overwrite local files that differ from the snapshot, unless forced.
+    """
+    changed = [
+        str(dest.relative_to(DATA_DIR))
+        for name, dest in targets.items()
+        if dest.exists() and file_digest(dest) != manifest["files"][name]["sha256"]
+    ]
+    if changed and not force:
+        shown = ", ".join(changed[:5]) + (f" (+{len(changed) - 5} more)" if len(changed) > 5 else "")
+        raise SnapshotError(
+            f"{len(changed)} local artifacts differ from the snapshot ({shown}); use --force to replace them"
+        )
+
+
+def restore_artifacts(root: Path, targets: Dict[str, Path]) -> int:
+    for name, dest in targets.items():
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(root / name, dest)
+    return len(targets)
+
+
+def restore_snapshot(
+    root: Path,
+    collection: str | None = None,
+    qdrant_url: str | None = None,
+    qdrant_api_key: str | None = None,
+    qdrant: bool = True,
+    local: bool = True,
+    force: bool = False,
+):
+    start = time.perf_counter()
+    manifest = verify_snapshot(root)
+    collection = collection or manifest["collection"]
+
+    # checked before anything is written
+    targets = artifact_targets(manifest, collection)
+    if local:
+        check_artifacts(manifest, targets, force)
+
+    if qdrant:
+        client, url, api_key = qdrant_target(qdrant_url, qdrant_api_key)
+        upload_collection_snapshot(
+            client, url, api_key, collection,
+            root / "qdrant" / f"{manifest['collection']}.snapshot",
+            force=force,
+        )
+
+        points = client.count(collection_name=collection, exact=True).count
+        if points != manifest["points"]:
+            raise SnapshotError(f"Restored {points} points, snapshot has {manifest['points']}")
+        print(f"[INFO] Qdrant collection '{collection}' restored ({points} points)")
+
+    if local:
+        restored = restore_artifacts(root, targets)
+        print(f"[INFO] {restored} local artifacts restored under {DATA_DIR}")
+
+    # last: the index watcher (search/index_swap.py) reloads the local
+    # indexes as soon as the alias moves, so they must be in place by then
+    if qdrant and collection != COLLECTION_NAME:
+        point_alias(client, collection)
+
+    print(f"[DONE] Restored {manifest['snapshot_id']} in {time.perf_counter() - start:.1f}s")
+
+
+def list_snapshots(snapshots_dir: Path = SNAPSHOTS_DIR):
+    for root in sorted(snapshots_dir.glob("*/manifest.json")):
+        manifest = load_manifest(root.parent)
+        size = sum(f["bytes"] for f in manifest["files"].values())
+        print(f"{manifest['snapshot_id']:40s} {manifest['points']:>8d} points {size / 1e6:8.1f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build, verify and restore index snapshots")
+    parser.add_argument("--qdrant-url", help="defaults to QDRANT_URL (e.g. http://localhost:6333)")
+    parser.add_argument("--qdrant-api-key", help="defaults to QDRANT_API_KEY")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build")
+    build.add_argument("--collection", default=COLLECTION_NAME)
+
+    verify = commands.add_parser("verify")
+    verify.add_argument("snapshot", type=Path)
+
+    restore = commands.add_parser("restore")
+    restore.add_argument("snapshot", type=Path)
+    restore.add_argument("--collection", help="restore under another collection name")
+    restore.add_argument("--local-only", action="store_true", help="only the local artifacts")
+    restore.add_argument("--qdrant-only", action="store_true", help="only the Qdrant collection")
+    restore.add_argument(
+        "--force",
+        action="store_true",
+        help="replace a non-empty collection and local artifacts that differ",
+    )
+
+    commands.add_parser("list")
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == "build":
+            build_snapshot(args.collection, qdrant_url=args.qdrant_url, qdrant_api_key=args.qdrant_api_key)
+        elif args.command == "verify":
+            verify_snapshot(args.snapshot)
+        elif args.command == "restore":
+            restore_snapshot(
+                args.snapshot,
+                collection=args.collection,
+                qdrant_url=args.qdrant_url,
+                qdrant_api_key=args.qdrant_api_key,
+                qdrant=not args.local_only,
+                local=not args.qdrant_only,
+                force=args.force,
+            )
+        else:
+            list_snapshots()
+    except SnapshotError as exc:
+        raise SystemExit(f"[ERROR] {exc}")
@@ -0,0 +1,95 @@
+import argparse
+import json
+import math
+from collections import Counter
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from search.runtime import get_qdrant, COLLECTION_NAME
+from search.sparse_query import QUERY_WEIGHTS_FILE
+
+load_dotenv()
+
+# Per-term query weights for inference-free sparse queries (search/sparse_query.py).
+#
+# Documents keep their SPLADE vectors; queries are just tokenized and each
+# term id gets a BM25-style IDF learned from how many indexed SPLADE doc
+# vectors activate it. The SPLADE vocabulary is stored alongside, so query
+# encoding needs neither torch nor transformers at serving time.
+
+SPLADE_MODEL_ID = "naver/splade-cocondenser-ensembledistil"
+# where search/sparse_query.py reads it (SPARSE_QUERY_WEIGHTS)
+OUTPUT_FILE = QUERY_WEIGHTS_FILE
+
+SCROLL_BATCH_SIZE = 256
+
+
+def sparse_document_frequencies(client, collection_name: str):
+    """
+    Number of indexed points whose SPLADE vector has each term id.
+    """
+    df = Counter()
+    num_docs = 0
+    offset = None
+
+    while True:
+        batch, offset = client.scroll(
+            collection_name=collection_name,
+            limit=SCROLL_BATCH_SIZE,
+            offset=offset,
+            with_payload=False,
+            with_vectors=["sparse"],
+        )
+        for point in batch:
+            sparse = point.vector["sparse"]
+            df.update(sparse.indices)
+            num_docs += 1
+
+        if offset is None:
+            return df, num_docs
+
+
+def bm25_idf(df: int, num_docs: int) -> float:
+    return math.log(1 + (num_docs - df + 0.5) / (df + 0.5))
+
+
+def load_vocab(model_id: str = SPLADE_MODEL_ID):
+    """
+    WordPiece vocabulary in id order.
+    """
+    from huggingface_hub import hf_hub_download
+
+    with open(hf_hub_download(model_id, "vocab.txt"), encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f]
+
+
+def build_query_weights(collection_name: str = COLLECTION_NAME, output_file: Path = OUTPUT_FILE):
+    client = get_qdrant()
+
+    print(f"[INFO] Scanning SPLADE vectors in '{collection_name}'...")
+    df, num_docs = sparse_document_frequencies(client, collection_name)
+    print(f"[INFO] {num_docs} documents, {len(df)} active terms")
+
+    table = {
+        "model": SPLADE_MODEL_ID,
+        "collection": collection_name,
+        "num_docs": num_docs,
+        "vocab": load_vocab(),
+        "idf": {str(term): round(bm25_idf(n, num_docs), 4) for term, n in sorted(df.items())},
+    }
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(table, f)
+
+    print(f"[SUCCESS] Saved query weights → {output_file}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build IDF query weights from indexed SPLADE vectors")
+    parser.add_argument("--collection", default=COLLECTION_NAME)
+    parser.add_argument("--output", type=Path, default=OUTPUT_FILE)
+    args = parser.parse_args()
+
+    build_query_weights(args.collection, args.output)
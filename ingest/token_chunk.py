@@ -0,0 +1,174 @@
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+# Encoder windows, in tokens, for every model that consumes chunk text.
+# MiniLM (sentence-transformers) truncates at max_seq_length=256;
+# SPLADE is tokenized with max_length=512 in embed_and_upsert.
+ENCODER_WINDOWS = {
+    "dense": {
+        "tokenizer": "sentence-transformers/all-MiniLM-L6-v2",
+        "max_tokens": 256,
+    },
+    "sparse": {
+        "tokenizer": "naver/splade-cocondenser-ensembledistil",
+        "max_tokens": 512,
+    },
+}
+
+# [CLS] and [SEP] are added by both encoders
+SPECIAL_TOKENS = 2
+
+
+@lru_cache
+def get_tokenizer(name: str):
+    from transformers import AutoTokenizer
+
+    return AutoTokenizer.from_pretrained(name, use_fast=True)
+
+
+def chunk_window() -> int:
+    """
+    One chunk feeds every encoder, so pack to the tightest window.
+    """
+    return min(m["max_tokens"] for m in ENCODER_WINDOWS.values()) - SPECIAL_TOKENS
+
+
+def packing_tokenizer():
+    name = min(ENCODER_WINDOWS.values(), key=lambda m: m["max_tokens"])["tokenizer"]
+    return get_tokenizer(name)
+
+
+def count_tokens(texts: List[str]) -> List[int]:
+    """
+    Token counts for many texts in one batched call per tokenizer.
+    Where tokenizers disagree, the longest count wins.
+    """
+    if not texts:
+        return []
+
+    counts = [0] * len(texts)
+    for name in {m["tokenizer"] for m in ENCODER_WINDOWS.values()}:
+        encoded = get_tokenizer(name)(texts, add_special_tokens=False)["input_ids"]
+        counts = [max(c, len(ids)) for c, ids in zip(counts, encoded)]
+
+    return counts
+
+
+def split_long_paragraph(paragraph: str, window: int) -> List[Tuple[str, int]]:
+    """
+    Splits a paragraph that exceeds the window at word boundaries,
+    using the packing tokenizer's offsets.
+    """
+    tokenizer = packing_tokenizer()
+    offsets = tokenizer(
+        paragraph,
+        add_special_tokens=False,
+        return_offsets_mapping=True,
+    )["offset_mapping"]
+
+    pieces = []
+    start_token = 0
+
+    while start_token < len(offsets):
+        end_token = min(start_token + window, len(offsets))
+
+        # back off to a token that starts a new word, so the piece
+        # re-tokenizes to the same length
+        if end_token < len(offsets):
+            cut = end_token
+            while cut > start_token + 1:
+                char_start = offsets[cut][0]
+                if char_start > 0 and paragraph[char_start - 1].isspace():
+                    break
+                cut -= 1
+            if cut > start_token + 1:
+                end_token = cut
+
+        char_start = offsets[start_token][0]
+        char_end = offsets[end_token - 1][1]
+        pieces.append((paragraph[char_start:char_end].strip(), end_token - start_token))
+        start_token = end_token
+
+    return pieces
+
+
+def pack_paragraphs(
+    paragraphs: List[str],
+    lengths: List[int],
+    window: int,
+    overlap: int = 1,
+) -> List[Tuple[str, int]]:
+    """
+    Token-budget counterpart of semantic_chunk.chunk_paragraphs.
+    Returns (chunk_text, token_count) pairs, each within the window.
+    """
+    units = []
+    for para, length in zip(paragraphs, lengths):
+        if length > window:
+            units.extend(split_long_paragraph(para, window))
+        else:
+            units.append((para, length))
+
+    chunks = []
+    current = []
+    current_len = 0
+
+    for para, para_len in units:
+        if current and current_len + para_len > window:
+            chunks.append(("\n\n".join(p for p, _ in current), current_len))
+
+            # paragraph-level overlap, only if it still leaves room
+            current = current[-overlap:] if overlap else []
+            current_len = sum(n for _, n in current)
+            if current_len + para_len > window:
+                current = []
+                current_len = 0
+
+        current.append((para, para_len))
+        current_len += para_len
+
+    if current:
+        chunks.append(("\n\n".join(p for p, _ in current), current_len))
+
+    return chunks
+
+
+def truncation_report(texts: List[str]) -> Dict:
+    """
+    How much of each text every encoder actually sees.
+    """
+    report = {}
+
+    for key, model in ENCODER_WINDOWS.items():
+        tokenizer = get_tokenizer(model["tokenizer"])
+        limit = model["max_tokens"] - SPECIAL_TOKENS
+
+        lengths = [
+            len(ids)
+            for ids in tokenizer(texts, add_special_tokens=False)["input_ids"]
+        ] if texts else []
+
+        total = sum(lengths)
+        dropped = sum(max(0, n - limit) for n in lengths)
+
+        report[key] = {
+            "max_tokens": model["max_tokens"],
+            "chunks": len(lengths),
+            "truncated_chunks": sum(1 for n in lengths if n > limit),
+            "total_tokens": total,
+            "dropped_tokens": dropped,
+            "dropped_fraction": round(dropped / total, 4) if total else 0.0,
+            "max_chunk_tokens": max(lengths, default=0),
+        }
+
+    return report
+
+
+def print_truncation_report(report: Dict):
+    for key, stats in report.items():
+        print(
+            f"[TRUNCATION] {key:6s} window={stats['max_tokens']:<4} "
+            f"| truncated {stats['truncated_chunks']}/{stats['chunks']} chunks "
+            f"| dropped {stats['dropped_tokens']}/{stats['total_tokens']} tokens "
+            f"({stats['dropped_fraction']:.1%})"
+        )
@@ -0,0 +1,118 @@
+import json
+import shutil
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from ingest.chunk_ids import chunk_point_id
+
+# paths
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+VECTORS_DIR = BASE_DIR / "data" / "vectors"
+
+DENSE_SIZE = 384
+
+# Local copy of the dense vectors computed at ingestion, one directory per
+# Qdrant collection, so a blue/green build (ingest/reindex.py) never touches
+# the files serving the live one:
+#   data/vectors/<collection>/<name>.dense.f16    raw float16 rows, DENSE_SIZE per chunk
+#   data/vectors/<collection>/<name>.meta.jsonl   one line per row: point id + filter fields
+#   data/vectors/<collection>/<name>.json(l)      the chunk file that was embedded
+# Rows are appended batch by batch, so streaming ingestion never holds them all.
+# Files directly under data/vectors/ are the pre-versioning layout.
+META_FIELDS = ["document_id", "version", "section_id"]
+
+# numpy is imported inside the functions that need it: the serving path
+# resolves directories through this module (search/index_swap.py)
+
+
+def collection_vectors_dir(collection: str) -> Path:
+    return VECTORS_DIR / collection
+
+
+def serving_vectors_dir(collection: str | None = None) -> Path:
+    """
+    Local artifacts for `collection` (the alias target). Without one known
+    yet, the most recently built collection; the flat layout last.
+    """
+    if collection and collection_vectors_dir(collection).is_dir():
+        return collection_vectors_dir(collection)
+
+    built = [p for p in VECTORS_DIR.glob("*") if p.is_dir()] if VECTORS_DIR.exists() else []
+    if built:
+        return max(built, key=lambda p: p.stat().st_mtime)
+    return VECTORS_DIR
+
+
+def save_chunk_file(chunk_file: Path, vectors_dir: Path):
+    """
+    Keeps the embedded chunk text with its vectors (search/text_store.py).
+    """
+    vectors_dir.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(chunk_file, vectors_dir / Path(chunk_file).name)
+
+
+class DenseVectorWriter:
+    def __init__(self, name: str, vectors_dir: Path = VECTORS_DIR):
+        vectors_dir.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = vectors_dir / f"{name}.dense.f16"
+        self.meta_path = vectors_dir / f"{name}.meta.jsonl"
+        self.count = 0
+
+    def __enter__(self):
+        self._vectors = open(self.vectors_path, "wb")
+        self._meta = open(self.meta_path, "w", encoding="utf-8")
+        return self
+
+    def __exit__(self, *exc):
+        self._vectors.close()
+        self._meta.close()
+
+    def write(self, chunks: List[Dict], vectors):
+        import numpy as np
+
+        rows = np.asarray(vectors, dtype=np.float16).reshape(len(chunks), DENSE_SIZE)
+        rows.tofile(self._vectors)
+
+        for chunk in chunks:
+            meta = {"id": chunk_point_id(chunk)}
+            meta.update({field: chunk[field] for field in META_FIELDS})
+            self._meta.write(json.dumps(meta) + "\n")
+
+        self.count += len(chunks)
+
+
+def load_dense_vectors(
+    vectors_dir: Path = VECTORS_DIR,
+    mmap: bool = True,
+) -> Tuple[List[Dict], List]:
+    """
+    Loads every saved vector file: (metadata rows, float16 blocks, one per file).
+    With mmap=True the float16 rows stay on disk and are paged in on access.
+    """
+    import numpy as np
+
+    meta = []
+    blocks = []
+
+    for vectors_path in sorted(vectors_dir.glob("*.dense.f16")):
+        meta_path = vectors_path.with_name(
+            vectors_path.name.replace(".dense.f16", ".meta.jsonl")
+        )
+
+        if mmap:
+            rows = np.memmap(vectors_path, dtype=np.float16, mode="r")
+        else:
+            rows = np.fromfile(vectors_path, dtype=np.float16)
+        rows = rows.reshape(-1, DENSE_SIZE)
+
+        with open(meta_path, "r", encoding="utf-8") as f:
+            rows_meta = [json.loads(line) for line in f if line.strip()]
+
+        if len(rows_meta) != len(rows):
+            raise ValueError(f"{vectors_path.name}: {len(rows)} vectors, {len(rows_meta)} metadata rows")
+
+        meta.extend(rows_meta)
+        blocks.append(rows)
+
+    return meta, blocks
@@ -0,0 +1,294 @@
+import hashlib
+import importlib
+import json
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+# Record / replay stand-ins for the remote backends (Groq, HF Inference, Qdrant).
+#
+#   BACKENDS="groq=record,hf=record,qdrant=record"   live calls, responses captured
+#   BACKENDS="groq=replay,hf=replay,qdrant=replay"   no network: recorded responses
+#   BACKENDS="qdrant=fake,hf=fake,groq=fake"         in-process stand-ins seeded
+#                                                     from data/chunks (search/fake_backends.py)
+#
+# Unlisted backends are "live". A recording is keyed by the call path and
+# its arguments (client timeouts excluded, they follow the request deadline),
+# so replay serves the same response for the same call, whatever the order.
+#
+# Replay / fake latency per backend:
+#   REPLAY_LATENCY="groq=lognormal:900:0.35,hf=fixed:40,qdrant=normal:25:5"
+#     recorded            the latency measured when recording (replay default;
+#                         fakes have none)
+#     none                no delay
+#     fixed:MS
+#     normal:MEAN:SD
+#     lognormal:MEDIAN:SIGMA
+#     uniform:LO:HI
+# Draws come from one RNG seeded with REPLAY_SEED, for reproducible runs.
+
+MODES = ("live", "record", "replay", "fake")
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+RECORDINGS_DIR = Path(os.getenv("RECORDINGS_DIR", BASE_DIR / "data" / "recordings"))
+REPLAY_SEED = int(os.getenv("REPLAY_SEED", "0"))
+
+# calls whose result is another client, not a response
+CLIENT_FACTORIES = {"with_options"}
+# never part of the key
+IGNORED_KWARGS = {"timeout"}
+
+
+class ReplayMiss(RuntimeError):
+    def __init__(self, backend: str, call: str):
+        super().__init__(f"No {backend} recording for {call}; record it first (BACKENDS={backend}=record)")
+
+
+def parse_spec(spec: str) -> Dict[str, str]:
+    """
+    "groq=replay, hf=record" -> {"groq": "replay", "hf": "record"}
+    """
+    parsed = {}
+    for item in spec.split(","):
+        if "=" in item:
+            name, value = item.split("=", 1)
+            parsed[name.strip()] = value.strip()
+    return parsed
+
+
+BACKEND_MODES = parse_spec(os.getenv("BACKENDS", ""))
+LATENCY_SPECS = parse_spec(os.getenv("REPLAY_LATENCY", ""))
+
+
+def backend_mode(backend: str) -> str:
+    mode = BACKEND_MODES.get(backend, "live")
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r} for backend {backend!r}; expected one of {MODES}")
+    return mode
+
+
+# =========================
+# keys and (de)serialization
+# =========================
+
+def canonical(value):
+    """
+    JSON-able form of call arguments: pydantic models dumped, arrays and
+    floats rounded so re-created query vectors hash the same.
+    """
+    if hasattr(value, "model_dump"):
+        return canonical(value.model_dump(mode="json", exclude_none=True))
+    if hasattr(value, "tolist"):
+        return canonical(value.tolist())
+    if isinstance(value, float):
+        return round(value, 6)
+    if isinstance(value, dict):
+        return {str(k): canonical(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple, set)):
+        return [canonical(v) for v in value]
+    if value is None or isinstance(value, (str, int, bool)):
+        return value
+    return repr(value)
+
+
+def call_key(call: str, args: tuple, kwargs: Dict) -> str:
+    spec = {
+        "call": call,
+        "args": canonical(args),
+        "kwargs": canonical({k: v for k, v in kwargs.items() if k not in IGNORED_KWARGS}),
+    }
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def dump_result(value):
+    if hasattr(value, "model_dump"):
+        cls = type(value)
+        return {"__model__": f"{cls.__module__}.{cls.__qualname__}", "data": value.model_dump(mode="json")}
+    if hasattr(value, "tolist"):
+        return {"__array__": value.tolist(), "dtype": str(value.dtype)}
+    if isinstance(value, (list, tuple)):
+        return [dump_result(v) for v in value]
+    if isinstance(value, dict):
+        return {k: dump_result(v) for k, v in value.items()}
+    return value
+
+
+def load_result(value):
+    if isinstance(value, dict) and "__model__" in value:
+        module_name, _, class_name = value["__model__"].rpartition(".")
+        cls = getattr(importlib.import_module(module_name), class_name)
+        return cls.model_validate(value["data"])
+    if isinstance(value, dict) and "__array__" in value:
+        import numpy as np
+
+        return np.asarray(value["__array__"], dtype=value["dtype"])
+    if isinstance(value, list):
+        return [load_result(v) for v in value]
+    if isinstance(value, dict):
+        return {k: load_result(v) for k, v in value.items()}
+    return value
+
+
+# =========================
+# tapes
+# =========================
+
+class Tape:
+    """
+    One JSONL file of recorded calls per backend.
+    """
+
+    def __init__(self, backend: str, recordings_dir: Path = RECORDINGS_DIR):
+        self.backend = backend
+        self.path = recordings_dir / f"{backend}.jsonl"
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def record(self, call: str, key: str, result, latency_ms: float):
+        line = json.dumps({
+            "key": key,
+            "call": call,
+            "latency_ms": round(latency_ms, 2),
+            "result": dump_result(result),
+        })
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def lookup(self, call: str, key: str) -> Dict:
+        with self._lock:
+            if self._entries is None:
+                self._entries = {}
+                if self.path.exists():
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        for line in f:
+                            if line.strip():
+                                entry = json.loads(line)
+                                # later recordings of the same call win
+                                self._entries[entry["key"]] = entry
+
+        entry = self._entries.get(key)
+        if entry is None:
+            raise ReplayMiss(self.backend, call)
+        return entry
+
+
+# =========================
+# synthetic latency
+# =========================
+
+class LatencyModel:
+    def __init__(self, spec: str = "recorded", seed: int = REPLAY_SEED):
+        kind, *params = spec.split(":")
+        self.kind = kind
+        self.params = [float(p) for p in params]
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample_ms(self, recorded_ms: float) -> float:
+        kind, p = self.kind, self.params
+        if kind == "recorded":
+            return recorded_ms
+        if kind == "none":
+            return 0.0
+
+        with self._lock:
+            if kind == "fixed":
+                return p[0]
+            if kind == "normal":
+                return max(0.0, self._rng.gauss(p[0], p[1]))
+            if kind == "lognormal":
+                return p[0] * self._rng.lognormvariate(0.0, p[1])
+            if kind == "uniform":
+                return self._rng.uniform(p[0], p[1])
+
+        raise ValueError(f"Unknown latency distribution {kind!r}")
+
+
+# =========================
+# client stand-ins
+# =========================
+
+class RecordingClient:
+    """
+    Wraps a live client; every method call anywhere below it
+    (e.g. client.chat.completions.create) is forwarded and recorded.
+    """
+
+    def __init__(self, target, tape: Tape, path: str = ""):
+        self._target = target
+        self._tape = tape
+        self._path = path
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._target, name)
+        path = f"{self._path}.{name}" if self._path else name
+
+        if not callable(attr):
+            return RecordingClient(attr, self._tape, path)
+
+        def call(*args, **kwargs):
+            if name in CLIENT_FACTORIES:
+                return RecordingClient(attr(*args, **kwargs), self._tape, self._path)
+
+            start = time.perf_counter()
+            result = attr(*args, **kwargs)
+            latency_ms = (time.perf_counter() - start) * 1000
+
+            self._tape.record(path, call_key(path, args, kwargs), result, latency_ms)
+            return result
+
+        return call
+
+
+class ReplayClient:
+    """
+    Same attribute / call shape as the client it stands in for; calls are
+    answered from the tape after a synthetic delay.
+    """
+
+    def __init__(self, tape: Tape, latency: LatencyModel, path: str = ""):
+        self._tape = tape
+        self._latency = latency
+        self._path = path
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        path = f"{self._path}.{name}" if self._path else name
+        return ReplayClient(self._tape, self._latency, path)
+
+    def __call__(self, *args, **kwargs):
+        if self._path.rpartition(".")[2] in CLIENT_FACTORIES:
+            return ReplayClient(self._tape, self._latency, self._path.rpartition(".")[0])
+
+        entry = self._tape.lookup(self._path, call_key(self._path, args, kwargs))
+        delay_ms = self._latency.sample_ms(entry["latency_ms"])
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+        return load_result(entry["result"])
+
+
+def wrap_backend(backend: str, build_live: Callable, build_fake: Callable | None = None):
+    """
+    The client search code should use for `backend`, per BACKENDS.
+    `build_fake(latency)` builds the in-process stand-in.
+    """
+    mode = backend_mode(backend)
+    latency = LatencyModel(LATENCY_SPECS.get(backend, "recorded"))
+
+    if mode == "replay":
+        return ReplayClient(Tape(backend), latency)
+    if mode == "fake":
+        if build_fake is None:
+            raise ValueError(f"No fake available for backend {backend!r}")
+        return build_fake(latency)
+
+    client = build_live()
+    if mode == "record":
+        return RecordingClient(client, Tape(backend))
+    return client
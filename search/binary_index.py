@@ -0,0 +1,158 @@
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List
+
+import numpy as np
+
+from ingest.vector_store import load_dense_vectors, serving_vectors_dir, DENSE_SIZE
+from search.filters import as_values
+from search.runtime import local_collection
+
+# candidates kept after the Hamming prefilter, per requested result
+SHORTLIST_FACTOR = 10
+MIN_SHORTLIST = 100
+
+
+@dataclass
+class LocalPoint:
+    """
+    Same shape as the Qdrant points the rest of the search code uses.
+    """
+    id: str
+    score: float
+    payload: Dict = field(default_factory=dict)
+
+
+class BinaryDenseIndex:
+    """
+    Two-stage in-process dense search over normalized MiniLM vectors.
+
+    1. Prefilter: sign bits of each 384-d vector packed into 48-byte codes,
+       Hamming distance via vectorized popcount over the whole corpus.
+    2. Rescore: exact cosine on the float16 vectors of the shortlist.
+
+    Only the codes must be resident; float16 blocks may be memory-mapped,
+    in which case just the shortlisted rows are paged in.
+    """
+
+    def __init__(self, meta: List[Dict], blocks: List[np.ndarray]):
+        self.meta = meta
+        self.ids = [m["id"] for m in meta]
+        self.blocks = blocks
+        self.offsets = np.cumsum([0] + [len(b) for b in blocks])
+
+        if blocks:
+            self.codes = np.concatenate([np.packbits(b > 0, axis=1) for b in blocks])
+        else:
+            self.codes = np.zeros((0, DENSE_SIZE // 8), dtype=np.uint8)
+
+        self.rows_by_version = self._rows_by("version")
+        self.rows_by_document = self._rows_by("document_id")
+        self.rows_by_section = self._rows_by("section_id")
+
+    def _rows_by(self, field_name: str) -> Dict[str, np.ndarray]:
+        values = np.array([m[field_name] for m in self.meta])
+        return {v: np.flatnonzero(values == v) for v in np.unique(values)}
+
+    def filter_rows(self, version_filter=None, document_filter=None, section_filter=None) -> np.ndarray | None:
+        """
+        Sorted rows matching any listed version AND any listed document
+        AND any listed section, or None when unfiltered.
+        """
+        rows = None
+        for values, index in (
+            (as_values(version_filter), self.rows_by_version),
+            (as_values(document_filter), self.rows_by_document),
+            (as_values(section_filter), self.rows_by_section),
+        ):
+            if not values:
+                continue
+            matched = np.concatenate(
+                [index.get(v, np.empty(0, dtype=np.int64)) for v in values]
+            )
+            matched = np.unique(matched)
+            rows = matched if rows is None else np.intersect1d(rows, matched)
+        return rows
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def resident_bytes(self) -> int:
+        return self.codes.nbytes
+
+    def gather(self, rows: np.ndarray) -> np.ndarray:
+        """
+        float32 copies of the given global rows, across blocks.
+        """
+        out = np.empty((len(rows), DENSE_SIZE), dtype=np.float32)
+        block_ids = np.searchsorted(self.offsets, rows, side="right") - 1
+
+        for b in np.unique(block_ids):
+            mask = block_ids == b
+            out[mask] = self.blocks[b][rows[mask] - self.offsets[b]]
+
+        return out
+
+    def search(
+        self,
+        query_vector,
+        top_k: int = 5,
+        version_filter=None,
+        shortlist: int | None = None,
+        document_filter=None,
+        section_filter=None,
+    ) -> List[LocalPoint]:
+        query = np.asarray(query_vector, dtype=np.float32).reshape(DENSE_SIZE)
+        query_code = np.packbits(query > 0)
+
+        if not len(self):
+            return []
+
+        rows = self.filter_rows(version_filter, document_filter, section_filter)
+        if rows is None:
+            codes = self.codes
+        elif not len(rows):
+            return []
+        else:
+            codes = self.codes[rows]
+
+        # stage 1: Hamming distance on packed codes
+        distances = np.bitwise_count(codes ^ query_code).sum(axis=1, dtype=np.uint16)
+
+        shortlist = shortlist or max(MIN_SHORTLIST, top_k * SHORTLIST_FACTOR)
+        shortlist = min(shortlist, len(distances))
+        candidates = np.argpartition(distances, shortlist - 1)[:shortlist]
+
+        if rows is not None:
+            candidates = rows[candidates]
+
+        # stage 2: exact rescoring against float16 originals
+        scores = self.gather(candidates) @ query
+
+        top_k = min(top_k, len(candidates))
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best])]
+
+        return [
+            LocalPoint(
+                id=self.ids[candidates[i]],
+                score=float(scores[i]),
+                payload={
+                    k: v for k, v in self.meta[candidates[i]].items() if k != "id"
+                },
+            )
+            for i in best
+        ]
+
+
+@lru_cache
+def get_binary_index() -> BinaryDenseIndex:
+    meta, blocks = load_dense_vectors(serving_vectors_dir(local_collection()))
+
+    if not meta:
+        raise RuntimeError(
+            "No local dense vectors found; run ingest/embed_and_upsert.py first"
+        )
+
+    return BinaryDenseIndex(meta, blocks)
@@ -0,0 +1,87 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable
+
+# In-process LRU caches for the fast path. Sizes come from the query log
+# replay (python -m search.prewarm --simulate ...).
+EMBED_CACHE_SIZE = int(os.getenv("EMBED_CACHE_SIZE", "2048"))
+RETRIEVAL_CACHE_SIZE = int(os.getenv("RETRIEVAL_CACHE_SIZE", "1024"))
+ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", "512"))
+
+CACHES: Dict[str, "LRUCache"] = {}
+
+_MISSING = object()
+
+
+def normalize_query(query: str) -> str:
+    """
+    Case- and whitespace-insensitive form used for cache keys, coalescing and logging.
+    """
+    return " ".join(query.lower().split()).rstrip("?!. ")
+
+
+def embedding_key(text: str) -> str:
+    """
+    Cache key for query embeddings: MiniLM is uncased and ignores extra
+    whitespace, but punctuation is tokenized, so it stays in the key.
+    """
+    return " ".join(text.lower().split())
+
+
+class LRUCache:
+    def __init__(self, name: str, maxsize: int):
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+        CACHES[name] = self
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+embedding_cache = LRUCache("embedding", EMBED_CACHE_SIZE)
+retrieval_cache = LRUCache("retrieval", RETRIEVAL_CACHE_SIZE)
+answer_cache = LRUCache("answer", ANSWER_CACHE_SIZE)
+
+
+def cache_stats() -> Dict:
+    return {name: cache.stats() for name, cache in CACHES.items()}
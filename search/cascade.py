@@ -0,0 +1,116 @@
+import os
+import threading
+from typing import Dict, List
+
+# Two-stage reranking: the first-stage score every candidate already carries
+# (dense cosine or RRF) decides the clear cases, and the cross-encoder only
+# scores the uncertain band around the cut-off.
+
+CASCADE_ENABLED = os.getenv("RERANK_CASCADE", "true").lower() == "true"
+
+# min-max normalised first-stage distance from the cut-off score that
+# counts as "clearly in" / "clearly out"
+CASCADE_MARGIN = float(os.getenv("RERANK_CASCADE_MARGIN", "0.25"))
+
+# cross-encoder passages per call, at most
+CASCADE_MAX_PASSAGES = int(os.getenv("RERANK_CASCADE_MAX_PASSAGES", "8"))
+
+# print exit-rate stats every N cascades (0 = never)
+CASCADE_LOG_EVERY = int(os.getenv("RERANK_CASCADE_LOG_EVERY", "100"))
+
+
+class CascadeStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.early_exits = 0
+        self.candidates = 0
+        self.scored = 0
+
+    def record(self, candidates: int, scored: int):
+        with self._lock:
+            self.calls += 1
+            self.early_exits += scored == 0
+            self.candidates += candidates
+            self.scored += scored
+            calls = self.calls
+
+        if CASCADE_LOG_EVERY and calls % CASCADE_LOG_EVERY == 0:
+            s = self.snapshot()
+            print(
+                f"[INFO] rerank cascade: {s['calls']} calls, "
+                f"exit rate {s['exit_rate']:.2f}, "
+                f"scored {s['scored_fraction']:.2f} of candidates"
+            )
+
+    def snapshot(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "early_exits": self.early_exits,
+            "exit_rate": round(self.early_exits / self.calls, 3) if self.calls else 0.0,
+            "scored_fraction": round(self.scored / self.candidates, 3) if self.candidates else 0.0,
+        }
+
+
+cascade_stats = CascadeStats()
+
+
+def _normalise(scores: List[float]) -> List[float]:
+    lo, hi = min(scores), max(scores)
+    if hi - lo <= 1e-12:
+        return [0.0] * len(scores)
+    return [(s - lo) / (hi - lo) for s in scores]
+
+
+def cascade_rerank(
+    query: str,
+    candidates: List,
+    keep: int,
+    reranker,
+    margin: float = CASCADE_MARGIN,
+    max_passages: int = CASCADE_MAX_PASSAGES,
+) -> List:
+    """
+    Returns up to `keep` candidates, best first.
+
+    candidates must be in first-stage order and carry .score and
+    payload["text"]. Candidates clearly above the cut-off keep their
+    first-stage order and go first; clearly-below ones are dropped;
+    the band in between is ordered by the cross-encoder.
+    """
+    candidates = [c for c in candidates if c.payload and c.payload.get("text")]
+
+    if not CASCADE_ENABLED:
+        ce_scores = reranker.rerank(query, [c.payload["text"] for c in candidates])
+        cascade_stats.record(len(candidates), len(candidates))
+        ranked = sorted(zip(ce_scores, candidates), key=lambda x: x[0], reverse=True)
+        return [c for _, c in ranked][:keep]
+
+    # nothing to cut: every candidate reaches the prompt either way
+    if len(candidates) <= max(1, keep):
+        cascade_stats.record(len(candidates), 0)
+        return candidates
+
+    scores = _normalise([float(c.score or 0.0) for c in candidates])
+    order = sorted(range(len(candidates)), key=lambda i: scores[i], reverse=True)
+
+    cutoff = scores[order[min(keep, len(order)) - 1]]
+
+    head = [i for i in order if scores[i] - cutoff > margin]
+    band = [i for i in order if abs(scores[i] - cutoff) <= margin]
+
+    # already decided: a clear gap below the band means head + band fit in
+    # the slots, so every one of them is kept whatever the cross-encoder says
+    if len(head) + len(band) <= keep:
+        cascade_stats.record(len(candidates), 0)
+        return [candidates[i] for i in head + band]
+
+    band = band[:max_passages]
+    passages = [candidates[i].payload["text"] for i in band]
+    ce_scores = reranker.rerank(query, passages)
+
+    ranked_band = [i for _, i in sorted(zip(ce_scores, band), key=lambda x: x[0], reverse=True)]
+
+    cascade_stats.record(len(candidates), len(band))
+
+    return [candidates[i] for i in head + ranked_band][:keep]
@@ -0,0 +1,148 @@
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict
+
+# =========================
+# per-request deadlines
+# =========================
+
+class DeadlineExceeded(TimeoutError):
+    def __init__(self, stage: str):
+        super().__init__(f"latency budget exhausted before {stage}")
+        self.stage = stage
+
+
+class Deadline:
+    def __init__(self, budget_s: float):
+        self.budget_s = budget_s
+        self.expires_at = time.perf_counter() + budget_s
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.perf_counter())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+_current: ContextVar[Deadline | None] = ContextVar("regulens_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(deadline: Deadline):
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def current_deadline() -> Deadline | None:
+    return _current.get()
+
+
+def time_left(default: float | None = None) -> float | None:
+    deadline = _current.get()
+    return deadline.remaining() if deadline else default
+
+
+def check_deadline(stage: str):
+    """
+    Stage boundary: stop here if the request's budget is gone.
+    """
+    deadline = _current.get()
+    if deadline and deadline.expired():
+        raise DeadlineExceeded(stage)
+
+
+def timeout_kwargs(integer: bool = False) -> Dict:
+    """
+    Per-call client timeout bounded by the request deadline, if any.
+    Empty when no deadline is set, so client defaults apply.
+    """
+    remaining = time_left()
+    if remaining is None:
+        return {}
+    if integer:
+        return {"timeout": max(1, math.ceil(remaining))}
+    return {"timeout": max(0.05, remaining)}
+
+
+# =========================
+# live latency estimates
+# =========================
+
+# priors used until a stage has been observed
+DEFAULT_ESTIMATES_S = {
+    "embed": 0.15,
+    "search": 0.10,
+    "splade": 0.15,
+    "rerank": 0.30,
+    "decompose": 1.00,
+    "generate": 1.50,
+}
+
+EWMA_ALPHA = 0.2
+
+
+class LatencyTracker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ewma: Dict[str, float] = {}
+        self._count: Dict[str, int] = {}
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            prev = self._ewma.get(stage)
+            self._ewma[stage] = seconds if prev is None else prev + EWMA_ALPHA * (seconds - prev)
+            self._count[stage] = self._count.get(stage, 0) + 1
+
+    def estimate(self, stage: str) -> float:
+        return self._ewma.get(stage, DEFAULT_ESTIMATES_S.get(stage, 0.0))
+
+    def snapshot(self) -> Dict:
+        return {
+            stage: {"ewma_ms": round(1000 * self.estimate(stage), 1), "count": self._count.get(stage, 0)}
+            for stage in sorted(set(DEFAULT_ESTIMATES_S) | set(self._ewma))
+        }
+
+
+latency = LatencyTracker()
+
+
+# per-request trace: stage timings plus annotations (e.g. retrieved ids),
+# collected for the query log
+_trace: ContextVar[Dict | None] = ContextVar("regulens_trace", default=None)
+
+
+@contextmanager
+def trace_scope():
+    trace = {"timings_ms": {}}
+    token = _trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _trace.reset(token)
+
+
+def annotate(key: str, value):
+    trace = _trace.get()
+    if trace is not None:
+        trace[key] = value
+
+
+@contextmanager
+def timed(stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        latency.record(stage, elapsed)
+
+        trace = _trace.get()
+        if trace is not None:
+            timings = trace["timings_ms"]
+            timings[stage] = round(timings.get(stage, 0.0) + 1000 * elapsed, 2)
@@ -0,0 +1,216 @@
+import hashlib
+import re
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Dict, List
+
+from ingest.chunk_ids import chunk_point_id
+from ingest.jsonl import load_records
+from search.binary_index import LocalPoint
+from search.text_store import TEXT_STORE_DIR, text_store_files
+
+# In-process stand-ins for offline benchmarks (BACKENDS="qdrant=fake,..."),
+# seeded from the chunk files in data/chunks.
+#
+# - FakeQdrant: exact cosine search over every chunk; dense queries, RRF over
+#   dense prefetches (sparse prefetches are skipped), MatchValue / MatchAny
+#   filters, payload projection, retrieve by id.
+# - FakeInferenceClient: a hashing embedder. Used together with FakeQdrant
+#   the fake store embeds the chunks with it too, so retrieval stays lexical
+#   but consistent. With a live / replayed HF backend the store uses the real
+#   vectors from data/vectors instead.
+# - FakeChatClient: an extractive "answer" quoting the first source lines.
+#
+# Delays come from REPLAY_LATENCY (search/backends.py); none by default.
+
+DENSE_SIZE = 384
+RRF_K = 60
+
+TOKEN_REGEX = re.compile(r"[a-z0-9]+")
+
+
+def hashed_embedding(text: str):
+    """
+    Signed feature hashing of unigrams and bigrams, L2-normalised.
+    """
+    import numpy as np
+
+    vector = np.zeros(DENSE_SIZE, dtype=np.float32)
+    tokens = TOKEN_REGEX.findall(text.lower())
+
+    for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        bucket = int.from_bytes(digest[:4], "little") % DENSE_SIZE
+        vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def pause(latency, recorded_ms: float = 0.0):
+    delay_ms = latency.sample_ms(recorded_ms) if latency is not None else 0.0
+    if delay_ms > 0:
+        time.sleep(delay_ms / 1000)
+
+
+# =========================
+# Qdrant
+# =========================
+
+@dataclass
+class FakeResponse:
+    points: List[LocalPoint] = field(default_factory=list)
+
+
+@lru_cache
+def load_fake_collection(hashed: bool):
+    """
+    (point ids, payloads, float32 row-normalised vectors) for every chunk.
+    """
+    import numpy as np
+
+    payloads = {}
+    for path in text_store_files():
+        for chunk in load_records(path):
+            payloads[chunk_point_id(chunk)] = chunk
+
+    if not payloads:
+        raise RuntimeError(f"No chunk files under {TEXT_STORE_DIR}; run the ingest pipeline first")
+
+    if hashed:
+        ids = list(payloads)
+        vectors = np.stack([hashed_embedding(payloads[i]["text"]) for i in ids])
+    else:
+        from ingest.vector_store import load_dense_vectors, serving_vectors_dir
+        from search.runtime import local_collection
+
+        meta, blocks = load_dense_vectors(serving_vectors_dir(local_collection()), mmap=False)
+        if not meta:
+            raise RuntimeError("No local dense vectors found; run ingest/embed_and_upsert.py first, or use hf=fake")
+        ids = [m["id"] for m in meta]
+        vectors = np.concatenate(blocks).astype(np.float32)
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+    return ids, [payloads.get(i, {}) for i in ids], vectors
+
+
+def matches(payload: Dict, query_filter) -> bool:
+    for condition in (query_filter.must or []) if query_filter is not None else []:
+        value = payload.get(condition.key)
+        match = condition.match
+        if hasattr(match, "any"):
+            if value not in match.any:
+                return False
+        elif value != match.value:
+            return False
+    return True
+
+
+def project(payload: Dict, with_payload) -> Dict:
+    if with_payload is True:
+        return dict(payload)
+    if not with_payload:
+        return {}
+    return {k: payload[k] for k in with_payload if k in payload}
+
+
+class FakeQdrant:
+    def __init__(self, hashed: bool, latency=None):
+        self.ids, self.payloads, self.vectors = load_fake_collection(hashed)
+        self.positions = {point_id: i for i, point_id in enumerate(self.ids)}
+        self.latency = latency
+
+    def _dense(self, query, limit: int, query_filter) -> List[tuple]:
+        import numpy as np
+
+        scores = self.vectors @ np.asarray(query, dtype=np.float32).reshape(DENSE_SIZE)
+        order = np.argsort(-scores)
+        hits = []
+        for i in order:
+            if matches(self.payloads[i], query_filter):
+                hits.append((int(i), float(scores[i])))
+                if len(hits) == limit:
+                    break
+        return hits
+
+    def query_points(
+        self,
+        collection_name: str,
+        query=None,
+        using: str | None = None,
+        prefetch=None,
+        query_filter=None,
+        limit: int = 10,
+        with_payload=True,
+        **_,
+    ) -> FakeResponse:
+        if prefetch:
+            fused = {}
+            for p in prefetch:
+                if p.using == "sparse":
+                    continue
+                for rank, (i, _) in enumerate(self._dense(p.query, p.limit, p.filter)):
+                    fused[i] = fused.get(i, 0.0) + 1.0 / (RRF_K + rank + 1)
+            hits = sorted(fused.items(), key=lambda kv: -kv[1])[:limit]
+        else:
+            hits = self._dense(query, limit, query_filter)
+
+        pause(self.latency)
+        return FakeResponse([
+            LocalPoint(id=self.ids[i], score=score, payload=project(self.payloads[i], with_payload))
+            for i, score in hits
+        ])
+
+    def retrieve(self, collection_name: str, ids: List, with_payload=True, **_) -> List[LocalPoint]:
+        pause(self.latency)
+        return [
+            LocalPoint(id=self.ids[i], score=0.0, payload=project(self.payloads[i], with_payload))
+            for i in (self.positions.get(str(point_id)) for point_id in ids)
+            if i is not None
+        ]
+
+    def count(self, collection_name: str, **_):
+        return SimpleNamespace(count=len(self.ids))
+
+    def collection_exists(self, collection_name: str) -> bool:
+        return True
+
+    def get_aliases(self):
+        # a plain collection: the index watcher never sees a swap
+        return SimpleNamespace(aliases=[])
+
+
+# =========================
+# HF Inference / Groq
+# =========================
+
+class FakeInferenceClient:
+    def __init__(self, latency=None):
+        self.latency = latency
+
+    def feature_extraction(self, text: str, model: str | None = None, **_):
+        pause(self.latency)
+        return hashed_embedding(text)
+
+
+class FakeChatClient:
+    """
+    Mirrors client.chat.completions.create / client.with_options.
+    """
+
+    def __init__(self, latency=None):
+        self.latency = latency
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def with_options(self, **_):
+        return self
+
+    def create(self, model: str, messages: List[Dict], **_):
+        prompt = messages[-1]["content"]
+        lines = [line for line in prompt.splitlines() if line.strip()][:3]
+        content = f"[{model}] " + " ".join(lines)
+
+        pause(self.latency)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
@@ -1,43 +1,127 @@
-from qdrant_client.models import Filter, FieldCondition, MatchValue
-from search.runtime import get_qdrant
+import os
+
+from search.runtime import get_qdrant, COLLECTION_NAME
+from search.limits import backend_slot
+from search.deadline import check_deadline, timed, timeout_kwargs
 from search.remote_embeddings import embed_query
+from search.text_store import FILTER_FIELDS
+from search.sparse_query import encode_sparse_query
+from search.cache import retrieval_cache, normalize_query
+from search.filters import FilterValues, as_values, build_filter
+
+COLLECTION_PROFILE = os.getenv("COLLECTION_PROFILE", "float32")
 
-COLLECTION_NAME = "regulens"
+# "qdrant" (default) or "local": the in-process binary-code index
+# over vectors saved at ingestion (search/binary_index.py)
+DENSE_BACKEND = os.getenv("DENSE_BACKEND", "qdrant")
 TOP_K = 5
 
 
 def fast_dense_search(
     query: str,
-    version_filter: str | None = None,
+    version_filter: FilterValues = None,
     top_k: int = TOP_K,
+    hnsw_ef: int | None = None,
+    exact: bool = False,
+    use_sparse: bool = False,
+    document_filter: FilterValues = None,
+    section_filter: FilterValues = None,
 ):
     """
     Latency-optimized dense-only retrieval.
     No SPLADE, no reranking.
+
+    use_sparse adds an inference-free sparse prefetch (IDF query weights
+    against the SPLADE doc vectors, search/sparse_query.py) fused with RRF.
+
+    Returns lean points (ids, scores, filter fields only);
+    use search.text_store.hydrate for the ones that reach the prompt.
+
+    hnsw_ef / exact override the collection profile's search defaults.
+
+    version_filter / document_filter / section_filter take one value or
+    several (MatchAny); section ids come from search.sections.resolve_section_prefix.
     """
-    
-    client = get_qdrant()
+    check_deadline("search")
+
+    versions = as_values(version_filter)
+    document_ids = as_values(document_filter)
+    section_ids = as_values(section_filter)
+
+    cache_key = (
+        normalize_query(query), versions, document_ids, section_ids, top_k,
+        hnsw_ef, exact, use_sparse, DENSE_BACKEND,
+    )
+    cached = retrieval_cache.get(cache_key)
+    if cached is not None:
+        return list(cached)
+
+    points = _search(query, versions, document_ids, section_ids, top_k, hnsw_ef, exact, use_sparse)
+    retrieval_cache.put(cache_key, points)
 
-    qdrant_filter = None
-    if version_filter:
-        qdrant_filter = Filter(
-            must=[
-                FieldCondition(
-                    key="version",
-                    match=MatchValue(value=version_filter)
-                )
-            ]
+    return list(points)
+
+
+def _search(query, versions, document_ids, section_ids, top_k, hnsw_ef, exact, use_sparse):
+    # qdrant_client.models costs ~1s to import; keep it off the API import path
+    from qdrant_client.models import Prefetch, FusionQuery, Fusion
+    from ingest.collection_profiles import search_params
+
+    if DENSE_BACKEND == "local":
+        from search.binary_index import get_binary_index
+
+        return get_binary_index().search(
+            embed_query(query),
+            top_k=top_k,
+            version_filter=versions,
+            document_filter=document_ids,
+            section_filter=section_ids,
         )
 
+    client = get_qdrant()
+
+    qdrant_filter = build_filter(versions, document_ids, section_ids)
+
     query_vector = embed_query(query)
+    params = search_params(COLLECTION_PROFILE, hnsw_ef=hnsw_ef, exact=exact)
 
-    response = client.query_points(
-        collection_name=COLLECTION_NAME,
-        query=query_vector,
-        using="dense",
-        limit=top_k,
-        with_payload=True,
-        query_filter=qdrant_filter,
-    )
+    if use_sparse:
+        with backend_slot("qdrant"), timed("search"):
+            response = client.query_points(
+                collection_name=COLLECTION_NAME,
+                prefetch=[
+                    Prefetch(
+                        using="dense",
+                        query=query_vector,
+                        limit=top_k * 2,
+                        filter=qdrant_filter,
+                        params=params,
+                    ),
+                    Prefetch(
+                        using="sparse",
+                        query=encode_sparse_query(query, encoder="idf"),
+                        limit=top_k * 2,
+                        filter=qdrant_filter,
+                    ),
+                ],
+                query=FusionQuery(fusion=Fusion.RRF),
+                limit=top_k,
+                with_payload=FILTER_FIELDS,
+                **timeout_kwargs(integer=True),
+            )
+
+        return response.points
+
+    with backend_slot("qdrant"), timed("search"):
+        response = client.query_points(
+            collection_name=COLLECTION_NAME,
+            query=query_vector,
+            using="dense",
+            limit=top_k,
+            with_payload=FILTER_FIELDS,
+            query_filter=qdrant_filter,
+            search_params=params,
+            **timeout_kwargs(integer=True),
+        )
 
     return response.points
@@ -0,0 +1,41 @@
+from typing import Iterable, Tuple
+
+# Payload filters over the keyword-indexed fields (ingest/create_collection.py).
+# A single value becomes MatchValue, several become MatchAny; fields are ANDed.
+
+FilterValues = str | Iterable[str] | None
+
+
+def as_values(values: FilterValues) -> Tuple[str, ...]:
+    """
+    Canonical, hashable form (used in cache and coalescing keys too).
+    """
+    if not values:
+        return ()
+    if isinstance(values, str):
+        return (values,)
+    return tuple(sorted(set(values)))
+
+
+def build_filter(
+    versions: FilterValues = None,
+    document_ids: FilterValues = None,
+    section_ids: FilterValues = None,
+):
+    """
+    Qdrant Filter, or None when nothing is restricted.
+    """
+    from qdrant_client.models import Filter, FieldCondition, MatchValue, MatchAny
+
+    must = []
+    for key, values in (
+        ("version", as_values(versions)),
+        ("document_id", as_values(document_ids)),
+        ("section_id", as_values(section_ids)),
+    ):
+        if len(values) == 1:
+            must.append(FieldCondition(key=key, match=MatchValue(value=values[0])))
+        elif values:
+            must.append(FieldCondition(key=key, match=MatchAny(any=list(values))))
+
+    return Filter(must=must) if must else None
@@ -0,0 +1,153 @@
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from search.runtime import get_llm_client
+from search.prompts import SYSTEM_PROMPT
+from search.limits import backend_slot
+from search.deadline import check_deadline, timed, timeout_kwargs, annotate
+
+# Tiered generation: every LLM call names its task, the task picks a model
+# tier, and a rate-limited tier falls through to the next one instead of
+# failing the request.
+#
+#   decompose  query planning (search/query_decomposition.py)
+#   trivial    greetings and thanks, answered without retrieval
+#   answer     grounded single-question answers
+#   compare    grounded proposed-vs-final comparisons
+
+MODEL_TIERS = {
+    "small": os.getenv("LLM_SMALL_MODEL", "llama-3.1-8b-instant"),
+    "large": os.getenv("LLM_LARGE_MODEL", "llama-3.3-70b-versatile"),
+}
+
+TASK_TIERS = {
+    "decompose": os.getenv("LLM_TIER_DECOMPOSE", "small"),
+    "trivial": os.getenv("LLM_TIER_TRIVIAL", "small"),
+    "answer": os.getenv("LLM_TIER_ANSWER", "large"),
+    "compare": os.getenv("LLM_TIER_COMPARE", "large"),
+}
+
+# tiers tried next, in order, when a tier is rate limited
+FALLBACK_TIERS = {
+    "small": ["large"],
+    "large": ["small"],
+}
+
+# the whole message is a greeting / sign-off (SYSTEM_PROMPT answers these in one line)
+TRIVIAL_PATTERN = re.compile(
+    r"^\s*(hi|hello|hey|good (morning|afternoon|evening)|thanks|thank you|"
+    r"ok|okay|bye|goodbye)( there| all| so much| a lot)?[\s!.,?]*$",
+    re.IGNORECASE,
+)
+
+EWMA_ALPHA = 0.2
+
+
+def is_trivial(query: str) -> bool:
+    return bool(TRIVIAL_PATTERN.match(query))
+
+
+def is_rate_limited(exc: Exception) -> bool:
+    # groq.RateLimitError, without importing groq here
+    return getattr(exc, "status_code", None) == 429
+
+
+class TierStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tiers: Dict[str, Dict] = {}
+
+    def _entry(self, tier: str) -> Dict:
+        return self._tiers.setdefault(
+            tier,
+            {"calls": 0, "errors": 0, "rate_limited": 0, "fallbacks_in": 0, "ewma_ms": None},
+        )
+
+    def record(self, tier: str, seconds: float, fallback: bool):
+        with self._lock:
+            entry = self._entry(tier)
+            entry["calls"] += 1
+            entry["fallbacks_in"] += fallback
+            ms = 1000 * seconds
+            prev = entry["ewma_ms"]
+            entry["ewma_ms"] = ms if prev is None else prev + EWMA_ALPHA * (ms - prev)
+
+    def failure(self, tier: str, rate_limited: bool):
+        with self._lock:
+            entry = self._entry(tier)
+            entry["errors"] += 1
+            entry["rate_limited"] += rate_limited
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                tier: {
+                    "model": MODEL_TIERS.get(tier),
+                    **entry,
+                    "ewma_ms": round(entry["ewma_ms"], 1) if entry["ewma_ms"] is not None else None,
+                }
+                for tier, entry in sorted(self._tiers.items())
+            }
+
+
+tier_stats = TierStats()
+
+
+def generate(
+    task: str,
+    messages: List[Dict],
+    temperature: float = 0.2,
+    stage: str = "generate",
+) -> Tuple[str, str]:
+    """
+    Runs one chat completion for the task; returns (text, tier that answered).
+    Only rate limits move on to the next tier; other errors propagate.
+    """
+    first = TASK_TIERS[task]
+    tiers = [first, *FALLBACK_TIERS.get(first, [])]
+
+    for attempt, tier in enumerate(tiers):
+        last = attempt == len(tiers) - 1
+        client = get_llm_client()
+        if not last:
+            # fall through to the next tier instead of backing off on this one
+            client = client.with_options(max_retries=0)
+
+        start = time.perf_counter()
+        try:
+            with backend_slot("groq"), timed(stage):
+                completion = client.chat.completions.create(
+                    model=MODEL_TIERS[tier],
+                    temperature=temperature,
+                    messages=messages,
+                    **timeout_kwargs(),
+                )
+        except Exception as exc:
+            rate_limited = is_rate_limited(exc)
+            tier_stats.failure(tier, rate_limited)
+            if last or not rate_limited:
+                raise
+            print(f"[WARN] {task}: tier {tier!r} rate limited, falling back to {tiers[attempt + 1]!r}")
+            check_deadline(stage)
+            continue
+
+        tier_stats.record(tier, time.perf_counter() - start, fallback=attempt > 0)
+        annotate("model_tier", tier)
+        return completion.choices[0].message.content.strip(), tier
+
+
+def answer_trivial(query: str) -> Dict:
+    """
+    Greetings and thanks: no retrieval, small tier.
+    """
+    answer, _ = generate(
+        "trivial",
+        [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": query},
+        ],
+    )
+    return {"answer": answer, "sources": []}
@@ -1,10 +1,15 @@
 from typing import List
 from search.runtime import get_cross_encoder_reranker
+from search.deadline import timed
+from search.cascade import cascade_rerank
 
 
 def global_rerank(query: str, candidates: List, top_k: int = 8):
     """
     Global reranking using the original user query.
+
+    Candidates keep their first-stage (RRF) scores, so the cascade only
+    sends the uncertain band to the cross-encoder.
     """
 
     if not candidates:
@@ -12,11 +17,5 @@ def global_rerank(query: str, candidates: List, top_k: int = 8):
     
     reranker = get_cross_encoder_reranker()
 
-    passages = [c.payload.get("text", "") for c in candidates]
-
-    scores = reranker.rerank(query, passages)
-
-    scored = list(zip(candidates, scores))
-    scored.sort(key=lambda x: x[1], reverse=True)
-
-    return [c for c, _ in scored[:top_k]]
+    with timed("rerank"):
+        return cascade_rerank(query, candidates, top_k, reranker)
@@ -1,17 +1,20 @@
 import os
+from functools import lru_cache
+from typing import List
 
 USE_LOCAL_MODELS = os.getenv("USE_LOCAL_MODELS", "false").lower() == "true"
+MODEL_SERVER_SOCKET = os.getenv("MODEL_SERVER_SOCKET")
 
 if USE_LOCAL_MODELS:
-    import torch
+    # with a model sidecar, this process never runs torch itself
+    if not MODEL_SERVER_SOCKET:
+        import torch
     from qdrant_client.models import (
         Prefetch,
         FusionQuery,
         Fusion,
-        Filter,
-        FieldCondition,
-        MatchValue,
     )
+    from ingest.collection_profiles import search_params
 
 from ingest.reranker import CrossEncoderReranker
 
@@ -20,18 +23,29 @@ from search.runtime import (
     get_splade,
     get_qdrant,
     get_cross_encoder_reranker,
+    get_model_server,
+    MICROBATCH_ENABLED,
+    COLLECTION_NAME,
 )
+from search.text_store import FILTER_FIELDS, hydrate
+from search.limits import backend_slot
+from search.deadline import check_deadline, timed, timeout_kwargs
+from search.cascade import cascade_rerank
+from search.sparse_query import encode_sparse_query
+from search.filters import FilterValues, build_filter
 
 # =========================
 # config
 # =========================
 
-COLLECTION_NAME = "regulens"
+COLLECTION_PROFILE = os.getenv("COLLECTION_PROFILE", "float32")
 
 TOP_K = 10
 RERANK_TOP_K = 7
 FINAL_TOP_N = 3
 
+SPLADE_MAX_BATCH = 8
+
 
 # =========================
 # SPLADE (LOCAL ONLY)
@@ -41,6 +55,13 @@ def compute_splade_query(text: str):
     if not USE_LOCAL_MODELS:
         raise RuntimeError("SPLADE is disabled in production")
 
+    server = get_model_server()
+    if server:
+        return server.sparse(text)
+
+    if MICROBATCH_ENABLED:
+        return get_splade_batcher()(text)
+
     tokenizer, model, device = get_splade()
 
     with torch.no_grad():
@@ -69,26 +90,63 @@ def compute_splade_query(text: str):
         }
 
 
+def compute_splade_batch(texts: List[str]) -> List[dict]:
+    """
+    SPLADE for several queries in one padded forward pass.
+    Padding is masked out, so each row matches compute_splade_query.
+    """
+    tokenizer, model, device = get_splade()
+
+    with torch.no_grad():
+        tokens = tokenizer(
+            texts,
+            return_tensors="pt",
+            truncation=True,
+            max_length=512,
+            padding=True,
+        ).to(device)
+
+        logits = model(**tokens).logits
+
+        relu_log = torch.log1p(torch.relu(logits))
+        weighted = relu_log * tokens.attention_mask.unsqueeze(-1)
+
+        vecs, _ = torch.max(weighted, dim=1)
+
+    results = []
+    for vec in vecs:
+        nonzero = vec.nonzero(as_tuple=False).squeeze(-1).cpu()
+        results.append({
+            "indices": nonzero.tolist(),
+            "values": vec[nonzero].cpu().tolist(),
+        })
+
+    return results
+
+
+@lru_cache
+def get_splade_batcher():
+    from search.microbatch import MicroBatcher
+
+    # logits are (batch, seq, 30k vocab), so keep SPLADE batches small
+    return MicroBatcher("sparse", compute_splade_batch, max_batch=SPLADE_MAX_BATCH)
+
+
 # =========================
 # reranking
 # =========================
 
-def rerank_results(query: str, points, rerank_k: int):
+def rerank_results(query: str, points, rerank_k: int, keep: int = FINAL_TOP_N):
+    """
+    Cascade over the fused head: RRF decides the clear cases, the
+    cross-encoder only scores the uncertain band (search/cascade.py).
+    """
     reranker = get_cross_encoder_reranker()
 
-    candidates = points[:rerank_k]
-    passages = [
-        p.payload["text"]
-        for p in candidates
-        if p.payload and "text" in p.payload
-    ]
-
-    rerank_scores = reranker.rerank(query, passages)
-
-    scored = list(zip(rerank_scores, candidates))
-    scored.sort(key=lambda x: x[0], reverse=True)
+    candidates = hydrate(points[:rerank_k])
 
-    return [point for _, point in scored]
+    with timed("rerank"):
+        return cascade_rerank(query, candidates, keep, reranker)
 
 
 # =========================
@@ -99,55 +157,79 @@ def hybrid_search(
     query: str,
     top_k: int = TOP_K,
     rerank_k: int = RERANK_TOP_K,
-    version_filter: str | None = None,
+    version_filter: FilterValues = None,
+    hnsw_ef: int | None = None,
+    exact: bool = False,
+    use_sparse: bool = True,
+    rerank: bool = True,
+    document_filter: FilterValues = None,
+    section_filter: FilterValues = None,
 ):
+    """
+    use_sparse / rerank let the router (search/router.py) drop SPLADE
+    or the cross-encoder when the latency budget or CPU is tight.
+    """
     if not USE_LOCAL_MODELS:
         raise RuntimeError("Hybrid search is disabled in production")
 
+    check_deadline("hybrid_search")
+
+    dense_params = search_params(COLLECTION_PROFILE, hnsw_ef=hnsw_ef, exact=exact)
+
     dense_model = get_dense_model()
     client = get_qdrant()
 
-    qdrant_filter = None
-    if version_filter:
-        qdrant_filter = Filter(
-            must=[
-                FieldCondition(
-                    key="version",
-                    match=MatchValue(value=version_filter),
-                )
-            ]
-        )
-
-    dense_query = dense_model.encode(
-        query,
-        normalize_embeddings=True,
-    ).tolist()
+    qdrant_filter = build_filter(version_filter, document_filter, section_filter)
+
+    with timed("embed"):
+        dense_query = dense_model.encode(
+            query,
+            normalize_embeddings=True,
+        ).tolist()
+
+    prefetch = [
+        Prefetch(
+            using="dense",
+            query=dense_query,
+            limit=top_k,
+            filter=qdrant_filter,
+            params=dense_params,
+        ),
+    ]
 
-    sparse_query = compute_splade_query(query)
+    if use_sparse:
+        with timed("splade"):
+            # SPLADE or inference-free IDF, per SPARSE_QUERY_ENCODER
+            sparse_query = encode_sparse_query(query)
 
-    response = client.query_points(
-        collection_name=COLLECTION_NAME,
-        prefetch=[
-            Prefetch(
-                using="dense",
-                query=dense_query,
-                limit=top_k,
-                filter=qdrant_filter,
-            ),
+        prefetch.append(
             Prefetch(
                 using="sparse",
                 query=sparse_query,
                 limit=top_k,
                 filter=qdrant_filter,
-            ),
-        ],
-        query=FusionQuery(fusion=Fusion.RRF),
-        limit=top_k,
-    )
+            )
+        )
+
+    check_deadline("search")
+
+    with backend_slot("qdrant"), timed("search"):
+        response = client.query_points(
+            collection_name=COLLECTION_NAME,
+            prefetch=prefetch,
+            query=FusionQuery(fusion=Fusion.RRF),
+            # only the head of the fused list is reranked
+            limit=rerank_k,
+            with_payload=FILTER_FIELDS,
+            **timeout_kwargs(integer=True),
+        )
 
     if not response.points:
         return []
 
-    reranked = rerank_results(query, response.points, rerank_k)
+    if not rerank:
+        return hydrate(response.points[:FINAL_TOP_N])
+
+    check_deadline("rerank")
 
-    return reranked[:FINAL_TOP_N]
+    return rerank_results(query, response.points, rerank_k, keep=FINAL_TOP_N)
@@ -0,0 +1,130 @@
+import os
+import sys
+import threading
+import time
+from typing import Dict
+
+from search.runtime import get_qdrant, local_collection, set_local_collection, COLLECTION_NAME
+from search.cache import retrieval_cache, answer_cache
+from ingest.vector_store import serving_vectors_dir
+
+# Hot swap after a blue/green reindex (ingest/reindex.py).
+#
+# Qdrant resolves the alias on every query, so remote search follows a swap
+# by itself. What each worker holds in memory does not: the local indexes
+# below and the retrieval / answer caches. A background thread polls the
+# alias and, when it moves, switches the local indexes to the new target's
+# files (data/vectors/<collection>/), rebuilds the ones that were in use,
+# drops the caches and replays the hottest logged questions into them.
+INDEX_POLL_S = float(os.getenv("INDEX_POLL_S", "30"))  # 0 = off
+
+# (module, lru-cached loader); only modules already imported are touched,
+# so a worker never loads an index it was not using
+LOCAL_INDEXES = [
+    ("search.binary_index", "get_binary_index"),
+    ("search.text_store", "load_text_store"),
+    ("search.neighbours", "load_adjacency_index"),
+    ("search.near_duplicates", "canonical_map"),
+    ("search.sections", "load_section_index"),
+    ("search.sparse_query", "get_idf_encoder"),
+    ("search.version_pairs", "load_pair_index"),
+]
+
+
+def resolve_alias(alias: str = COLLECTION_NAME) -> str | None:
+    """
+    Collection the alias points at; None when `alias` is a plain collection.
+    """
+    for a in get_qdrant().get_aliases().aliases:
+        if a.alias_name == alias:
+            return a.collection_name
+    return None
+
+
+def reload_local_indexes() -> list:
+    reloaded = []
+
+    for module_name, loader_name in LOCAL_INDEXES:
+        module = sys.modules.get(module_name)
+        if module is None:
+            continue
+
+        loader = getattr(module, loader_name)
+        was_loaded = loader.cache_info().currsize > 0
+        loader.cache_clear()
+        if was_loaded:
+            loader()
+            reloaded.append(f"{module_name}.{loader_name}")
+
+    # cached hits / answers came from the old index
+    retrieval_cache.clear()
+    answer_cache.clear()
+
+    return reloaded
+
+
+class IndexWatcher:
+    def __init__(self, alias: str = COLLECTION_NAME, interval: float = INDEX_POLL_S):
+        self.alias = alias
+        self.interval = interval
+        self.collection = None
+        self.swaps = 0
+        self.last_swap = None
+        self._thread = None
+
+    def check(self) -> bool:
+        """
+        One poll; returns True when the served collection changed and local
+        state was reloaded.
+        """
+        # a plain collection (before the first --replace-collection switch) serves itself
+        target = resolve_alias(self.alias) or self.alias
+        previous, self.collection = self.collection, target
+
+        if target == previous:
+            return False
+
+        # First poll: until now the local indexes used the newest local build,
+        # which is not the live collection after a rollback.
+        guessed = local_collection()
+        set_local_collection(target)
+        if previous is None and serving_vectors_dir(guessed) == serving_vectors_dir(target):
+            return False
+
+        start = time.perf_counter()
+        reloaded = reload_local_indexes()
+        self.swaps += 1
+        self.last_swap = time.time()
+        print(
+            f"[INFO] Index swap {previous} → {target}: reloaded "
+            f"{', '.join(reloaded) or 'no local indexes'} in {time.perf_counter() - start:.1f}s"
+        )
+
+        from search.prewarm import prewarm_in_background
+        prewarm_in_background(answers=False)
+        return True
+
+    def _run(self):
+        while True:
+            try:
+                self.check()
+            except Exception as exc:
+                print(f"[WARN] Index alias check failed: {exc}")
+            time.sleep(self.interval)
+
+    def start(self):
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="index-watcher", daemon=True)
+        self._thread.start()
+
+    def stats(self) -> Dict:
+        return {
+            "alias": self.alias,
+            "collection": self.collection,
+            "swaps": self.swaps,
+            "last_swap": self.last_swap,
+        }
+
+
+index_watcher = IndexWatcher()
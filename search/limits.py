@@ -0,0 +1,119 @@
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from search.deadline import time_left, check_deadline
+
+# Per-backend admission limits.
+#   concurrency: calls allowed in flight at once
+#   queue:       callers allowed to wait for a slot; beyond that, fail fast
+QUEUE_TIMEOUT_S = float(os.getenv("BACKEND_QUEUE_TIMEOUT", "2.0"))
+
+BACKEND_LIMITS = {
+    "hf": {
+        "concurrency": int(os.getenv("HF_MAX_CONCURRENCY", "4")),
+        "queue": int(os.getenv("HF_MAX_QUEUE", "16")),
+    },
+    "qdrant": {
+        "concurrency": int(os.getenv("QDRANT_MAX_CONCURRENCY", "8")),
+        "queue": int(os.getenv("QDRANT_MAX_QUEUE", "32")),
+    },
+    "groq": {
+        "concurrency": int(os.getenv("GROQ_MAX_CONCURRENCY", "2")),
+        "queue": int(os.getenv("GROQ_MAX_QUEUE", "8")),
+    },
+}
+
+# smoothing for the observed per-call hold time
+EWMA_ALPHA = 0.2
+
+
+class BackendOverloaded(RuntimeError):
+    def __init__(self, backend: str, retry_after: int):
+        super().__init__(f"{backend} is at capacity, retry after {retry_after}s")
+        self.backend = backend
+        self.retry_after = retry_after
+
+
+class BackendLimiter:
+    """
+    Bounded concurrency with a bounded wait queue.
+    Callers that cannot get a slot within the timeout, or find the queue full,
+    get BackendOverloaded immediately instead of piling up.
+    """
+
+    def __init__(self, name: str, concurrency: int, queue: int, timeout: float = QUEUE_TIMEOUT_S):
+        self.name = name
+        self.concurrency = concurrency
+        self.queue = queue
+        self.timeout = timeout
+
+        self.active = 0
+        self.waiting = 0
+        self.avg_hold_s = 0.0
+        self._cond = threading.Condition()
+
+    def retry_after(self) -> int:
+        # time for the current queue to drain at the observed call rate
+        backlog = (self.waiting + 1) / max(1, self.concurrency)
+        return max(1, math.ceil(self.avg_hold_s * backlog))
+
+    @contextmanager
+    def slot(self):
+        # an expired request is a 504, not backend pressure (503)
+        check_deadline(f"{self.name} call")
+
+        with self._cond:
+            if self.active >= self.concurrency:
+                if self.waiting >= self.queue:
+                    raise BackendOverloaded(self.name, self.retry_after())
+
+                self.waiting += 1
+                try:
+                    acquired = self._cond.wait_for(
+                        lambda: self.active < self.concurrency,
+                        # never queue past the request's own deadline
+                        timeout=min(self.timeout, time_left(self.timeout)),
+                    )
+                finally:
+                    self.waiting -= 1
+
+                if not acquired:
+                    check_deadline(f"{self.name} call")
+                    raise BackendOverloaded(self.name, self.retry_after())
+
+            self.active += 1
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            held = time.perf_counter() - start
+            with self._cond:
+                self.active -= 1
+                self.avg_hold_s += EWMA_ALPHA * (held - self.avg_hold_s)
+                self._cond.notify()
+
+    def stats(self) -> dict:
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "concurrency": self.concurrency,
+            "queue": self.queue,
+            "avg_hold_ms": round(self.avg_hold_s * 1000, 1),
+        }
+
+
+LIMITERS = {
+    name: BackendLimiter(name, cfg["concurrency"], cfg["queue"])
+    for name, cfg in BACKEND_LIMITS.items()
+}
+
+
+def backend_slot(name: str):
+    """
+    with backend_slot("groq"): ...
+    """
+    return LIMITERS[name].slot()
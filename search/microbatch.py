@@ -0,0 +1,174 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List
+
+MAX_WAIT_MS = float(os.getenv("MICROBATCH_MAX_WAIT_MS", "3"))
+
+# One forward pass at a time across all models: each pass already uses
+# every intra-op thread, so running two concurrently only oversubscribes cores.
+INFERENCE_LOCK = threading.Lock()
+
+BATCHERS: Dict[str, "MicroBatcher"] = {}
+
+
+class MicroBatcher:
+    """
+    Collects single-item calls from concurrent requests for up to max_wait_ms
+    (or max_batch items), runs one padded batch, and scatters results back.
+
+    batch_fn takes a list of items and returns a list of results in order.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        batch_fn: Callable[[List], List],
+        max_batch: int,
+        max_wait_ms: float = MAX_WAIT_MS,
+        lock: threading.Lock = INFERENCE_LOCK,
+    ):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+        self.max_wait_s = max_wait_ms / 1000
+        self.lock = lock
+
+        self.batches = 0
+        self.items = 0
+        self.total_wait_s = 0.0
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"microbatch-{name}",
+            daemon=True,
+        )
+        self._thread.start()
+
+        BATCHERS[name] = self
+
+    def submit(self, item) -> Future:
+        future = Future()
+        self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    def __call__(self, item):
+        return self.submit(item).result()
+
+    def map(self, items: List) -> List:
+        """
+        All items of one request go in together and may share a batch
+        with other requests' items.
+        """
+        futures = [self.submit(item) for item in items]
+        return [f.result() for f in futures]
+
+    def _collect(self) -> List:
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait_s
+
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    # deadline passed: still take whatever is already queued
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+
+            try:
+                with self.lock:
+                    results = list(self.batch_fn([item for item, _, _ in batch]))
+                for (_, future, _), result in zip(batch, results):
+                    future.set_result(result)
+                # a short result list must not leave callers waiting forever
+                for _, future, _ in batch[len(results):]:
+                    future.set_exception(RuntimeError(
+                        f"{self.name} batch returned {len(results)} results for {len(batch)} items"
+                    ))
+            except Exception as exc:
+                for _, future, _ in batch:
+                    future.set_exception(exc)
+
+            self.batches += 1
+            self.items += len(batch)
+            self.total_wait_s += sum(started - queued for _, _, queued in batch)
+
+    def stats(self) -> Dict:
+        mean_batch = self.items / self.batches if self.batches else 0.0
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch": round(mean_batch, 2),
+            "fill_ratio": round(mean_batch / self.max_batch, 3),
+            "mean_queue_ms": round(1000 * self.total_wait_s / self.items, 2) if self.items else 0.0,
+            "queued": self._queue.qsize(),
+        }
+
+
+def batch_stats() -> Dict:
+    return {name: b.stats() for name, b in BATCHERS.items()}
+
+
+# =========================
+# drop-in wrappers
+# =========================
+
+class BatchedDenseModel:
+    """
+    SentenceTransformer.encode with cross-request batching.
+    """
+
+    def __init__(self, model, max_batch: int = 32):
+        self.model = model
+        # one queue per normalize_embeddings value, so a batch never mixes them
+        self.batchers = {
+            normalize: MicroBatcher(
+                "dense" if normalize else "dense_raw",
+                lambda texts, normalize=normalize: self.model.encode(texts, normalize_embeddings=normalize),
+                max_batch=max_batch,
+            )
+            for normalize in (True, False)
+        }
+
+    def encode(self, sentences, normalize_embeddings: bool = True, **kwargs):
+        batcher = self.batchers[bool(normalize_embeddings)]
+        if isinstance(sentences, str):
+            return batcher(sentences)
+
+        import numpy as np
+
+        sentences = list(sentences)
+        if not sentences:
+            return self.model.encode(sentences, normalize_embeddings=normalize_embeddings)
+
+        return np.stack(batcher.map(sentences))
+
+
+class BatchedReranker:
+    """
+    CrossEncoderReranker.rerank with (query, passage) pairs batched across requests.
+    """
+
+    def __init__(self, reranker, max_batch: int = 64):
+        self.reranker = reranker
+        self.batcher = MicroBatcher(
+            "rerank",
+            reranker.score_pairs,
+            max_batch=max_batch,
+        )
+
+    def rerank(self, query: str, passages: List[str]) -> List[float]:
+        return [float(s) for s in self.batcher.map([(query, p) for p in passages])]
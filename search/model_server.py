@@ -0,0 +1,242 @@
+import argparse
+import os
+import threading
+from contextlib import nullcontext
+from multiprocessing.connection import Listener, Client
+
+from search.deadline import time_left, check_deadline
+
+DEFAULT_SOCKET = "/tmp/regulens-models.sock"
+
+# upper bound for one call when the request has no deadline
+CALL_TIMEOUT_S = float(os.getenv("MODEL_SERVER_TIMEOUT", "30"))
+
+# Shared local-inference sidecar.
+#
+# One process loads MiniLM, SPLADE and the cross-encoder once and serves
+# embed / sparse-encode / rerank calls to every API worker over a Unix socket,
+# with torch threading pinned so several workers do not oversubscribe cores.
+#
+#   export MODEL_SERVER_AUTHKEY=$(python -c "import secrets; print(secrets.token_hex(32))")
+#   python -m search.model_server
+#   MODEL_SERVER_SOCKET=/tmp/regulens-models.sock uvicorn api.main:app --workers 4
+#
+# multiprocessing.connection unpickles what it receives, so the shared key is
+# required (no default) and the socket is only accessible to its owner.
+
+
+def authkey() -> bytes:
+    key = os.getenv("MODEL_SERVER_AUTHKEY")
+    if not key:
+        raise RuntimeError(
+            "MODEL_SERVER_AUTHKEY is not set; use the same random secret for the sidecar and the API workers"
+        )
+    return key.encode("utf-8")
+
+
+# =========================
+# client (API workers)
+# =========================
+
+class ModelServerClient:
+    """
+    One connection per calling thread; reconnects once if the sidecar restarted.
+    """
+
+    def __init__(self, address: str):
+        self.address = address
+        self._authkey = authkey()
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = Client(self.address, family="AF_UNIX", authkey=self._authkey)
+            self._local.conn = conn
+        return conn
+
+    def _drop(self):
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            conn.close()
+
+    def call(self, method: str, *args):
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.send((method, args))
+                # a hung sidecar must not hold the request thread past its deadline
+                timeout = min(CALL_TIMEOUT_S, time_left(CALL_TIMEOUT_S))
+                if not conn.poll(timeout):
+                    # the late reply would otherwise answer the next call
+                    self._drop()
+                    check_deadline(f"model server {method}")
+                    raise TimeoutError(f"model server {method} timed out after {timeout:.1f}s")
+                ok, result = conn.recv()
+                break
+            except (EOFError, ConnectionError, BrokenPipeError):
+                self._drop()
+                if attempt:
+                    raise
+
+        if not ok:
+            raise RuntimeError(f"model server {method} failed: {result}")
+        return result
+
+    def embed(self, texts: list[str], normalize: bool = True):
+        return self.call("embed", texts, normalize)
+
+    def sparse(self, text: str) -> dict:
+        return self.call("sparse", text)
+
+    def rerank(self, query: str, passages: list[str]) -> list[float]:
+        return self.call("rerank", query, passages)
+
+    def stats(self) -> dict:
+        return self.call("stats")
+
+
+class RemoteDenseModel:
+    """
+    Stands in for SentenceTransformer.encode on the worker side.
+    """
+
+    def __init__(self, server: ModelServerClient):
+        self.server = server
+
+    def encode(self, sentences, normalize_embeddings: bool = True, **kwargs):
+        single = isinstance(sentences, str)
+        vectors = self.server.embed([sentences] if single else list(sentences), normalize_embeddings)
+        return vectors[0] if single else vectors
+
+
+class RemoteReranker:
+    """
+    Stands in for ingest.reranker.CrossEncoderReranker on the worker side.
+    """
+
+    def __init__(self, server: ModelServerClient):
+        self.server = server
+
+    def rerank(self, query: str, passages: list[str]) -> list[float]:
+        if not passages:
+            return []
+        return self.server.rerank(query, passages)
+
+
+# =========================
+# server (sidecar process)
+# =========================
+
+def configure_threads(threads: int, cpus: str | None):
+    """
+    Must run before torch is imported.
+    """
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    os.environ["MKL_NUM_THREADS"] = str(threads)
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+
+    if cpus:
+        allowed = set()
+        for part in cpus.split(","):
+            lo, _, hi = part.partition("-")
+            allowed.update(range(int(lo), int(hi or lo) + 1))
+        os.sched_setaffinity(0, allowed)
+
+    import torch
+
+    torch.set_num_threads(threads)
+    torch.set_num_interop_threads(1)
+
+
+class ModelServer:
+    def __init__(self):
+        # the sidecar itself always runs the real models
+        os.environ["USE_LOCAL_MODELS"] = "true"
+        os.environ.pop("MODEL_SERVER_SOCKET", None)
+
+        from search.runtime import get_dense_model, get_cross_encoder_reranker
+        from search.hybrid_search import compute_splade_query
+
+        print("[INFO] Loading models...")
+        self.dense = get_dense_model()
+        self.reranker = get_cross_encoder_reranker()
+        self.compute_splade_query = compute_splade_query
+        self.compute_splade_query("warmup")
+
+        # One forward pass at a time: each already uses every pinned thread.
+        # With micro-batching on, the batchers serialize (and batch) instead.
+        from search.runtime import MICROBATCH_ENABLED
+
+        self._lock = nullcontext() if MICROBATCH_ENABLED else threading.Lock()
+
+    def embed(self, texts, normalize=True):
+        with self._lock:
+            return self.dense.encode(texts, normalize_embeddings=normalize)
+
+    def sparse(self, text):
+        with self._lock:
+            return self.compute_splade_query(text)
+
+    def rerank(self, query, passages):
+        with self._lock:
+            return self.reranker.rerank(query, passages)
+
+    def stats(self):
+        from search.microbatch import batch_stats
+
+        return batch_stats()
+
+    def handle(self, conn):
+        methods = {
+            "embed": self.embed,
+            "sparse": self.sparse,
+            "rerank": self.rerank,
+            "stats": self.stats,
+        }
+
+        with conn:
+            while True:
+                try:
+                    method, args = conn.recv()
+                except (EOFError, ConnectionError):
+                    return
+
+                try:
+                    reply = (True, methods[method](*args))
+                except Exception as exc:
+                    reply = (False, repr(exc))
+
+                try:
+                    conn.send(reply)
+                except (BrokenPipeError, ConnectionError):
+                    # the worker timed out and closed the connection
+                    return
+
+    def serve(self, address: str):
+        if os.path.exists(address):
+            os.unlink(address)
+
+        with Listener(address, family="AF_UNIX", authkey=authkey()) as listener:
+            os.chmod(address, 0o600)
+            print(f"[INFO] Model server listening on {address}")
+            while True:
+                conn = listener.accept()
+                threading.Thread(target=self.handle, args=(conn,), daemon=True).start()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ReguLens local model server")
+    parser.add_argument("--socket", default=os.getenv("MODEL_SERVER_SOCKET", DEFAULT_SOCKET))
+    parser.add_argument("--threads", type=int, default=int(os.getenv("MODEL_SERVER_THREADS", os.cpu_count() or 1)))
+    parser.add_argument("--cpus", default=os.getenv("MODEL_SERVER_CPUS"), help='CPU affinity, e.g. "0-3"')
+    args = parser.parse_args()
+
+    try:
+        authkey()
+    except RuntimeError as exc:
+        raise SystemExit(f"[ERROR] {exc}")
+
+    configure_threads(args.threads, args.cpus)
+    ModelServer().serve(args.socket)
@@ -0,0 +1,53 @@
+import os
+from functools import lru_cache
+from typing import Dict, List
+
+from ingest.near_duplicates import load_canonical_map
+
+# Retrieval-side collapse of near-duplicate hits (ingest/near_duplicates.py):
+# one hit per cluster reaches the prompt, so every context slot is distinct.
+COLLAPSE_DUPLICATES = os.getenv("COLLAPSE_DUPLICATES", "true").lower() == "true"
+
+# extra hits fetched so collapsing still leaves top_k distinct ones
+DUPLICATE_OVERFETCH = int(os.getenv("DUPLICATE_OVERFETCH", "2"))
+
+
+@lru_cache
+def canonical_map() -> Dict[str, str]:
+    return load_canonical_map() if COLLAPSE_DUPLICATES else {}
+
+
+def canonical_id(point) -> str:
+    point_id = str(point.id)
+    payload = point.payload or {}
+    return payload.get("canonical_id") or canonical_map().get(point_id, point_id)
+
+
+def overfetch(top_k: int) -> int:
+    return top_k + DUPLICATE_OVERFETCH if canonical_map() else top_k
+
+
+def collapse_duplicates(points: List, limit: int | None = None) -> List:
+    """
+    Keeps one point per near-duplicate cluster, at the rank of the cluster's
+    best hit. The canonical chunk is kept when it was retrieved too, since
+    it carries the most text.
+    """
+    if not canonical_map():
+        return points[:limit]
+
+    best = {}
+    for p in points:
+        key = canonical_id(p)
+        if key not in best or str(p.id) == key:
+            best[key] = p
+
+    kept = []
+    seen = set()
+    for p in points:
+        key = canonical_id(p)
+        if key not in seen:
+            seen.add(key)
+            kept.append(best[key])
+
+    return kept[:limit]
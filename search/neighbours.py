@@ -0,0 +1,111 @@
+import json
+import os
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from ingest.adjacency_index import OUTPUT_FILE as ADJACENCY_PATH
+from search.text_store import load_text_store
+
+# Neighbour expansion: a hit cut mid-argument is widened with the chunks
+# before and after it in its section, looked up in the local adjacency
+# index (ingest/adjacency_index.py) instead of issuing another search.
+#
+# NEIGHBOUR_TOKEN_BUDGET  extra context tokens shared by all hits (0 = off)
+# NEIGHBOUR_WINDOW        how many chunks to reach on each side of a hit
+NEIGHBOUR_TOKEN_BUDGET = int(os.getenv("NEIGHBOUR_TOKEN_BUDGET", "0"))
+NEIGHBOUR_WINDOW = int(os.getenv("NEIGHBOUR_WINDOW", "1"))
+
+
+class AdjacencyIndex:
+    def __init__(self, runs: List[Dict]):
+        # (document_id, section_id) -> run; chunk_index is the position in the run
+        self.runs = {(run["document_id"], run["section_id"]): run for run in runs}
+
+    def neighbour(self, payload: Dict, offset: int) -> Tuple[str, int] | None:
+        """
+        (point id, tokens) of the chunk `offset` places away in the same section.
+        """
+        run = self.runs.get((payload.get("document_id"), payload.get("section_id")))
+        index = payload.get("chunk_index")
+        if run is None or index is None:
+            return None
+
+        position = index + offset
+        if not 0 <= position < len(run["ids"]):
+            return None
+        return run["ids"][position], run["tokens"][position]
+
+
+@lru_cache
+def load_adjacency_index() -> AdjacencyIndex | None:
+    if not ADJACENCY_PATH.exists():
+        return None
+    with open(ADJACENCY_PATH, "r", encoding="utf-8") as f:
+        return AdjacencyIndex(json.load(f)["runs"])
+
+
+def stitch(texts: List[str]) -> str:
+    """
+    Joins consecutive chunks, dropping the paragraphs each chunk repeats
+    from the previous one (semantic_chunk.OVERLAP_PARAGRAPHS).
+    """
+    paragraphs = []
+    for text in texts:
+        paras = [p.strip() for p in text.split("\n\n") if p.strip()]
+        overlap = next(
+            (k for k in range(min(len(paragraphs), len(paras)), 0, -1) if paragraphs[-k:] == paras[:k]),
+            0,
+        )
+        paragraphs.extend(paras[overlap:])
+    return "\n\n".join(paragraphs)
+
+
+def expanded_texts(
+    points: List,
+    token_budget: int = NEIGHBOUR_TOKEN_BUDGET,
+    window: int = NEIGHBOUR_WINDOW,
+) -> List[str]:
+    """
+    Text for each (hydrated) point, widened with its neighbours.
+
+    The budget is spent nearest-first and in rank order: every hit gets its
+    immediate neighbours before any hit reaches further. A side stops growing
+    at a chunk that is already in the context, so each chunk appears once.
+    Payloads are left untouched (points may be shared with the retrieval cache).
+    """
+    texts = [p.payload.get("text", "").strip() for p in points]
+
+    index = load_adjacency_index() if token_budget > 0 else None
+    if index is None:
+        return texts
+
+    used = {str(p.id) for p in points}
+    before = [[] for _ in points]
+    after = [[] for _ in points]
+    open_sides = {(i, side) for i in range(len(points)) for side in (-1, 1)}
+    budget = token_budget
+
+    for distance in range(1, window + 1):
+        for i, p in enumerate(points):
+            for side in (-1, 1):
+                if (i, side) not in open_sides:
+                    continue
+
+                found = index.neighbour(p.payload, side * distance)
+                if found is None or found[0] in used or found[1] > budget:
+                    open_sides.discard((i, side))
+                    continue
+
+                point_id, tokens = found
+                used.add(point_id)
+                budget -= tokens
+                (before if side < 0 else after)[i].append(point_id)
+
+    store = load_text_store()
+    for i, text in enumerate(texts):
+        if not text or not (before[i] or after[i]):
+            continue
+        ids = [*reversed(before[i]), None, *after[i]]
+        texts[i] = stitch([text if pid is None else store.get(pid, {}).get("text", "") for pid in ids])
+
+    return texts
@@ -0,0 +1,204 @@
+import argparse
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from search.query_log import QUERY_LOG_PATH, iter_query_log
+from search.filters import as_values
+
+# Replays the query log (search/query_log.py) to
+#   - pre-warm the embedding / retrieval caches at deploy time
+#     (caches are per process: the API does this itself with PREWARM_ON_START=true;
+#     the CLI run only warms Qdrant / HF-side caches and checks the log)
+#   - optionally the answer cache too (PREWARM_ANSWERS / --answers): one Groq
+#     generation per question, paced and yielding to user requests
+#   - simulate LRU hit rates for candidate cache sizes
+#
+#   python -m search.prewarm --top 200
+#   python -m search.prewarm --top 50 --answers
+#   python -m search.prewarm --simulate 128 512 2048
+
+PREWARM_ON_START = os.getenv("PREWARM_ON_START", "false").lower() == "true"
+PREWARM_TOP_N = int(os.getenv("PREWARM_TOP_N", "200"))
+
+# Answer warming competes with users for the Groq limiter and costs one
+# generation per question per worker, so it is opt-in and paced.
+PREWARM_ANSWERS = os.getenv("PREWARM_ANSWERS", "false").lower() == "true"
+PREWARM_ANSWER_INTERVAL_S = float(os.getenv("PREWARM_ANSWER_INTERVAL_S", "2.0"))
+GROQ_IDLE_POLL_S = 0.5
+
+# only the most recent entries count; older traffic may predate a reindex
+RECENT_ENTRIES = 50_000
+
+DEFAULT_SIZES = [64, 256, 1024, 4096]
+
+
+def load_entries(path: Path = QUERY_LOG_PATH, recent: int = RECENT_ENTRIES) -> List[Dict]:
+    entries = list(iter_query_log(path))
+    return entries[-recent:]
+
+
+def request_key(entry: Dict) -> Tuple:
+    """
+    (kind, query, versions, document_ids, section): what the retrieval and
+    answer caches key on. kind is "comparison" for /comparison-analysis.
+    """
+    return (
+        "comparison" if entry.get("path") == "comparison" else "answer",
+        entry["query"],
+        as_values(entry.get("version")),
+        as_values(entry.get("document_ids")),
+        entry.get("section"),
+    )
+
+
+def hottest_questions(entries: List[Dict], top_n: int) -> List[Tuple[Tuple, int]]:
+    counts = Counter(request_key(e) for e in entries if e.get("query"))
+    return counts.most_common(top_n)
+
+
+def wait_for_idle_groq():
+    """
+    Holds an answer warm-up back while user requests are using or queued on Groq.
+    """
+    from search.limits import LIMITERS
+
+    groq = LIMITERS["groq"]
+    while groq.active or groq.waiting:
+        time.sleep(GROQ_IDLE_POLL_S)
+
+
+def prewarm(top_n: int = PREWARM_TOP_N, answers: bool = False, path: Path = QUERY_LOG_PATH) -> Dict:
+    """
+    Runs the hottest logged questions through the fast path: embeddings and
+    retrieval only, unless answers=True (then paced Groq generations).
+    """
+    from search.rag_answer_fast import answer_query_fast, answer_comparison_fast, fast_path_hits
+    from search.service import section_ids_for
+    from search.version_pairs import final_rule_hits
+
+    hot = hottest_questions(load_entries(path), top_n)
+
+    warmed = 0
+    failed = 0
+    for (kind, query, versions, document_ids, section), _ in hot:
+        try:
+            section_ids = section_ids_for(section, versions)
+            if kind == "comparison":
+                if answers:
+                    wait_for_idle_groq()
+                    answer_comparison_fast(query=query)
+                else:
+                    final_rule_hits(query)
+            elif answers:
+                wait_for_idle_groq()
+                answer_query_fast(
+                    query=query,
+                    version_filter=versions,
+                    document_filter=document_ids,
+                    section_filter=section_ids,
+                )
+            else:
+                fast_path_hits(
+                    query=query,
+                    version_filter=versions,
+                    document_filter=document_ids,
+                    section_filter=section_ids,
+                )
+            warmed += 1
+        except Exception as exc:
+            failed += 1
+            print(f"[WARN] Pre-warm failed for {query!r}: {exc}")
+
+        if answers:
+            time.sleep(PREWARM_ANSWER_INTERVAL_S)
+
+    return {"questions": len(hot), "warmed": warmed, "failed": failed}
+
+
+def prewarm_in_background(top_n: int = PREWARM_TOP_N, answers: bool = False):
+    """
+    For app startup (and index swaps): warm without delaying readiness.
+    """
+    thread = threading.Thread(
+        target=prewarm,
+        kwargs={"top_n": top_n, "answers": answers},
+        name="cache-prewarm",
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+# =========================
+# hit-rate simulation
+# =========================
+
+def simulate_lru(keys: List, size: int) -> float:
+    cache = OrderedDict()
+    hits = 0
+
+    for key in keys:
+        if key in cache:
+            hits += 1
+            cache.move_to_end(key)
+        else:
+            cache[key] = True
+            if len(cache) > size:
+                cache.popitem(last=False)
+
+    return hits / len(keys) if keys else 0.0
+
+
+def simulate(entries: List[Dict], sizes: List[int]) -> List[Dict]:
+    # embeddings are version-independent; retrieval and answers are not
+    streams = {
+        "embedding": [e["query"] for e in entries],
+        "retrieval": [request_key(e) for e in entries],
+        "answer": [request_key(e) for e in entries],
+    }
+
+    return [
+        {
+            "size": size,
+            **{name: simulate_lru(keys, size) for name, keys in streams.items()},
+        }
+        for size in sizes
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query log replay: cache pre-warm and sizing")
+    parser.add_argument("--log", type=Path, default=QUERY_LOG_PATH)
+    parser.add_argument("--top", type=int, default=PREWARM_TOP_N, help="questions to pre-warm")
+    parser.add_argument("--answers", action="store_true", help="also warm answers (paced Groq generations)")
+    parser.add_argument("--simulate", type=int, nargs="*", help="cache sizes to simulate (no warming)")
+    args = parser.parse_args()
+
+    entries = load_entries(args.log)
+    unique = len({request_key(e) for e in entries})
+    print(f"[INFO] {len(entries)} logged queries, {unique} distinct")
+
+    if args.simulate is not None:
+        rows = simulate(entries, args.simulate or DEFAULT_SIZES)
+        print(f"\n{'size':>8s} {'embedding':>10s} {'retrieval':>10s} {'answer':>10s}")
+        for r in rows:
+            print(f"{r['size']:8d} {r['embedding']:10.3f} {r['retrieval']:10.3f} {r['answer']:10.3f}")
+
+        print("\n[INFO] Top questions:")
+        for (kind, query, versions, _, section), n in hottest_questions(entries, 10):
+            scope = "comparison" if kind == "comparison" else ",".join(versions) or "all"
+            if section:
+                scope += f" §{section}"
+            print(f"{n:6d}  [{scope}] {query}")
+        return
+
+    summary = prewarm(args.top, answers=args.answers, path=args.log)
+    print(f"[SUCCESS] Pre-warmed {summary['warmed']}/{summary['questions']} questions ({summary['failed']} failed)")
+
+
+if __name__ == "__main__":
+    main()
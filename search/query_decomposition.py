@@ -1,9 +1,5 @@
 from typing import List
-from groq import Groq
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
+from search.generation import generate
 
 
 DECOMPOSITION_SYSTEM_PROMPT = """
@@ -61,22 +57,20 @@ Now decompose the following user question.
 
 
 class QueryDecomposer:
-    def __init__(self):
-        self.client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-        self.model = "llama-3.3-70b-versatile"
+    # planning is a small-tier task (search/generation.py)
+    task = "decompose"
 
     def decompose(self, query: str) -> List[str]:
-        completion = self.client.chat.completions.create(
-            model=self.model,
-            temperature=0.0,
-            messages=[
+        raw_output, _ = generate(
+            self.task,
+            [
                 {"role": "system", "content": DECOMPOSITION_SYSTEM_PROMPT},
                 {"role": "user", "content": query},
             ],
+            temperature=0.0,
+            stage="decompose",
         )
 
-        raw_output = completion.choices[0].message.content.strip()
-
         sub_queries = []
         for line in raw_output.splitlines():
             line = line.strip()
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator
+
+from search.cache import normalize_query
+from search.filters import as_values
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+# Append-only JSONL log of answered questions, written by a background
+# thread so the request path only pays for a queue put.
+QUERY_LOG_ENABLED = os.getenv("QUERY_LOG", "true").lower() == "true"
+QUERY_LOG_PATH = Path(os.getenv("QUERY_LOG_PATH", BASE_DIR / "data" / "logs" / "queries.jsonl"))
+
+# entries buffered before new ones are dropped (never block a request)
+QUERY_LOG_QUEUE = int(os.getenv("QUERY_LOG_QUEUE", "10000"))
+FLUSH_EVERY_S = 1.0
+
+
+def answer_hash(answer: str) -> str:
+    return hashlib.sha1(answer.encode("utf-8")).hexdigest()[:16]
+
+
+class QueryLog:
+    def __init__(self, path: Path = QUERY_LOG_PATH, maxsize: int = QUERY_LOG_QUEUE):
+        self.path = path
+        self.written = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_writer(self):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="query-log", daemon=True)
+                    self._thread.start()
+
+    def record(self, entry: Dict):
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def log_answer(
+        self,
+        query: str,
+        version,
+        path: str,
+        result: Dict,
+        trace: Dict,
+        document_ids=None,
+        section: str | None = None,
+    ):
+        versions = as_values(version)
+        self.record({
+            "ts": round(time.time(), 3),
+            "query": normalize_query(query),
+            # a single version stays a plain string, as before
+            "version": versions[0] if len(versions) == 1 else (list(versions) or None),
+            "document_ids": list(as_values(document_ids)) or None,
+            "section": section,
+            "path": path,
+            "model_tier": trace.get("model_tier"),
+            "chunk_ids": trace.get("chunk_ids", []),
+            "cache": trace.get("cache"),
+            "timings_ms": trace.get("timings_ms", {}),
+            "answer_hash": answer_hash(result.get("answer", "")),
+        })
+
+    def _run(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                entry = self._queue.get()
+                last_flush = time.monotonic()
+
+                # drain whatever else is queued, then flush once
+                while entry is not None:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                    self.written += 1
+                    if time.monotonic() - last_flush > FLUSH_EVERY_S:
+                        break
+                    try:
+                        entry = self._queue.get_nowait()
+                    except queue.Empty:
+                        entry = None
+
+                f.flush()
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": QUERY_LOG_ENABLED,
+            "written": self.written,
+            "dropped": self.dropped,
+            "queued": self._queue.qsize(),
+        }
+
+
+query_log = QueryLog()
+
+
+def log_answer(query: str, version, path: str, result: Dict, trace: Dict, document_ids=None, section=None):
+    if QUERY_LOG_ENABLED:
+        query_log.log_answer(query, version, path, result, trace, document_ids, section)
+
+
+def iter_query_log(path: Path = QUERY_LOG_PATH) -> Iterator[Dict]:
+    """
+    Entries in write order; a torn last line (crash mid-write) is skipped.
+    """
+    if not path.exists():
+        return
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
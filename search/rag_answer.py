@@ -1,106 +1,45 @@
-import os
-import sys
-
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-sys.path.append(PROJECT_ROOT)
-
-from typing import List, Dict
-from dotenv import load_dotenv
-
-from groq import Groq
+from typing import Dict
 
 from search.hybrid_search import hybrid_search
 from search.global_rerank import global_rerank
 
-from search.runtime import get_decomposer, get_llm_client
-
-
-MODEL_NAME = "llama-3.3-70b-versatile"
-
-load_dotenv()
-
-# prompt template
-
-SYSTEM_PROMPT = """
-    You are an expert assistant specializing in U.S. SEC regulations and
-    financial disclosure requirements.
-
-    You answer questions strictly using the provided regulatory context from:
-    - The 2022 SEC Climate-Related Disclosure Proposed Rule
-    - The 2024 SEC Climate-Related Disclosure Final Rule
-
-    You must NOT rely on external knowledge or make assumptions beyond the context.
-
-    Behavior rules:
-    - If the user greets you (e.g., "hi", "hello"), respond politely and briefly.
-    - If the user asks a question unrelated to SEC climate-related disclosure
-    regulations, clearly state that you can only answer questions within this scope.
-    - If the provided context is insufficient to answer the question, explicitly say so.
-
-    Answering guidelines:
-    - Prefer the 2024 Final Rule over the 2022 Proposed Rule when both are available.
-    - You may combine information across sections or documents to improve coherence.
-    - Do not introduce new interpretations or policy opinions.
-    - Maintain a neutral, professional, compliance-safe tone suitable for legal,
-    regulatory, or investor-facing analysis.
-    - When helpful, you may briefly indicate whether an explanation reflects the
-    SEC’s proposed (2022) or final (2024) position, without formal citations.
-    - When the question asks for differences or changes, explicitly compare the 2022 Proposed Rule and the 2024 Final Rule.
-"""
-
-
-def build_user_prompt(query: str, contexts: List[Dict]) -> str:
-    """
-    Build the user prompt with retrieved context.
-    """
-
-    context_blocks = []
-
-    for i, ctx in enumerate(contexts, start=1):
-        block = f"""
-            [Context {i}]
-            Document: {ctx['doc']}
-            Version: {ctx['version']}
-            Section: {ctx['section']}
-            Text:
-            {ctx['text']}
-    """
-        context_blocks.append(block.strip())
-
-    context_str = "\n\n".join(context_blocks)
-
-    user_prompt = f"""
-        Answer the following question using ONLY the context below.
-
-        Question:
-        {query}
-
-        Context:
-        {context_str}
-
-        Answer:
-    """
-
-    return user_prompt.strip()
-
+from search.runtime import get_decomposer
+from search.prompts import SYSTEM_PROMPT, build_user_prompt
+from search.generation import generate, answer_trivial, is_trivial
+from search.deadline import check_deadline, annotate
+from search.neighbours import expanded_texts
+from search.near_duplicates import collapse_duplicates
+from search.filters import FilterValues
+from ingest.registry import preference_key
 
 # main rag function
 def answer_query(
     query: str,
     top_k: int = 8,
     rerank_k: int = 2,
-    version_filter: str | None = None,
+    version_filter: FilterValues = None,
     decompose: bool = True,
-    global_rerank_enabled: bool = True
+    global_rerank_enabled: bool = True,
+    use_sparse: bool = True,
+    rerank: bool = True,
+    document_filter: FilterValues = None,
+    section_filter: FilterValues = None,
 ) -> Dict:
     """
     End-to-end RAG answer generation.
+
+    use_sparse / rerank are passed through to hybrid_search; rerank=False
+    also skips the global rerank. Stage boundaries check the request
+    deadline (search/deadline.py), if one is set.
     """
-    
+    if is_trivial(query):
+        return answer_trivial(query)
+
     # decompose query
     queries = [query]
 
     if decompose:
+        check_deadline("decompose")
         decomposer = get_decomposer()
         queries = decomposer.decompose(query)
 
@@ -112,7 +51,11 @@ def answer_query(
             query=q,
             top_k=top_k,
             rerank_k=rerank_k,
-            version_filter=version_filter
+            version_filter=version_filter,
+            document_filter=document_filter,
+            section_filter=section_filter,
+            use_sparse=use_sparse,
+            rerank=rerank,
         )
         all_results.extend(retrieved)
 
@@ -124,13 +67,19 @@ def answer_query(
             seen_ids.add(r.id)
             results.append(r)
 
+    # and one hit per near-duplicate cluster (ingest/near_duplicates.py)
+    results = collapse_duplicates(results)
+
     if not results:
         return {
             "answer": "The provided documents do not contain sufficient information to answer this question.",
             "sources": []
         }
+
+    annotate("chunk_ids", [str(r.id) for r in results])
         
-    if global_rerank_enabled and len(results) > 1:
+    if global_rerank_enabled and rerank and len(results) > 1:
+        check_deadline("global_rerank")
         results = global_rerank(
             query=query,          
             candidates=results,
@@ -141,10 +90,10 @@ def answer_query(
     contexts = []
     sources = []
 
-    for r in results:
+    # hits widened with their neighbouring chunks, within NEIGHBOUR_TOKEN_BUDGET
+    for r, text in zip(results, expanded_texts(results)):
         payload = r.payload
-        
-        text = payload.get("text", "").strip()
+
         if not text:
             continue
 
@@ -167,28 +116,25 @@ def answer_query(
             "sources": []
         }
         
-    # Prefer Final Rule context first
+    # Prefer the newest release, final over proposed (data/documents.json)
     contexts.sort(
-        key=lambda c: (c["version"] == "2024"),
+        key=lambda c: preference_key(c["version"]),
         reverse=True
     )
 
     user_prompt = build_user_prompt(query, contexts)
 
-    # Call Groq LLM
-    client = get_llm_client()
-    
-    completion = client.chat.completions.create(
-        model = MODEL_NAME,
-        temperature = 0.2,
-        messages = [
+    # Call Groq LLM (model tier chosen by search/generation.py)
+    check_deadline("generate")
+
+    answer, _ = generate(
+        "answer",
+        [
             {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": user_prompt}
-        ]
+        ],
     )
 
-    answer = completion.choices[0].message.content.strip()
-
     # 5. Return structured response
     return {
         "answer": answer,
@@ -1,24 +1,80 @@
-from typing import Dict
+import os
+from typing import Dict, List
 from search.fast_dense_search import fast_dense_search
-from search.rag_answer import build_user_prompt, SYSTEM_PROMPT
-from search.runtime import get_llm_client
-
-MODEL_NAME = "llama-3.3-70b-versatile"
+from search.version_pairs import aligned_pair_search
+from search.prompts import build_user_prompt, SYSTEM_PROMPT
+from search.text_store import hydrate
+from search.generation import generate, answer_trivial, is_trivial, TASK_TIERS
+from search.deadline import check_deadline, annotate
+from search.cache import answer_cache, normalize_query
+from search.neighbours import expanded_texts
+from search.near_duplicates import collapse_duplicates, overfetch
+from search.filters import FilterValues, as_values
+from ingest.registry import preference_key
+
+# dense + inference-free sparse (IDF) fusion on the fast path;
+# needs data/sparse/query_weights.json
+FAST_SPARSE = os.getenv("FAST_SPARSE", "false").lower() == "true"
+
+# hits that reach the prompt
+ANSWER_TOP_K = 5
+
+
+def fast_path_hits(
+    query: str,
+    version_filter: FilterValues = None,
+    document_filter: FilterValues = None,
+    section_filter: FilterValues = None,
+) -> List:
+    """
+    Retrieval step of answer_query_fast, before duplicate collapse.
+    The pre-warm calls it too, so both land on the same retrieval-cache key.
+    """
+    return fast_dense_search(
+        query=query,
+        version_filter=version_filter,
+        document_filter=document_filter,
+        section_filter=section_filter,
+        top_k=overfetch(ANSWER_TOP_K),
+        use_sparse=FAST_SPARSE,
+    )
 
 
 def answer_query_fast(
     query: str,
-    version_filter: str | None = None
+    version_filter: FilterValues = None,
+    document_filter: FilterValues = None,
+    section_filter: FilterValues = None,
 ) -> Dict:
     """
     Fast, production-safe RAG path.
+    Generated answers are cached per normalized question and filters.
     """
-
-    results = fast_dense_search(
-        query=query,
-        version_filter=version_filter,
-        top_k=5
+    if is_trivial(query):
+        return answer_trivial(query)
+
+    cache_key = (
+        normalize_query(query),
+        as_values(version_filter),
+        as_values(document_filter),
+        as_values(section_filter),
+        FAST_SPARSE,
     )
+    cached = answer_cache.get(cache_key)
+    if cached is not None:
+        result, chunk_ids = cached
+        annotate("cache", "answer")
+        annotate("chunk_ids", chunk_ids)
+        return dict(result)
+
+    results = fast_path_hits(query, version_filter, document_filter, section_filter)
+    # one hit per near-duplicate cluster (ingest/near_duplicates.py)
+    results = collapse_duplicates(results, limit=ANSWER_TOP_K)
+
+    chunk_ids = [str(r.id) for r in results]
+    annotate("chunk_ids", chunk_ids)
+
+    results = hydrate(results)
 
     if not results:
         return {
@@ -29,9 +85,9 @@ def answer_query_fast(
     contexts = []
     sources = []
 
-    for r in results:
+    # hits widened with their neighbouring chunks, within NEIGHBOUR_TOKEN_BUDGET
+    for r, text in zip(results, expanded_texts(results)):
         payload = r.payload
-        text = payload.get("text", "").strip()
 
         if not text:
             continue
@@ -55,26 +111,107 @@ def answer_query_fast(
             "sources": []
         }
 
-    # Prefer final rule
+    # Prefer the newest release, final over proposed (data/documents.json)
     contexts.sort(
-        key=lambda c: (c["version"] == "2024_final"),
+        key=lambda c: preference_key(c["version"]),
         reverse=True
     )
 
     user_prompt = build_user_prompt(query, contexts)
 
-    client = get_llm_client()
+    check_deadline("generate")
 
-    completion = client.chat.completions.create(
-        model=MODEL_NAME,
-        temperature=0.2,
-        messages=[
+    answer, tier = generate(
+        "answer",
+        [
             {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": user_prompt}
-        ]
+        ],
     )
 
-    return {
-        "answer": completion.choices[0].message.content.strip(),
+    result = {
+        "answer": answer,
         "sources": sources
     }
+    # answers from a rate-limit fallback tier are not cached
+    if tier == TASK_TIERS["answer"]:
+        answer_cache.put(cache_key, (result, chunk_ids))
+
+    return dict(result)
+
+
+def answer_comparison_fast(query: str) -> Dict:
+    """
+    Comparison path: final-rule hits paired with their precomputed
+    proposed-rule counterparts, instead of decomposition + two retrievals.
+    """
+    cache_key = ("compare", normalize_query(query))
+    cached = answer_cache.get(cache_key)
+    if cached is not None:
+        result, chunk_ids = cached
+        annotate("cache", "answer")
+        annotate("chunk_ids", chunk_ids)
+        return dict(result)
+
+    pairs = aligned_pair_search(query=query)
+
+    contexts = []
+    sources = []
+    seen_ids = set()
+    chunk_ids = []
+
+    for pair in pairs:
+        for r in [pair["final"], *pair["proposed"]]:
+            if r.id in seen_ids:
+                continue
+            seen_ids.add(r.id)
+            chunk_ids.append(str(r.id))
+
+            payload = r.payload
+            text = payload.get("text", "").strip()
+
+            if not text:
+                continue
+
+            contexts.append({
+                "doc": payload.get("document_id"),
+                "version": payload.get("version"),
+                "section": payload.get("section_id"),
+                "text": text
+            })
+
+            sources.append({
+                "doc": payload.get("document_id"),
+                "version": payload.get("version"),
+                "section": payload.get("section_id")
+            })
+
+    annotate("chunk_ids", chunk_ids)
+
+    if not contexts:
+        return {
+            "answer": "The provided documents do not contain sufficient information to answer this question.",
+            "sources": []
+        }
+
+    user_prompt = build_user_prompt(query, contexts)
+
+    check_deadline("generate")
+
+    answer, tier = generate(
+        "compare",
+        [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ],
+    )
+
+    result = {
+        "answer": answer,
+        "sources": sources
+    }
+    # answers from a rate-limit fallback tier are not cached
+    if tier == TASK_TIERS["compare"]:
+        answer_cache.put(cache_key, (result, chunk_ids))
+
+    return dict(result)
@@ -1,20 +1,41 @@
 import os
-from huggingface_hub import InferenceClient
-from dotenv import load_dotenv
+from functools import lru_cache
+from search.runtime import load_env_file
+from search.limits import backend_slot
+from search.deadline import timed
+from search.cache import embedding_cache, embedding_key
 
-load_dotenv()
+MODEL_ID = "sentence-transformers/all-MiniLM-L6-v2"
 
-HF_TOKEN = os.getenv("HF_API_TOKEN")
 
-if not HF_TOKEN:
-    raise RuntimeError("HF_API_TOKEN not set")
+@lru_cache
+def get_hf_client():
+    """
+    Built on first use, so importing the API does not load huggingface_hub.
+    """
+    from search.backends import wrap_backend
 
-client = InferenceClient(
-    provider="hf-inference",
-    api_key=HF_TOKEN,
-)
+    return wrap_backend("hf", live_hf_client, fake_hf_client)
 
-MODEL_ID = "sentence-transformers/all-MiniLM-L6-v2"
+
+def live_hf_client():
+    from huggingface_hub import InferenceClient
+
+    load_env_file()
+    token = os.getenv("HF_API_TOKEN")
+    if not token:
+        raise RuntimeError("HF_API_TOKEN not set")
+
+    return InferenceClient(
+        provider="hf-inference",
+        api_key=token,
+    )
+
+
+def fake_hf_client(latency):
+    from search.fake_backends import FakeInferenceClient
+
+    return FakeInferenceClient(latency)
 
 
 def embed_query(text: str) -> list[float]:
@@ -22,10 +43,16 @@ def embed_query(text: str) -> list[float]:
     Generate embedding using HuggingFace Inference API.
     Returns 384-dim vector compatible with Qdrant.
     """
-
-    embedding = client.feature_extraction(
-        text,
-        model=MODEL_ID,
-    )
-
+    key = embedding_key(text)
+    embedding = embedding_cache.get(key)
+    if embedding is not None:
+        return embedding
+
+    with backend_slot("hf"), timed("embed"):
+        embedding = get_hf_client().feature_extraction(
+            text,
+            model=MODEL_ID,
+        )
+
+    embedding_cache.put(key, embedding)
     return embedding
@@ -0,0 +1,164 @@
+import os
+from dataclasses import dataclass, asdict, field
+from typing import Dict, List
+
+from search.deadline import Deadline, deadline_scope, latency
+from search.limits import LIMITERS
+from search.runtime import USE_LOCAL_MODELS
+from search.sparse_query import SPARSE_QUERY_ENCODER
+
+# Budget-aware routing between the fast (dense-only) and full
+# (decompose + hybrid + rerank) pipelines, using live stage latencies.
+
+DEFAULT_BUDGET_MS = int(os.getenv("ROUTER_DEFAULT_BUDGET_MS", "4000"))
+
+# 1-minute load per core above which SPLADE is dropped
+CPU_PRESSURE = float(os.getenv("ROUTER_CPU_PRESSURE", "0.85"))
+
+# Groq calls already queued beyond this skip the extra decomposition call
+GROQ_BACKLOG = int(os.getenv("ROUTER_GROQ_BACKLOG", "1"))
+
+# keep some of the budget back for network jitter / serialization
+SAFETY_MARGIN = 0.85
+
+# sub-queries the decomposer usually returns
+EXPECTED_SUB_QUERIES = 3
+
+
+@dataclass
+class RoutePlan:
+    path: str                   # "full" | "fast"
+    decompose: bool = False
+    sparse: bool = False
+    rerank: bool = False
+    estimate_ms: float = 0.0
+    reasons: List[str] = field(default_factory=list)
+
+
+def cpu_pressure() -> float:
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except OSError:
+        return 0.0
+
+
+def _groq_wait_s() -> float:
+    groq = LIMITERS["groq"]
+    backlog = (groq.active + groq.waiting) / max(1, groq.concurrency)
+    return groq.avg_hold_s * backlog
+
+
+def _retrieval_s(queries: int, sparse: bool, rerank: bool) -> float:
+    per_query = latency.estimate("embed") + latency.estimate("search")
+    if sparse:
+        per_query += latency.estimate("splade")
+    if rerank:
+        per_query += latency.estimate("rerank")
+    total = queries * per_query
+    if rerank and queries > 1:
+        # global rerank over the merged candidates
+        total += latency.estimate("rerank")
+    return total
+
+
+def plan_route(budget_s: float) -> RoutePlan:
+    """
+    Start from the full pipeline and drop stages, most expensive first,
+    until the estimated latency fits the budget.
+    """
+    usable = budget_s * SAFETY_MARGIN
+    reasons = []
+
+    generate_s = latency.estimate("generate") + _groq_wait_s()
+
+    if not USE_LOCAL_MODELS:
+        estimate = latency.estimate("embed") + latency.estimate("search") + generate_s
+        return RoutePlan("fast", estimate_ms=1000 * estimate, reasons=["local models disabled"])
+
+    decompose = True
+    sparse = True
+    rerank = True
+
+    if LIMITERS["groq"].waiting >= GROQ_BACKLOG:
+        decompose = False
+        reasons.append("groq backlog")
+
+    # only SPLADE runs a model; the idf encoder is a dictionary lookup
+    if SPARSE_QUERY_ENCODER == "splade" and cpu_pressure() > CPU_PRESSURE:
+        sparse = False
+        reasons.append("cpu pressure")
+
+    def estimate() -> float:
+        queries = EXPECTED_SUB_QUERIES if decompose else 1
+        decompose_s = latency.estimate("decompose") + _groq_wait_s() if decompose else 0.0
+        return decompose_s + _retrieval_s(queries, sparse, rerank) + generate_s
+
+    for stage in ("decompose", "sparse", "rerank"):
+        if estimate() <= usable:
+            break
+        if stage == "decompose" and decompose:
+            decompose = False
+            reasons.append("budget: decompose")
+        elif stage == "sparse" and sparse:
+            sparse = False
+            reasons.append("budget: splade")
+        elif stage == "rerank" and rerank:
+            rerank = False
+            reasons.append("budget: rerank")
+
+    if estimate() > usable:
+        fast_s = latency.estimate("embed") + latency.estimate("search") + generate_s
+        reasons.append("budget: fast path")
+        return RoutePlan("fast", estimate_ms=1000 * fast_s, reasons=reasons)
+
+    return RoutePlan(
+        "full",
+        decompose=decompose,
+        sparse=sparse,
+        rerank=rerank,
+        estimate_ms=1000 * estimate(),
+        reasons=reasons,
+    )
+
+
+def answer_with_budget(
+    query: str,
+    version=None,
+    budget_ms: int | None = None,
+    document_ids=None,
+    section_ids=None,
+) -> Dict:
+    """
+    Plan a route for the budget, then run it under a request deadline.
+    Every stage checks the deadline and client timeouts are capped by it,
+    so an over-budget request stops with DeadlineExceeded instead of running on.
+    """
+    from search.rag_answer import answer_query
+    from search.rag_answer_fast import answer_query_fast
+
+    budget_s = (budget_ms or DEFAULT_BUDGET_MS) / 1000
+    deadline = Deadline(budget_s)
+    plan = plan_route(budget_s)
+
+    with deadline_scope(deadline):
+        if plan.path == "full":
+            result = answer_query(
+                query=query,
+                version_filter=version,
+                document_filter=document_ids,
+                section_filter=section_ids,
+                decompose=plan.decompose,
+                use_sparse=plan.sparse,
+                rerank=plan.rerank,
+                global_rerank_enabled=plan.rerank,
+            )
+        else:
+            result = answer_query_fast(
+                query=query,
+                version_filter=version,
+                document_filter=document_ids,
+                section_filter=section_ids,
+            )
+
+    result["route"] = asdict(plan)
+    return result
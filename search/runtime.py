@@ -1,15 +1,70 @@
 from functools import lru_cache
 import os
 
+
+def load_env_file():
+    # Hosted deploys set env vars directly; only import python-dotenv
+    # when there is a .env file to read.
+    if os.path.exists(".env"):
+        from dotenv import load_dotenv
+
+        load_dotenv()
+
+
+load_env_file()
+
 USE_LOCAL_MODELS = os.getenv("USE_LOCAL_MODELS", "false").lower() == "true"
 
+# When set, local models live in the shared sidecar (search/model_server.py)
+# instead of being loaded by every worker process.
+MODEL_SERVER_SOCKET = os.getenv("MODEL_SERVER_SOCKET")
+
+# Batch encoder / reranker calls across concurrent requests (search/microbatch.py)
+MICROBATCH_ENABLED = os.getenv("MICROBATCH", "true").lower() == "true"
+
+# Name every search module queries: an alias onto a versioned collection
+# after a blue/green reindex (ingest/reindex.py), resolved by Qdrant per request.
+COLLECTION_NAME = os.getenv("QDRANT_COLLECTION", "regulens")
+
+# Collection the in-process indexes (data/vectors/<collection>/) are loaded
+# for: the alias target, kept current by the index watcher (search/index_swap.py).
+# None until the first poll; readers then use the most recently built one.
+_local_collection = None
+
+
+def local_collection() -> str | None:
+    return _local_collection
+
+
+def set_local_collection(name: str | None):
+    global _local_collection
+    _local_collection = name
+
+
+# BACKENDS="groq=replay,hf=replay,qdrant=fake" swaps the remote clients for
+# record / replay / in-process stand-ins (search/backends.py); live by default.
+
 
 # -------------------------
 # Lightweight / always-on
 # -------------------------
 
-@lru_cache
-def get_qdrant():
+def preload_serving_clients():
+    """
+    Imports and builds the fast-path SDK clients (Qdrant, HF, Groq) off the
+    request path; the API runs this in a background thread at startup.
+    """
+    from search.remote_embeddings import get_hf_client
+    import qdrant_client.models  # noqa: F401 (the slowest import)
+
+    for build in (get_qdrant, get_hf_client, get_llm_client):
+        try:
+            build()
+        except Exception as exc:
+            print(f"[WARN] Preload of {build.__name__} failed: {exc}")
+
+
+def live_qdrant():
     from qdrant_client import QdrantClient
 
     return QdrantClient(
@@ -18,13 +73,40 @@ def get_qdrant():
     )
 
 
-@lru_cache
-def get_llm_client():
+def fake_qdrant(latency):
+    from search.backends import backend_mode
+    from search.fake_backends import FakeQdrant
+
+    # hashed chunk vectors only match hashed query embeddings
+    return FakeQdrant(hashed=backend_mode("hf") == "fake", latency=latency)
+
+
+def live_llm_client():
     from groq import Groq
 
     return Groq(api_key=os.getenv("GROQ_API_KEY"))
 
 
+def fake_llm_client(latency):
+    from search.fake_backends import FakeChatClient
+
+    return FakeChatClient(latency)
+
+
+@lru_cache
+def get_qdrant():
+    from search.backends import wrap_backend
+
+    return wrap_backend("qdrant", live_qdrant, fake_qdrant)
+
+
+@lru_cache
+def get_llm_client():
+    from search.backends import wrap_backend
+
+    return wrap_backend("groq", live_llm_client, fake_llm_client)
+
+
 @lru_cache
 def get_decomposer():
     from search.query_decomposition import QueryDecomposer
@@ -32,6 +114,19 @@ def get_decomposer():
     return QueryDecomposer()
 
 
+@lru_cache
+def get_model_server():
+    """
+    Client for the shared model sidecar, or None when models load in-process.
+    """
+    if not MODEL_SERVER_SOCKET:
+        return None
+
+    from search.model_server import ModelServerClient
+
+    return ModelServerClient(MODEL_SERVER_SOCKET)
+
+
 @lru_cache
 def get_dense_model():
     """
@@ -41,15 +136,26 @@ def get_dense_model():
     if not USE_LOCAL_MODELS:
         raise RuntimeError("Dense model disabled in production")
 
+    if get_model_server():
+        from search.model_server import RemoteDenseModel
+
+        return RemoteDenseModel(get_model_server())
+
     import torch
     from sentence_transformers import SentenceTransformer
 
     device = "cuda" if torch.cuda.is_available() else "cpu"
-    return SentenceTransformer(
+    model = SentenceTransformer(
         "sentence-transformers/all-MiniLM-L6-v2",
         device=device
     )
 
+    if MICROBATCH_ENABLED:
+        from search.microbatch import BatchedDenseModel
+        return BatchedDenseModel(model)
+
+    return model
+
 
 @lru_cache
 def get_splade():
@@ -77,5 +183,14 @@ def get_splade():
 
 @lru_cache
 def get_cross_encoder_reranker():
+    if USE_LOCAL_MODELS and get_model_server():
+        from search.model_server import RemoteReranker
+        return RemoteReranker(get_model_server())
+
     from ingest.reranker import CrossEncoderReranker
+
+    if USE_LOCAL_MODELS and MICROBATCH_ENABLED:
+        from search.microbatch import BatchedReranker
+        return BatchedReranker(CrossEncoderReranker())
+
     return CrossEncoderReranker()
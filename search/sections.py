@@ -0,0 +1,51 @@
+import json
+from functools import lru_cache
+from typing import Dict, Tuple
+
+from ingest.section_index import OUTPUT_FILE as SECTION_INDEX_PATH
+from search.filters import FilterValues, as_values
+
+
+class UnknownSection(ValueError):
+    def __init__(self, prefix: str):
+        super().__init__(f"No section matches prefix {prefix!r}")
+        self.prefix = prefix
+
+
+@lru_cache
+def load_section_index() -> Dict[str, Dict[str, list]]:
+    """
+    version -> {lower-cased prefix: [section ids]}; see ingest/section_index.py.
+    """
+    with open(SECTION_INDEX_PATH, "r", encoding="utf-8") as f:
+        versions = json.load(f)["versions"]
+
+    # ids mix roman numerals, letters and digits ("II.E.1.a"); match case-insensitively
+    return {
+        version: {prefix.lower(): ids for prefix, ids in table.items()}
+        for version, table in versions.items()
+    }
+
+
+def normalize_prefix(prefix: str) -> str:
+    # " II.C. " → "ii.c"
+    return prefix.strip().strip(".").lower()
+
+
+def resolve_section_prefix(prefix: str, versions: FilterValues = None) -> Tuple[str, ...]:
+    """
+    All section ids under the prefix, in the given versions (or all versions).
+    Raises UnknownSection when nothing matches.
+    """
+    index = load_section_index()
+    key = normalize_prefix(prefix)
+    wanted = as_values(versions) or tuple(index)
+
+    section_ids = set()
+    for version in wanted:
+        section_ids.update(index.get(version, {}).get(key, []))
+
+    if not section_ids:
+        raise UnknownSection(prefix)
+
+    return tuple(sorted(section_ids))
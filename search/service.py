@@ -1,9 +1,20 @@
-from typing import Dict
-from search.rag_answer_fast import answer_query_fast
+from typing import Dict, List
+from search.rag_answer_fast import answer_query_fast, answer_comparison_fast
+from search.deadline import trace_scope
+from search.query_log import log_answer
+from search.sections import resolve_section_prefix
+
+
+def section_ids_for(section: str | None, version) -> tuple | None:
+    # a prefix like "II.C" scopes retrieval to that subtree
+    return resolve_section_prefix(section, version) if section else None
+
 
 def answer_regulatory_question(
     query: str,
-    version: str | None = None,
+    version: str | List[str] | None = None,
+    document_ids: List[str] | None = None,
+    section: str | None = None,
 ) -> Dict:
     """
     Production entry point (Render free tier).
@@ -12,8 +23,59 @@ def answer_regulatory_question(
     - Low memory footprint
     - Low latency
     - Compliance-safe
+    - Optional section prefix scoping (e.g. "II.C")
+    """
+    with trace_scope() as trace:
+        result = answer_query_fast(
+            query=query,
+            version_filter=version,
+            document_filter=document_ids,
+            section_filter=section_ids_for(section, version),
+        )
+
+    log_answer(query, version, "fast", result, trace, document_ids, section)
+    return result
+
+
+def answer_comparison_question(query: str) -> Dict:
     """
-    return answer_query_fast(
-        query=query,
-        version_filter=version,
-    )
+    Proposed vs final comparison via the precomputed alignment index.
+
+    - One dense search over the 2024 Final Rule
+    - Counterparts from data/alignment, fetched in one batch
+    - No query decomposition
+    """
+    with trace_scope() as trace:
+        result = answer_comparison_fast(query=query)
+
+    log_answer(query, None, "comparison", result, trace)
+    return result
+
+
+def answer_regulatory_question_budgeted(
+    query: str,
+    version: str | List[str] | None = None,
+    budget_ms: int | None = None,
+    document_ids: List[str] | None = None,
+    section: str | None = None,
+) -> Dict:
+    """
+    Latency-budgeted entry point.
+
+    - Full pipeline (decomposition, hybrid, rerank) when capacity allows
+    - Stages dropped by live latency estimates and load
+    - Falls back to the dense-only path when the budget is tight
+    """
+    from search.router import answer_with_budget
+
+    with trace_scope() as trace:
+        result = answer_with_budget(
+            query=query,
+            version=version,
+            budget_ms=budget_ms,
+            document_ids=document_ids,
+            section_ids=section_ids_for(section, version),
+        )
+
+    log_answer(query, version, result["route"]["path"], result, trace, document_ids, section)
+    return result
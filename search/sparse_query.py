@@ -0,0 +1,163 @@
+import json
+import os
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List
+
+from search.runtime import USE_LOCAL_MODELS
+
+# Sparse query encoders for the "sparse" named vector.
+#   splade: full SPLADE forward pass (local models only)
+#   idf:    WordPiece ids weighted by IDF over the indexed SPLADE doc
+#           vectors (ingest/sparse_query_weights.py); no model inference
+SPARSE_QUERY_ENCODER = os.getenv("SPARSE_QUERY_ENCODER", "splade" if USE_LOCAL_MODELS else "idf")
+BASE_DIR = Path(__file__).resolve().parents[1]
+QUERY_WEIGHTS_FILE = Path(os.getenv("SPARSE_QUERY_WEIGHTS", BASE_DIR / "data" / "sparse" / "query_weights.json"))
+
+# BM25 query-term saturation
+K1 = 1.2
+
+SPECIAL_TOKENS = {"[CLS]", "[SEP]", "[PAD]", "[MASK]", "[UNK]"}
+MAX_WORD_CHARS = 100
+
+
+# =========================
+# WordPiece (bert-base-uncased rules)
+# =========================
+
+def _is_punctuation(ch: str) -> bool:
+    cp = ord(ch)
+    if 33 <= cp <= 47 or 58 <= cp <= 64 or 91 <= cp <= 96 or 123 <= cp <= 126:
+        return True
+    return unicodedata.category(ch).startswith("P")
+
+
+def _basic_tokenize(text: str) -> List[str]:
+    text = unicodedata.normalize("NFD", text.lower())
+    text = "".join(ch for ch in text if unicodedata.category(ch) != "Mn")
+
+    words = []
+    current = []
+    for ch in text:
+        if ch.isspace():
+            if current:
+                words.append("".join(current))
+                current = []
+        elif _is_punctuation(ch):
+            if current:
+                words.append("".join(current))
+                current = []
+            words.append(ch)
+        else:
+            current.append(ch)
+    if current:
+        words.append("".join(current))
+
+    return words
+
+
+class WordPieceTokenizer:
+    def __init__(self, vocab: List[str]):
+        self.vocab = {token: i for i, token in enumerate(vocab)}
+        self.unk_id = self.vocab.get("[UNK]")
+
+    def _wordpiece(self, word: str) -> List[int]:
+        if len(word) > MAX_WORD_CHARS:
+            return [self.unk_id]
+
+        ids = []
+        start = 0
+        while start < len(word):
+            end = len(word)
+            match = None
+            while start < end:
+                piece = word[start:end] if start == 0 else "##" + word[start:end]
+                if piece in self.vocab:
+                    match = self.vocab[piece]
+                    break
+                end -= 1
+            if match is None:
+                return [self.unk_id]
+            ids.append(match)
+            start = end
+
+        return ids
+
+    def encode(self, text: str) -> List[int]:
+        ids = []
+        for word in _basic_tokenize(text):
+            ids.extend(self._wordpiece(word))
+        return [i for i in ids if i != self.unk_id]
+
+
+# =========================
+# IDF query encoder
+# =========================
+
+class IdfQueryEncoder:
+    """
+    Query-side BM25 over SPLADE's vocabulary: weight = idf * saturated tf.
+    Terms no indexed document activates are dropped (they cannot match).
+    """
+
+    def __init__(self, vocab: List[str], idf: Dict[int, float]):
+        self.tokenizer = WordPieceTokenizer(vocab)
+        self.special_ids = {self.tokenizer.vocab[t] for t in SPECIAL_TOKENS if t in self.tokenizer.vocab}
+        self.idf = idf
+
+    def encode(self, text: str) -> Dict:
+        counts = Counter(
+            i for i in self.tokenizer.encode(text)
+            if i not in self.special_ids and i in self.idf
+        )
+
+        indices = sorted(counts)
+        return {
+            "indices": indices,
+            "values": [
+                self.idf[i] * counts[i] * (K1 + 1) / (counts[i] + K1)
+                for i in indices
+            ],
+        }
+
+
+@lru_cache
+def get_idf_encoder() -> IdfQueryEncoder:
+    if not QUERY_WEIGHTS_FILE.exists():
+        raise FileNotFoundError(
+            f"{QUERY_WEIGHTS_FILE} not found; run `python -m ingest.sparse_query_weights`"
+        )
+
+    with open(QUERY_WEIGHTS_FILE, encoding="utf-8") as f:
+        table = json.load(f)
+
+    idf = {int(term): weight for term, weight in table["idf"].items()}
+    return IdfQueryEncoder(table["vocab"], idf)
+
+
+def encode_sparse_query(text: str, encoder: str | None = None) -> Dict:
+    """
+    Sparse query vector in Qdrant format: {"indices": [...], "values": [...]}.
+    """
+    encoder = encoder or SPARSE_QUERY_ENCODER
+
+    if encoder == "idf":
+        return get_idf_encoder().encode(text)
+
+    if encoder == "splade":
+        from search.hybrid_search import compute_splade_query
+
+        return compute_splade_query(text)
+
+    raise ValueError(f"Unknown sparse query encoder: {encoder}")
+
+
+def sparse_enabled() -> bool:
+    """
+    Whether a sparse query can be built in this process.
+    """
+    if SPARSE_QUERY_ENCODER == "idf":
+        return QUERY_WEIGHTS_FILE.exists()
+    return USE_LOCAL_MODELS
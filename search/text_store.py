@@ -0,0 +1,88 @@
+import os
+from dataclasses import replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List
+
+from ingest.chunk_ids import chunk_point_id
+from ingest.jsonl import load_records
+from ingest.vector_store import serving_vectors_dir
+from search.runtime import get_qdrant, local_collection, COLLECTION_NAME
+from search.limits import backend_slot
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+TEXT_STORE_DIR = Path(os.getenv("TEXT_STORE_DIR", BASE_DIR / "data" / "chunks"))
+
+# What retrieval asks Qdrant for: ids, scores and the fields used for
+# filtering and source attribution. Everything else is hydrated locally.
+FILTER_FIELDS = ["document_id", "version", "section_id"]
+TEXT_FIELDS = ["text", "section_path", "title", "chunk_index"]
+
+
+def text_store_files() -> List[Path]:
+    """
+    The chunk files embedded into the serving collection (kept next to its
+    vectors, ingest/vector_store.py); data/chunks for the flat layout.
+    """
+    served = serving_vectors_dir(local_collection())
+    files = sorted(served.glob("*_chunks.json*")) if "TEXT_STORE_DIR" not in os.environ else []
+    return files or sorted(TEXT_STORE_DIR.glob("*_chunks.json"))
+
+
+@lru_cache
+def load_text_store() -> Dict[str, Dict]:
+    """
+    Point id → heavy payload fields, built from the same chunk files
+    that were embedded (point ids are deterministic, see ingest/chunk_ids.py).
+    """
+    store = {}
+
+    for path in text_store_files():
+        for chunk in load_records(path):
+            store[chunk_point_id(chunk)] = {
+                field: chunk[field] for field in TEXT_FIELDS
+            }
+
+    return store
+
+
+def with_payload(point, payload: Dict):
+    """
+    Copy of a Qdrant point (or LocalPoint) carrying `payload`.
+    """
+    if hasattr(point, "model_copy"):
+        return point.model_copy(update={"payload": payload})
+    return replace(point, payload=payload)
+
+
+def hydrate(points: List, collection_name: str = COLLECTION_NAME) -> List:
+    """
+    Hydrated copies of the points that will actually be used.
+    Local store first; anything missing is fetched with a single batched retrieve.
+    The inputs are left alone: they may sit in the retrieval cache.
+    """
+    store = load_text_store()
+    fields = {}
+    missing = []
+
+    for p in points:
+        stored = store.get(str(p.id))
+        if stored is None:
+            missing.append(p.id)
+        else:
+            fields[str(p.id)] = stored
+
+    if missing:
+        with backend_slot("qdrant"):
+            records = get_qdrant().retrieve(
+                collection_name=collection_name,
+                ids=missing,
+                with_payload=TEXT_FIELDS,
+                with_vectors=False,
+            )
+        fields.update({str(r.id): r.payload or {} for r in records})
+
+    return [
+        with_payload(p, {**(p.payload or {}), **fields.get(str(p.id), {})})
+        for p in points
+    ]
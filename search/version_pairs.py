@@ -0,0 +1,111 @@
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List
+
+from search.fast_dense_search import fast_dense_search, COLLECTION_NAME
+from search.runtime import get_qdrant
+from search.limits import backend_slot
+from search.text_store import FILTER_FIELDS, hydrate
+from ingest.registry import alignment_pairs, alignment_file
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+ALIGNMENT_DIR = BASE_DIR / "data" / "alignment"
+
+TOP_K = 3
+COUNTERPARTS_PER_HIT = 1
+
+
+class PairIndexUnavailable(RuntimeError):
+    pass
+
+
+def default_pair_index_path() -> Path:
+    """
+    Alignment index of the most recently registered superseding release.
+    """
+    pairs = alignment_pairs()
+    if not pairs:
+        raise PairIndexUnavailable("No release in data/documents.json supersedes another")
+    return ALIGNMENT_DIR / alignment_file(*pairs[-1])
+
+
+@lru_cache
+def load_pair_index(path: Path | None = None) -> Dict:
+    """
+    Precomputed final → proposed chunk alignment (see ingest/align_versions.py).
+    """
+    path = path or default_pair_index_path()
+    if not path.exists():
+        # built by the pipeline's pair_index stage, after embedding
+        raise PairIndexUnavailable(
+            f"Alignment index {path.name} has not been built; run python -m ingest.pipeline"
+        )
+
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def get_counterparts(point_id: str, limit: int = COUNTERPARTS_PER_HIT) -> List[Dict]:
+    index = load_pair_index()
+    return index["pairs"].get(str(point_id), [])[:limit]
+
+
+def final_rule_hits(query: str, top_k: int = TOP_K) -> List:
+    """
+    First step of the comparison retrieval: lean hits from the superseding
+    release. Also what the pre-warm replays for logged comparison questions.
+    """
+    index = load_pair_index()
+    return fast_dense_search(
+        query=query,
+        version_filter=index["source_version"],
+        top_k=top_k,
+    )
+
+
+def aligned_pair_search(
+    query: str,
+    top_k: int = TOP_K,
+    counterparts: int = COUNTERPARTS_PER_HIT,
+) -> List[Dict]:
+    """
+    Comparison retrieval in a single pass:
+    search the final rule, then look up precomputed proposed-rule counterparts
+    and fetch them with one batched retrieve. Text comes from the local store.
+    """
+    final_hits = final_rule_hits(query, top_k)
+
+    if not final_hits:
+        return []
+
+    pair_ids = {
+        str(hit.id): [p["point_id"] for p in get_counterparts(hit.id, counterparts)]
+        for hit in final_hits
+    }
+
+    wanted = sorted({pid for ids in pair_ids.values() for pid in ids})
+    proposed = {}
+
+    if wanted:
+        client = get_qdrant()
+        with backend_slot("qdrant"):
+            records = client.retrieve(
+                collection_name=COLLECTION_NAME,
+                ids=wanted,
+                with_payload=FILTER_FIELDS,
+                with_vectors=False,
+            )
+        proposed = {str(r.id): r for r in hydrate(records)}
+
+    final_hits = hydrate(final_hits)
+
+    return [
+        {
+            "final": hit,
+            "proposed": [
+                proposed[pid] for pid in pair_ids[str(hit.id)] if pid in proposed
+            ],
+        }
+        for hit in final_hits
+    ]
@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+
+from search.cascade import cascade_rerank
+
+
+class CountingReranker:
+    def __init__(self):
+        self.passages = 0
+
+    def rerank(self, query, passages):
+        self.passages += len(passages)
+        # reverse the first-stage order
+        return list(range(len(passages)))
+
+
+def candidates(scores):
+    return [SimpleNamespace(score=s, payload={"text": f"passage {i}"}) for i, s in enumerate(scores)]
+
+
+def test_clear_gap_exits_without_cross_encoder():
+    reranker = CountingReranker()
+    hits = candidates([1.0, 0.95, 0.93, 0.1, 0.05, 0.02, 0.0])
+
+    kept = cascade_rerank("q", hits, keep=3, reranker=reranker)
+
+    assert reranker.passages == 0
+    assert kept == hits[:3]
+
+
+def test_uncertain_band_is_reranked():
+    reranker = CountingReranker()
+    hits = candidates([1.0, 0.9, 0.8, 0.7, 0.6, 0.5, 0.0])
+
+    kept = cascade_rerank("q", hits, keep=3, reranker=reranker)
+
+    assert reranker.passages > 0
+    assert len(kept) == 3
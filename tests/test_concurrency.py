@@ -0,0 +1,64 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api.main as main
+from api.concurrency import SingleFlight
+from search.deadline import Deadline, DeadlineExceeded, deadline_scope
+from search.limits import BackendLimiter
+
+client = TestClient(main.app)
+
+
+def test_identical_concurrent_requests_run_once():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        release.wait(5)
+        return "answer"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("q", work))) for _ in range(4)]
+    for t in threads:
+        t.start()
+
+    # the three followers have joined the leader's computation
+    while flight.shared < 3:
+        time.sleep(0.01)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert len(calls) == 1
+    assert results == ["answer"] * 4
+
+
+def test_full_backend_queue_returns_503_with_retry_after(monkeypatch):
+    limiter = BackendLimiter("groq", concurrency=1, queue=0)
+
+    def answer(**kwargs):
+        with limiter.slot():
+            return {"answer": "never reached"}
+
+    monkeypatch.setattr(main, "answer_regulatory_question", answer)
+
+    # the only slot is taken and nobody may queue for it
+    with limiter.slot():
+        response = client.post("/disclosure-analysis", json={"query": "Scope 3 emissions?"})
+
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_expired_deadline_is_not_reported_as_overload():
+    limiter = BackendLimiter("hf", concurrency=1, queue=4)
+
+    with deadline_scope(Deadline(0.0)):
+        with pytest.raises(DeadlineExceeded):
+            with limiter.slot():
+                pass
@@ -0,0 +1,35 @@
+import json
+from types import SimpleNamespace
+
+import search.fast_dense_search as fast_dense_search
+import search.near_duplicates as near_duplicates
+import search.rag_answer_fast as rag_answer_fast
+from search.cache import answer_cache, retrieval_cache
+from search.prewarm import prewarm
+
+
+def test_prewarmed_question_is_a_retrieval_cache_hit(tmp_path, monkeypatch):
+    log = tmp_path / "queries.jsonl"
+    log.write_text(json.dumps({"query": "what is scope 3", "version": None, "path": "fast"}) + "\n")
+
+    searches = []
+
+    def search(query, *args):
+        searches.append(query)
+        return [SimpleNamespace(id="p1", score=1.0, payload={"document_id": "d"})]
+
+    monkeypatch.setattr(fast_dense_search, "_search", search)
+    # a duplicate map is loaded, so the answer path overfetches
+    monkeypatch.setattr(near_duplicates, "canonical_map", lambda: {"p2": "p1"})
+    # stop the answer path before generation
+    monkeypatch.setattr(rag_answer_fast, "hydrate", lambda points: [])
+    retrieval_cache.clear()
+    answer_cache.clear()
+
+    assert prewarm(top_n=10, path=log)["warmed"] == 1
+
+    hits = retrieval_cache.hits
+    rag_answer_fast.answer_query_fast("What is Scope 3?")
+
+    assert searches == ["what is scope 3"]
+    assert retrieval_cache.hits == hits + 1
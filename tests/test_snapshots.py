@@ -0,0 +1,122 @@
+import json
+import os
+import uuid
+
+import httpx
+import pytest
+
+import ingest.reindex as reindex
+import ingest.snapshots as snapshots
+from ingest.snapshots import SnapshotError, file_digest
+
+QDRANT_TEST_URL = os.getenv("QDRANT_TEST_URL", "http://localhost:6333")
+
+
+def write_snapshot(root, collection, artifacts):
+    """
+    A snapshot directory without the Qdrant part, for the local-only paths.
+    """
+    for name, text in artifacts.items():
+        path = root / "artifacts" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+    files = {
+        str(p.relative_to(root)): {"sha256": file_digest(p), "bytes": p.stat().st_size}
+        for p in sorted(root.rglob("*"))
+        if p.is_file()
+    }
+    manifest = {
+        "format_version": snapshots.FORMAT_VERSION,
+        "snapshot_id": f"{collection}-test",
+        "collection": collection,
+        "points": 0,
+        "files": files,
+    }
+    (root / "manifest.json").write_text(json.dumps(manifest))
+    return root
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    data = tmp_path / "data"
+    data.mkdir()
+    monkeypatch.setattr(snapshots, "DATA_DIR", data)
+    return data
+
+
+def test_verify_rejects_tampered_file(tmp_path):
+    root = write_snapshot(tmp_path / "snap", "regulens_a", {"chunks/a_chunks.json": "[]"})
+    snapshots.verify_snapshot(root)
+
+    (root / "artifacts" / "chunks" / "a_chunks.json").write_text("[{}]")
+
+    with pytest.raises(SnapshotError, match="checksum mismatch"):
+        snapshots.verify_snapshot(root)
+
+
+def test_restore_keeps_differing_local_artifacts_without_force(tmp_path, data_dir):
+    root = write_snapshot(
+        tmp_path / "snap",
+        "regulens_a",
+        {"documents.json": "[1]", "vectors/regulens_a/a.f16": "vectors"},
+    )
+    (data_dir / "documents.json").write_text("[2]")
+
+    with pytest.raises(SnapshotError, match="--force"):
+        snapshots.restore_snapshot(root, collection="regulens_b", qdrant=False)
+    assert (data_dir / "documents.json").read_text() == "[2]"
+    assert not (data_dir / "vectors").exists()
+
+    snapshots.restore_snapshot(root, collection="regulens_b", qdrant=False, force=True)
+    assert (data_dir / "documents.json").read_text() == "[1]"
+    # vectors follow the collection they are restored under
+    assert (data_dir / "vectors" / "regulens_b" / "a.f16").read_text() == "vectors"
+
+
+def qdrant_client_or_skip():
+    try:
+        httpx.get(f"{QDRANT_TEST_URL}/readyz", timeout=1).raise_for_status()
+    except httpx.HTTPError:
+        pytest.skip(f"no Qdrant at {QDRANT_TEST_URL}")
+
+    from qdrant_client import QdrantClient
+
+    return QdrantClient(url=QDRANT_TEST_URL)
+
+
+def test_build_verify_restore_round_trip(tmp_path, data_dir, monkeypatch):
+    from qdrant_client.models import Distance, PointStruct, VectorParams
+
+    client = qdrant_client_or_skip()
+
+    run = uuid.uuid4().hex[:8]
+    source, restored, alias = f"snaptest_{run}_src", f"snaptest_{run}_dst", f"snaptest_{run}"
+    monkeypatch.setattr(snapshots, "COLLECTION_NAME", alias)
+    monkeypatch.setattr(reindex, "ALIAS", alias)
+
+    client.create_collection(source, vectors_config=VectorParams(size=4, distance=Distance.COSINE))
+    try:
+        client.upsert(
+            source,
+            [PointStruct(id=i, vector=[1.0, i, 0.0, 1.0], payload={"document_id": "d"}) for i in range(5)],
+            wait=True,
+        )
+        (data_dir / "vectors" / source).mkdir(parents=True)
+        (data_dir / "vectors" / source / "a.f16").write_text("vectors")
+        (data_dir / "documents.json").write_text("[]")
+
+        root = snapshots.build_snapshot(source, snapshots_dir=tmp_path / "snapshots", qdrant_url=QDRANT_TEST_URL)
+        snapshots.verify_snapshot(root)
+
+        snapshots.restore_snapshot(root, collection=restored, qdrant_url=QDRANT_TEST_URL)
+
+        assert client.count(restored, exact=True).count == 5
+        assert reindex.alias_target(client, alias) == restored
+        assert (data_dir / "vectors" / restored / "a.f16").read_text() == "vectors"
+    finally:
+        if reindex.alias_target(client, alias):
+            client.delete_alias(alias)
+        for name in (source, restored):
+            if client.collection_exists(name):
+                client.delete_collection(name)